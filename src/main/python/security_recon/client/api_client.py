@@ -1,10 +1,11 @@
 from __future__ import annotations
 
+import json
 import os
 import requests
 from dataclasses import dataclass
 from datetime import date
-from typing import List, Optional
+from typing import Iterator, List, Optional
 from security_recon.domain import Artifact
 
 API_BASE_URL_DEFAULT = "http://localhost:8000"
@@ -21,16 +22,58 @@ class SecurityReconApiClient:
         )
 
     #---- Runs ----
-    def trigger_run(self, as_of_date: date) -> dict:
+    def trigger_run(self, as_of_date: date, priority: str = "interactive") -> dict:
         """
-        Trigger a new reconciliation run for the specified as-of date.
+        Queue a new reconciliation run for the specified as-of date.
+        The run executes in the background; poll ``get_run_status`` for progress.
         """
         url = f"{self.api_base_url}/runs/"
-        payload = {"as_of_date": as_of_date.isoformat()}
+        payload = {"as_of_date": as_of_date.isoformat(), "priority": priority}
         response = requests.post(url, json=payload, timeout=30)
         response.raise_for_status()
         return response.json()
     
+    def get_run_status(self, run_id: str) -> dict:
+        """
+        Retrieve queue position, progress and timing of a queued or finished run.
+        """
+        url = f"{self.api_base_url}/runs/{run_id}/status"
+        response = requests.get(url, timeout=30)
+        response.raise_for_status()
+        return response.json()
+
+    def get_run_exceptions(
+        self,
+        run_id: str,
+        *,
+        attributes: Optional[List[str]] = None,
+        difference_types: Optional[List[str]] = None,
+        instrument_prefix: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+        page_size: int = 1000,
+    ) -> Iterator[dict]:
+        """
+        Stream a run's exceptions as dicts, following the server's pagination cursor.
+        """
+        url = f"{self.api_base_url}/runs/{run_id}/exceptions"
+        params: dict = {
+            "attribute": attributes,
+            "difference_type": difference_types,
+            "instrument_prefix": instrument_prefix,
+            "columns": columns,
+            "limit": page_size,
+        }
+        while True:
+            response = requests.get(url, params=params, stream=True, timeout=30)
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if line:
+                    yield json.loads(line)
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                return
+            params["cursor"] = cursor
+
     def list_run_ids(self, as_of_date: date) -> List[str]:
         """
         List all run IDs for the specified as-of date.
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
 from datetime import date
+from typing import AsyncIterator, Callable, List, Literal
 
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
@@ -13,31 +16,103 @@ from security_recon.domain.api_models import (
     RunCreateResponse,
     RunIdsForDateResponse,
     RunS3URIResponse,
+    RunStatusResponse,
     RunSummaryResponse,
 )
+from security_recon.integration.exceptions_query import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    ExceptionsPage,
+    ExceptionsQuery,
+    InvalidCursorError,
+    RunNotFoundError,
+)
+from security_recon.integration.parquet_writer import ParquetWriter
+from security_recon.integration.upload_queue import UploadQueue
 from security_recon.repositories.artifact_repository import ArtifactRepository
 from security_recon.repositories.data_models import ArtifactLog, ReconRunSummary
 from security_recon.service.run import ReconResult
+from security_recon.service.run_jobs import COMPLETED, RunJobManager
+from security_recon.support.config import load_config
 from security_recon.support.database_service import DatabaseService
 
-app = FastAPI(title="Security Recon API", version="1.0.0")
-
 db_service = DatabaseService()
 artifact_repo = ArtifactRepository(db_service=db_service)
-orchestration = Orchestration(artifact_repo=artifact_repo)
+upload_queue = (
+    UploadQueue(artifact_repo=artifact_repo)
+    if (load_config().get("upload_queue", {}) or {}).get("enabled", False)
+    else None
+)
+orchestration = Orchestration(artifact_repo=artifact_repo, upload_queue=upload_queue)
+# Read from the same directory (and dataset) the orchestrated runs write to.
+exceptions_query = ExceptionsQuery(
+    ParquetWriter(orchestration.output_dir), artifact_repo=artifact_repo
+)
+run_jobs = RunJobManager(lambda as_of_date, run_id, progress: _run_recon_pipeline(as_of_date, run_id, progress))
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    run_jobs.start()
+    if upload_queue is not None:
+        upload_queue.start()
+    try:
+        yield
+    finally:
+        run_jobs.stop()
+        if upload_queue is not None:
+            upload_queue.stop()
+
+
+app = FastAPI(title="Security Recon API", version="1.0.0", lifespan=lifespan)
 
 @app.post(
     "/runs/", 
     response_model=RunCreateResponse,
-    summary="Create a new run for a specific as-of date"
+    status_code=202,
+    summary="Queue a new run for a specific as-of date"
 )
 async def create_run(payload: RunCreateRequest) -> RunCreateResponse:
-    result = await run_in_threadpool(_run_recon_pipeline, payload.as_of_date)
-    
+    job, coalesced = run_jobs.submit(payload.as_of_date, payload.priority)
+
     return RunCreateResponse(
-        run_id = result.run_id,
-        as_of_date = result.as_of_date,
-        status = "COMPLETED",
+        run_id = job.run_id,
+        as_of_date = job.as_of_date,
+        status = job.status,
+        coalesced = coalesced,
+    )
+
+@app.get(
+    "/runs/{run_id}/status",
+    response_model=RunStatusResponse,
+    summary="Get queue position, progress and timing of a run"
+)
+async def get_run_status(run_id: str) -> RunStatusResponse:
+    job = run_jobs.get(run_id)
+    if job is None:
+        # Not tracked by this process (older run or restart): fall back to the persisted summary.
+        summary = await run_in_threadpool(_get_run_summary, run_id)
+        if summary is None:
+            raise HTTPException(status_code=404, detail="Run not found")
+        return RunStatusResponse(
+            run_id=run_id,
+            as_of_date=summary.as_of_date,
+            status=COMPLETED,
+            stage=COMPLETED.lower(),
+            exception_count=summary.total_exceptions,
+        )
+
+    return RunStatusResponse(
+        run_id=job.run_id,
+        as_of_date=job.as_of_date,
+        status=job.status,
+        stage=job.stage,
+        priority=job.priority,
+        queue_position=run_jobs.queue_position(run_id),
+        exception_count=job.exception_count,
+        coalesced_requests=job.coalesced_requests,
+        error=job.error,
+        **job.timings(),
     )
 
 @app.get(
@@ -68,10 +143,50 @@ async def get_run_artifact(run_id: str) -> RunS3URIResponse:
         s3_uri=artifact.s3_uri,
     )
 
+@app.get(
+    "/runs/{run_id}/exceptions",
+    summary="Page through a run's exceptions with filters and column projection",
+    response_class=StreamingResponse,
+)
+async def get_run_exceptions(
+    run_id: str,
+    attribute: List[str] | None = Query(default=None),
+    difference_type: List[str] | None = Query(default=None),
+    instrument_prefix: str | None = None,
+    columns: List[str] | None = Query(default=None),
+    cursor: str | None = None,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    format: Literal["ndjson", "arrow"] = "ndjson",
+) -> StreamingResponse:
+    try:
+        page: ExceptionsPage = await run_in_threadpool(
+            exceptions_query.page,
+            run_id,
+            attributes=attribute,
+            difference_types=difference_type,
+            instrument_prefix=instrument_prefix,
+            columns=columns,
+            cursor=cursor,
+            limit=limit,
+        )
+    except RunNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    except (InvalidCursorError, ValueError) as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    headers = {"X-Row-Count": str(page.num_rows)}
+    if page.next_cursor:
+        headers["X-Next-Cursor"] = page.next_cursor
+    if format == "arrow":
+        return StreamingResponse(
+            page.iter_arrow_ipc(), media_type="application/vnd.apache.arrow.stream", headers=headers
+        )
+    return StreamingResponse(page.iter_ndjson(), media_type="application/x-ndjson", headers=headers)
+
 #-- Helper functions --#
-def _run_recon_pipeline(as_of_date: date) -> ReconResult:
-    """Execute the full pipeline for the supplied date."""
-    return orchestration.pipeline_orchestrator(as_of_date=as_of_date)
+def _run_recon_pipeline(as_of_date: date, run_id: str, progress: Callable[[str], None]) -> ReconResult:
+    """Execute the full pipeline for the supplied date (on a run_jobs worker thread)."""
+    return orchestration.pipeline_orchestrator(as_of_date=as_of_date, run_id=run_id, progress=progress)
 
 def _get_runs_as_of_date(as_of_date: date) -> list[RunSummaryResponse]:
     session: Session = db_service.postgres_session_factory()
@@ -94,5 +209,14 @@ def _get_runs_as_of_date(as_of_date: date) -> list[RunSummaryResponse]:
         session.close()
         db_service.postgres_session_factory.remove()
 
+def _get_run_summary(run_id: str) -> ReconRunSummary | None:
+    session: Session = db_service.postgres_session_factory()
+    try:
+        stmt = select(ReconRunSummary).where(ReconRunSummary.run_id == run_id)
+        return session.execute(stmt).scalars().first()
+    finally:
+        session.close()
+        db_service.postgres_session_factory.remove()
+
 def _get_latest_artifact(run_id: str) -> ArtifactLog | None:
     return artifact_repo.fetch_latest(run_id, artifact_type="exceptions")
\ No newline at end of file
@@ -0,0 +1,136 @@
+"""Compare Parquet encoding profiles, or time exceptions queries, on a generated exceptions set."""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import List, Sequence
+
+import numpy as np
+import pyarrow.parquet as pq
+
+from security_recon.domain.exception_batch import ExceptionBatch
+from security_recon.integration.exceptions_query import ExceptionsQuery
+from security_recon.integration.parquet_writer import ParquetWriter, load_profiles
+
+_ATTRIBUTES = ("coupon", "cfi_code", "maturity_date", "callable_flag", "issuer_name", "currency")
+# The values ``DataFrameDiffer`` emits, with roughly the mix a real run produces.
+_DIFFERENCE_TYPES = ("VALUE_MISMATCH", "ONLY_IN_LEGACY", "ONLY_IN_STRATEGIC", "DUPLICATE_KEY")
+_DIFFERENCE_WEIGHTS = (0.9, 0.045, 0.045, 0.01)
+
+
+@dataclass(frozen=True)
+class ProfileResult:
+    profile: str
+    rows: int
+    write_seconds: float
+    read_seconds: float
+    file_bytes: int
+
+
+def generate_exceptions(rows: int, seed: int = 7) -> ExceptionBatch:
+    """Synthetic exceptions shaped like a real run: few attributes, mostly value mismatches."""
+    rng = np.random.default_rng(seed)
+    values = rng.normal(5.0, 2.0, size=(2, rows)).round(4).astype(str)
+    return ExceptionBatch.build(
+        instrument_id=np.array([f"US{i:09d}" for i in range(rows)], dtype=object),
+        attribute=np.asarray(_ATTRIBUTES)[rng.integers(0, len(_ATTRIBUTES), rows)],
+        difference_type=np.asarray(_DIFFERENCE_TYPES)[rng.choice(len(_DIFFERENCE_TYPES), rows, p=_DIFFERENCE_WEIGHTS)],
+        source_value=values[0],
+        target_value=values[1],
+        as_of_date=date(2023, 12, 29),
+        run_id="benchmark",
+    )
+
+
+def benchmark_profiles(batch: ExceptionBatch, profiles: Sequence[str], directory: Path) -> List[ProfileResult]:
+    results = []
+    for name in profiles:
+        writer = ParquetWriter(base_dir=directory / name, profile=name)
+        started = time.perf_counter()
+        path = writer.write_exceptions(batch, date(2023, 12, 29), f"bench-{name}")
+        written = time.perf_counter()
+        pq.read_table(path)
+        read = time.perf_counter()
+        results.append(ProfileResult(name, len(batch), written - started, read - written, path.stat().st_size))
+    return results
+
+
+@dataclass(frozen=True)
+class QueryTiming:
+    case: str
+    rows: int
+    seconds: float
+
+
+def benchmark_queries(batch: ExceptionBatch, directory: Path, page_size: int = 1_000) -> List[QueryTiming]:
+    """Latency of ``ExceptionsQuery`` pages against reading the whole file."""
+    writer = ParquetWriter(base_dir=directory)
+    path = writer.write_exceptions(batch.with_columns(run_id="bench-query"), date(2023, 12, 29), "bench-query")
+    query = ExceptionsQuery(writer)
+    middle = str(batch.columns["instrument_id"][len(batch) // 2])
+
+    def timed(case: str, action) -> QueryTiming:
+        started = time.perf_counter()
+        rows = action()
+        return QueryTiming(case, rows, time.perf_counter() - started)
+
+    def deep_page() -> int:
+        cursor = None
+        for _ in range(10):
+            page = query.page("bench-query", cursor=cursor, limit=page_size)
+            cursor = page.next_cursor
+        return page.num_rows
+
+    return [
+        timed("full file read", lambda: pq.read_table(path).num_rows),
+        timed("first page", lambda: query.page("bench-query", limit=page_size).num_rows),
+        timed("10 pages", deep_page),
+        timed(
+            "filtered page",
+            lambda: query.page(
+                "bench-query", attributes=["coupon"], instrument_prefix=middle[:-3], limit=page_size
+            ).num_rows,
+        ),
+        timed(
+            "projected page",
+            lambda: query.page("bench-query", columns=["instrument_id", "attribute"], limit=page_size).num_rows,
+        ),
+    ]
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="exceptions to generate")
+    parser.add_argument(
+        "--profile", action="append", dest="profiles", help="profile to measure (repeatable; default: all)"
+    )
+    parser.add_argument("--query", action="store_true", help="time GET /runs/{run_id}/exceptions style reads")
+    args = parser.parse_args(argv)
+
+    batch = generate_exceptions(args.rows)
+    if args.query:
+        with tempfile.TemporaryDirectory() as tmp:
+            timings = benchmark_queries(batch, Path(tmp))
+        print(f"{'case':<16} {'rows':>10} {'seconds':>9}")
+        for timing in timings:
+            print(f"{timing.case:<16} {timing.rows:>10} {timing.seconds:>9.4f}")
+        return
+
+    profiles = args.profiles or sorted(load_profiles())
+    with tempfile.TemporaryDirectory() as tmp:
+        results = benchmark_profiles(batch, profiles, Path(tmp))
+
+    print(f"{'profile':<12} {'rows':>10} {'write s':>9} {'read s':>9} {'size MiB':>10}")
+    for result in results:
+        print(
+            f"{result.profile:<12} {result.rows:>10} {result.write_seconds:>9.3f} "
+            f"{result.read_seconds:>9.3f} {result.file_bytes / 1024**2:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -11,7 +11,7 @@ def main() -> None:
     configure_logging()
     logger = get_logger(__name__)
 
-    pipeline = ReconPipeline(base_output_dir="parquet")
+    pipeline = ReconPipeline()
     result = pipeline.run(as_of_date=date(2023, 12, 30))
 
     logger.info(
@@ -2,22 +2,44 @@
 from __future__ import annotations
 
 from datetime import date
+from pathlib import Path
+from typing import Callable, Optional
 
-from security_recon.integration.s3_uploader import S3Uploader
+from security_recon.integration.compaction import CompactionResult, ExceptionCompactor
+from security_recon.integration.parquet_writer import ParquetWriter
+from security_recon.integration.s3_uploader import S3Uploader, try_content_hash
+from security_recon.integration.upload_queue import UploadQueue
+from security_recon.integration.upload_sweeper import SweptFile, UploadSweeper
 from security_recon.repositories.artifact_repository import ArtifactRepository
 from security_recon.service.run import ReconPipeline, ReconResult
 from security_recon.support import configure_logging, get_logger
 
 class Orchestration:
-    def __init__(self, artifact_repo: ArtifactRepository | None = None) -> None:
+    def __init__(
+        self,
+        artifact_repo: ArtifactRepository | None = None,
+        upload_queue: UploadQueue | None = None,
+        output_dir: str | Path | None = None,
+    ) -> None:
         self.artifact_repo = artifact_repo or ArtifactRepository()
+        # One directory for run output, the sweeper, compaction and exception queries.
+        self.output_dir = Path(output_dir) if output_dir else ParquetWriter().base_dir
+        # With a queue, uploads happen on its workers and the run returns without waiting for S3.
+        self.upload_queue = upload_queue
 
-    def pipeline_orchestrator(self, as_of_date: date) -> ReconResult:
+    def pipeline_orchestrator(
+        self,
+        as_of_date: date,
+        run_id: Optional[str] = None,
+        progress: Optional[Callable[[str], None]] = None,
+    ) -> ReconResult:
         configure_logging()
         logger = get_logger(__name__)
+        report = progress or (lambda stage: None)
 
-        pipeline = ReconPipeline(base_output_dir="parquet")
-        result = pipeline.run(as_of_date=as_of_date)
+        report("reconciling")
+        pipeline = ReconPipeline(base_output_dir=self.output_dir)
+        result = pipeline.run(as_of_date=as_of_date, run_id=run_id)
 
         logger.info(
             "Run %s generated %s exceptions (file=%s)",
@@ -26,15 +48,30 @@ class Orchestration:
             result.exceptions_path,
         )
 
+        report("uploading")
+        if self.upload_queue is not None:
+            job_id = self.upload_queue.enqueue(
+                run_id=result.run_id,
+                as_of_date=result.as_of_date,
+                file_path=result.exceptions_path,
+                artifact_type="exceptions",
+            )
+            logger.info("Queued upload job %s for %s", job_id, result.exceptions_file)
+            return result
+
         try:
-            uploader = S3Uploader(source_dir=result.exceptions_path.parent)
-            s3_url = uploader.upload(result.exceptions_file)
+            uploader = S3Uploader(source_dir=result.exceptions_path.parent, artifact_repo=self.artifact_repo)
+            digest = try_content_hash(result.exceptions_path, result.as_of_date)
+            s3_url = uploader.upload(
+                result.exceptions_file, content_hash=digest, as_of_date=result.as_of_date
+            )
             logger.info("Uploaded exceptions file to %s", s3_url)
             self.artifact_repo.record_upload(
                 run_id=result.run_id,
                 as_of_date=result.as_of_date,
                 artifact_type="exceptions",
                 s3_uri=s3_url,
+                content_hash=digest,
             )
         except ValueError as exc:
             logger.warning("Skipping S3 upload: %s", exc)
@@ -42,3 +79,37 @@ class Orchestration:
             logger.exception("S3 upload failed")
 
         return result
+
+    def sweep_uploads(self) -> list[SweptFile]:
+        """Retry uploads of exception files a failed run left in the output directory."""
+        configure_logging()
+        logger = get_logger(__name__)
+
+        sweeper = UploadSweeper(
+            self.output_dir, artifact_repo=self.artifact_repo, upload_queue=self.upload_queue
+        )
+        swept = sweeper.sweep()
+        failed = [item for item in swept if item.error]
+        logger.info("Sweeper uploaded %s files, %s failed", len(swept) - len(failed), len(failed))
+        return swept
+
+    def compact_exceptions(self, as_of_date: date) -> CompactionResult:
+        """Merge the uploaded per-run exception files of ``as_of_date`` into one artifact."""
+        configure_logging()
+        logger = get_logger(__name__)
+
+        compactor = ExceptionCompactor(self.output_dir, artifact_repo=self.artifact_repo)
+        try:
+            compactor.uploader = S3Uploader(source_dir=compactor.source_dir)
+        except ValueError as exc:
+            logger.warning("Compacting without S3 upload: %s", exc)
+
+        result = compactor.compact(as_of_date)
+        logger.info(
+            "Compacted %s runs (%s exceptions) for %s into %s",
+            len(result.run_ids),
+            result.row_count,
+            as_of_date,
+            result.s3_uri or result.path,
+        )
+        return result
@@ -1,6 +1,8 @@
 """Domain definitions and shared data rules."""
 
-from .dictionary import AttributeRule, AttributeRuleSet
+from .dictionary import AttributeRule, AttributeRuleSet, ColumnKernel, CompiledRuleSet
+from .exception_batch import ExceptionBatch
+from .extract_schema import ExtractSchema, memory_report
 from .dictionary_loader import load_rules_from_resource, load_rules_from_yaml
 from .metrics import MetricsPayload
 from .artifact import Artifact
@@ -8,6 +10,11 @@ from .artifact import Artifact
 __all__ = [
 	"AttributeRule",
 	"AttributeRuleSet",
+	"ColumnKernel",
+	"CompiledRuleSet",
+	"ExceptionBatch",
+	"ExtractSchema",
+	"memory_report",
 	"load_rules_from_resource",
 	"load_rules_from_yaml",
 	"MetricsPayload",
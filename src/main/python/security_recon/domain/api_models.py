@@ -2,16 +2,31 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import List
+from typing import List, Literal
 from pydantic import BaseModel, Field
 
 class RunCreateRequest(BaseModel):
     as_of_date: date
+    priority: Literal["interactive", "backfill"] = "interactive"
 
 class RunCreateResponse(BaseModel):
     run_id: str
     as_of_date: date
     status: str = "PENDING"
+    coalesced: bool = False
+
+class RunStatusResponse(BaseModel):
+    run_id: str
+    as_of_date: date | None = None
+    status: str
+    stage: str | None = None
+    priority: str | None = None
+    queue_position: int | None = None
+    queued_seconds: float | None = None
+    run_seconds: float | None = None
+    exception_count: int | None = None
+    coalesced_requests: int = 0
+    error: str | None = None
 
 class RunSummaryResponse(BaseModel):
     run_id: str
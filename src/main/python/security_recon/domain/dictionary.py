@@ -1,8 +1,36 @@
 """Data dictionary shared models."""
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Mapping
+from dataclasses import dataclass, field
+from functools import cached_property, partial
+from typing import Callable, Dict, Mapping, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Spellings accepted in data_dictionary.yml, mapped onto the kernel kinds below.
+RULE_TYPE_ALIASES: Dict[str, str] = {
+    "float": "float",
+    "double": "float",
+    "decimal": "float",
+    "string": "string",
+    "str": "string",
+    "bool": "bool",
+    "boolean": "bool",
+    "date": "date",
+    "datetime": "date",
+}
+
+BOOL_TRUE_TOKENS = frozenset({"true", "t", "y", "yes", "1", "1.0"})
+
+
+def canonical_type(type_name: str) -> str:
+    """Resolve a dictionary type name to its kernel kind."""
+    try:
+        return RULE_TYPE_ALIASES[str(type_name).strip().lower()]
+    except KeyError:
+        raise ValueError(f"Unsupported attribute type: {type_name!r}") from None
+
 
 @dataclass
 class AttributeRule:
@@ -14,9 +42,163 @@ class AttributeRule:
     trim: bool = False
 
 
+def _normalize_identity(values: pd.Series) -> pd.Series:
+    return values
+
+
+def _normalize_float(values: pd.Series) -> pd.Series:
+    return values.astype("float64")
+
+
+def _normalize_bool(values: pd.Series) -> pd.Series:
+    if pd.api.types.is_bool_dtype(values.dtype):
+        return values.astype("boolean")
+    if pd.api.types.is_numeric_dtype(values.dtype):
+        return (values != 0).astype("boolean")
+    tokens = values.astype("string").str.strip().str.lower()
+    return tokens.isin(BOOL_TRUE_TOKENS).astype("boolean")
+
+
+def _normalize_date(values: pd.Series) -> pd.Series:
+    """Dates at second resolution (years 1..9999), truncated to the day.
+
+    A value that does not parse as a date is kept as-is and compared raw, so
+    it is never turned into a null.
+    """
+    try:
+        return values.astype("datetime64[s]").dt.normalize()
+    except (ValueError, TypeError, OverflowError):
+        return pd.Series([_parse_date(value) for value in values], index=values.index, dtype=object)
+
+
+def _parse_date(value: object) -> object:
+    try:
+        return pd.Timestamp(value).normalize()
+    except (ValueError, TypeError, OverflowError):
+        return value
+
+
+def _normalize_string(values: pd.Series, *, trim: bool, ignore_case: bool) -> pd.Series:
+    normalized = values.astype("string")
+    if trim:
+        normalized = normalized.str.strip()
+    if ignore_case:
+        normalized = normalized.str.upper()
+    return normalized
+
+
+@dataclass(frozen=True)
+class ColumnKernel:
+    """Normalizer/comparator pair for a single attribute column.
+
+    Kernels only hold module-level functions and partials so a compiled plan
+    can be pickled into worker processes.
+    """
+    name: str
+    kind: str
+    normalize: Callable[[pd.Series], pd.Series] = _normalize_identity
+    tolerance: float | None = None
+
+    def normalize_column(self, values: pd.Series) -> pd.Series:
+        """Normalize a full column, leaving nulls in place."""
+        present = values.notna()
+        if present.all():
+            return self.normalize(values)
+        return self.normalize(values[present]).reindex(values.index)
+
+    def equal_mask(self, src: pd.Series, tgt: pd.Series) -> np.ndarray:
+        """Compare two aligned columns, returning a boolean array of matches.
+
+        Nulls (``None``/``NaN``/``NaT``) on both sides match; a null on one side
+        only is a mismatch.
+        """
+        src_null = src.isna().to_numpy()
+        tgt_null = tgt.isna().to_numpy()
+        equal = src_null & tgt_null
+        both = ~src_null & ~tgt_null
+        if not both.any():
+            return equal
+
+        src_values = self.normalize(src[both])
+        tgt_values = self.normalize(tgt[both])
+        if self.kind == "raw":
+            matches = src_values.to_numpy(dtype=object) == tgt_values.to_numpy(dtype=object)
+        elif self.tolerance is not None:
+            matches = (src_values - tgt_values).abs().to_numpy() <= self.tolerance
+        else:
+            matches = (src_values == tgt_values).to_numpy(dtype=bool, na_value=False)
+        equal[both] = matches
+        return equal
+
+
+def compile_rule(rule: AttributeRule) -> ColumnKernel:
+    """Build the typed kernel for one rule."""
+    kind = canonical_type(rule.type)
+    if kind == "float":
+        return ColumnKernel(rule.name, kind, _normalize_float, rule.tolerance)
+    if kind == "bool":
+        return ColumnKernel(rule.name, kind, _normalize_bool)
+    if kind == "date":
+        return ColumnKernel(rule.name, kind, _normalize_date)
+    return ColumnKernel(
+        rule.name,
+        kind,
+        partial(_normalize_string, trim=rule.trim, ignore_case=rule.ignore_case),
+    )
+
+
+@dataclass(frozen=True)
+class CompiledRuleSet:
+    """Frozen plan of column kernels compiled from an ``AttributeRuleSet``."""
+    kernels: Mapping[str, ColumnKernel] = field(default_factory=dict)
+
+    def kernel_for(self, attribute_name: str) -> ColumnKernel:
+        """Return the compiled kernel, falling back to raw equality for unknown columns."""
+        kernel = self.kernels.get(attribute_name)
+        if kernel is None:
+            return ColumnKernel(attribute_name, "raw")
+        return kernel
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        return tuple(self.kernels)
+
+
+DEFAULT_KEYS: Mapping[str, str] = {"instrument_id": "string", "as_of_date": "date"}
+
+
 @dataclass(frozen=True)
 class AttributeRuleSet:
     rules: Mapping[str, AttributeRule]
+    keys: Mapping[str, str] = field(default_factory=lambda: dict(DEFAULT_KEYS))
 
     def get_rule(self, attribute_name: str) -> AttributeRule | None:
         return self.rules.get(attribute_name)
+
+    @property
+    def key_names(self) -> Tuple[str, ...]:
+        return tuple(self.keys)
+
+    @property
+    def attribute_names(self) -> Tuple[str, ...]:
+        """Compared attributes, in dictionary order."""
+        return tuple(self.rules)
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        """Every column reconciliation needs from a source: keys, then attributes."""
+        return self.key_names + self.attribute_names
+
+    def column_kinds(self) -> Dict[str, str]:
+        """Kernel kind per source column, keys included."""
+        kinds = {name: canonical_type(type_name) for name, type_name in self.keys.items()}
+        kinds.update({name: canonical_type(rule.type) for name, rule in self.rules.items()})
+        return kinds
+
+    def compile(self) -> CompiledRuleSet:
+        """Compile the rules into column kernels; the plan is built once per rule set."""
+        return self._compiled
+
+    @cached_property
+    def _compiled(self) -> CompiledRuleSet:
+        return CompiledRuleSet({name: compile_rule(rule) for name, rule in self.rules.items()})
@@ -1,13 +1,30 @@
 """Helpers for hydrating ``AttributeRuleSet`` definitions."""
 from __future__ import annotations
 
+from functools import lru_cache
+import re
 from pathlib import Path
 from typing import Any, Dict
-from security_recon.domain.dictionary import AttributeRule, AttributeRuleSet
+from security_recon.domain.dictionary import DEFAULT_KEYS, AttributeRule, AttributeRuleSet
 from security_recon.support.paths import resource_path
 import yaml
 
+# Column names are interpolated into repository SQL, so only plain identifiers are allowed.
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def _check_identifier(name: str) -> str:
+    if not _IDENTIFIER.match(str(name)):
+        raise ValueError(f"Invalid column name in data dictionary: {name!r}")
+    return str(name)
+
+
 def _build_rule_set(config: Dict[str, Any]) -> AttributeRuleSet:
+    keys = config.get("keys") or dict(DEFAULT_KEYS)
+    if not isinstance(keys, dict):
+        keys = {name: DEFAULT_KEYS.get(name, "string") for name in keys}
+    keys = {_check_identifier(name): str(type_name) for name, type_name in keys.items()}
+
     attributes = config.get("attributes", {}) or {}
     if not isinstance(attributes, dict):
         attributes = {}
@@ -15,6 +32,7 @@ def _build_rule_set(config: Dict[str, Any]) -> AttributeRuleSet:
     for name, spec in attributes.items():
         if not isinstance(spec, dict):
             continue
+        _check_identifier(name)
         rules[name] = AttributeRule(
             name=name,
             type=spec["type"],
@@ -22,7 +40,7 @@ def _build_rule_set(config: Dict[str, Any]) -> AttributeRuleSet:
             ignore_case=spec.get("ignore_case", False),
             trim=spec.get("trim", False),
         )
-    return AttributeRuleSet(rules)
+    return AttributeRuleSet(rules, keys)
 
 
 def load_rules_from_yaml(file_path: str | Path) -> AttributeRuleSet:
@@ -31,5 +49,9 @@ def load_rules_from_yaml(file_path: str | Path) -> AttributeRuleSet:
     return _build_rule_set(config)
 
 
+@lru_cache(maxsize=None)
 def load_rules_from_resource(resource_name: str = "data_dictionary.yml") -> AttributeRuleSet:
-    return load_rules_from_yaml(resource_path(resource_name))
+    """Load a bundled rule set once per process, compiling its column kernels up front."""
+    rule_set = load_rules_from_yaml(resource_path(resource_name))
+    rule_set.compile()
+    return rule_set
@@ -0,0 +1,181 @@
+"""Columnar container for reconciliation exceptions."""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, Mapping
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from pandas.api.types import union_categoricals
+
+EXCEPTION_COLS = [
+    "run_id",
+    "as_of_date",
+    "instrument_id",
+    "attribute",
+    "source_system",
+    "target_system",
+    "source_value",
+    "target_value",
+    "difference_type",
+]
+
+# Columns holding a handful of distinct values per run; stored as categoricals.
+CATEGORY_COLS = ("run_id", "attribute", "source_system", "target_system", "difference_type")
+VALUE_COLS = ("source_value", "target_value")
+
+_CATEGORY_TYPE = pa.dictionary(pa.int32(), pa.string())
+EXCEPTION_SCHEMA = pa.schema(
+    [
+        ("run_id", _CATEGORY_TYPE),
+        ("as_of_date", pa.date32()),
+        ("instrument_id", pa.string()),
+        ("attribute", _CATEGORY_TYPE),
+        ("source_system", _CATEGORY_TYPE),
+        ("target_system", _CATEGORY_TYPE),
+        ("source_value", pa.string()),
+        ("target_value", pa.string()),
+        ("difference_type", _CATEGORY_TYPE),
+    ]
+)
+
+
+def _categorical(values: Any, size: int) -> pd.Categorical:
+    if isinstance(values, str):
+        return pd.Categorical.from_codes(np.zeros(size, dtype=np.int8), categories=[values])
+    return values if isinstance(values, pd.Categorical) else pd.Categorical(values)
+
+
+def _strings(values: Any, size: int) -> pd.arrays.StringArray:
+    if values is None or isinstance(values, str):
+        values = np.full(size, values, dtype=object)
+    return values if isinstance(values, pd.arrays.StringArray) else pd.array(values, dtype="string")
+
+
+def _objects(values: Any, size: int) -> np.ndarray:
+    if values is None or np.ndim(values) == 0:
+        return np.full(size, values, dtype=object)
+    return np.asarray(values, dtype=object)
+
+
+class ExceptionBatch:
+    """Array-backed block of exceptions in ``EXCEPTION_COLS`` layout.
+
+    Run-level constants and other low-cardinality columns are categoricals
+    (one code per row, the strings stored once), values are nullable strings.
+    Batches concatenate column-wise and convert to pandas or Arrow without
+    going through per-row Python objects.
+    """
+
+    __slots__ = ("columns",)
+
+    def __init__(self, columns: Mapping[str, Any]) -> None:
+        self.columns: Dict[str, Any] = {name: columns[name] for name in EXCEPTION_COLS}
+
+    @classmethod
+    def build(
+        cls,
+        *,
+        instrument_id: Any,
+        attribute: Any,
+        difference_type: Any,
+        source_value: Any,
+        target_value: Any,
+        as_of_date: Any = None,
+        run_id: Any = "",
+        source_system: Any = "legacy",
+        target_system: Any = "strategic",
+    ) -> "ExceptionBatch":
+        """Build a batch from column arrays; scalar arguments are broadcast."""
+        instrument_id = _objects(instrument_id, 0)
+        size = len(instrument_id)
+        return cls(
+            {
+                "run_id": _categorical(run_id, size),
+                "as_of_date": _objects(as_of_date, size),
+                "instrument_id": instrument_id,
+                "attribute": _categorical(attribute, size),
+                "source_system": _categorical(source_system, size),
+                "target_system": _categorical(target_system, size),
+                "source_value": _strings(source_value, size),
+                "target_value": _strings(target_value, size),
+                "difference_type": _categorical(difference_type, size),
+            }
+        )
+
+    @classmethod
+    def empty(cls) -> "ExceptionBatch":
+        return cls.build(instrument_id=[], attribute="", difference_type="", source_value=None, target_value=None)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "ExceptionBatch":
+        size = len(df)
+        return cls(
+            {
+                name: (
+                    _categorical(df[name].array, size)
+                    if name in CATEGORY_COLS
+                    else _strings(df[name].array, size)
+                    if name in VALUE_COLS
+                    else _objects(df[name].to_numpy(dtype=object), size)
+                )
+                for name in EXCEPTION_COLS
+            }
+        )
+
+    @classmethod
+    def concat(cls, batches: Iterable["ExceptionBatch"]) -> "ExceptionBatch":
+        batches = [batch for batch in batches if len(batch)]
+        if not batches:
+            return cls.empty()
+        if len(batches) == 1:
+            return batches[0]
+        columns: Dict[str, Any] = {}
+        for name in EXCEPTION_COLS:
+            parts = [batch.columns[name] for batch in batches]
+            if name in CATEGORY_COLS:
+                columns[name] = union_categoricals(parts, sort_categories=True)
+            elif name in VALUE_COLS:
+                series = [pd.Series(part, copy=False) for part in parts]
+                columns[name] = pd.concat(series, ignore_index=True).array
+            else:
+                columns[name] = np.concatenate(parts)
+        return cls(columns)
+
+    def __len__(self) -> int:
+        return len(self.columns["instrument_id"])
+
+    def take(self, indexer: np.ndarray) -> "ExceptionBatch":
+        return ExceptionBatch({name: values[indexer] for name, values in self.columns.items()})
+
+    def with_columns(self, **values: Any) -> "ExceptionBatch":
+        """Copy with some columns replaced; scalars are broadcast like in ``build``."""
+        size = len(self)
+        columns = dict(self.columns)
+        for name, value in values.items():
+            if name in CATEGORY_COLS:
+                columns[name] = _categorical(value, size)
+            elif name in VALUE_COLS:
+                columns[name] = _strings(value, size)
+            else:
+                columns[name] = _objects(value, size)
+        return ExceptionBatch(columns)
+
+    def to_pandas(self) -> pd.DataFrame:
+        return pd.DataFrame(self.columns, columns=EXCEPTION_COLS, copy=False)
+
+    def to_arrow(self) -> pa.Table:
+        arrays = []
+        for field in EXCEPTION_SCHEMA:
+            values = self.columns[field.name]
+            if field.name == "as_of_date":
+                dates = pd.to_datetime(pd.Series(values, dtype=object), errors="coerce")
+                arrays.append(pa.array(dates, type=pa.timestamp("ns"), from_pandas=True).cast(field.type))
+            else:
+                arrays.append(pa.array(values, from_pandas=True).cast(field.type))
+        return pa.Table.from_arrays(arrays, schema=EXCEPTION_SCHEMA)
+
+
+def concat_exception_frames(frames: Iterable[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate exception frames, keeping the categorical columns categorical."""
+    return ExceptionBatch.concat(ExceptionBatch.from_frame(frame) for frame in frames).to_pandas()
@@ -0,0 +1,92 @@
+"""Declared column types for source extracts."""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, Mapping, Tuple
+
+import pandas as pd
+import pyarrow as pa
+
+from security_recon.domain.dictionary import AttributeRuleSet
+
+DTYPE_BACKENDS = ("numpy", "pyarrow")
+
+# Wire types used while rows are being read (driver values -> Arrow arrays).
+ARROW_TYPES: Dict[str, pa.DataType] = {
+    "string": pa.string(),
+    "float": pa.float64(),
+    "date": pa.date32(),
+    "bool": pa.bool_(),
+}
+
+# In-memory dtypes per kind. Attribute strings are low-cardinality codes, so
+# they are dictionary encoded; key strings are near-unique and stay plain.
+_NUMPY_DTYPES: Dict[str, object] = {
+    "key_string": "string[pyarrow]",
+    "string": "category",
+    "float": "float64",
+    # Second resolution spans years 1..9999, so 9999-12-31 maturities fit; [ns] stops at 2262.
+    "date": "datetime64[s]",
+    "bool": "boolean",
+}
+_PYARROW_DTYPES: Dict[str, object] = {
+    "key_string": pd.ArrowDtype(pa.string()),
+    "string": pd.ArrowDtype(pa.dictionary(pa.int32(), pa.string())),
+    "float": pd.ArrowDtype(pa.float64()),
+    "date": pd.ArrowDtype(pa.date32()),
+    "bool": pd.ArrowDtype(pa.bool_()),
+}
+
+
+@dataclass(frozen=True)
+class ExtractSchema:
+    """Typed layout applied to every extract so no column stays ``object``."""
+    kinds: Mapping[str, str]
+    key_names: Tuple[str, ...] = ()
+    dtype_backend: str = "numpy"
+    dtypes: Mapping[str, object] = field(init=False)
+
+    def __post_init__(self) -> None:
+        if self.dtype_backend not in DTYPE_BACKENDS:
+            raise ValueError(f"Unsupported dtype backend: {self.dtype_backend!r}")
+        table = _PYARROW_DTYPES if self.dtype_backend == "pyarrow" else _NUMPY_DTYPES
+        dtypes = {}
+        for name, kind in self.kinds.items():
+            lookup = "key_string" if kind == "string" and name in self.key_names else kind
+            dtypes[name] = table[lookup]
+        object.__setattr__(self, "dtypes", dtypes)
+
+    @classmethod
+    def from_rule_set(cls, rule_set: AttributeRuleSet, dtype_backend: str = "numpy") -> "ExtractSchema":
+        return cls(rule_set.column_kinds(), rule_set.key_names, dtype_backend)
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        return tuple(self.kinds)
+
+    def arrow_schema(self) -> pa.Schema:
+        return pa.schema([(name, ARROW_TYPES[kind]) for name, kind in self.kinds.items()])
+
+    def apply(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Cast the declared columns in ``df``; undeclared columns are left alone.
+
+        Values that cannot take the declared type raise ``ValueError`` rather
+        than being nulled out, so an extract never silently loses data.
+        """
+        converted = {}
+        for name, dtype in self.dtypes.items():
+            if name not in df.columns or df[name].dtype == dtype:
+                continue
+            try:
+                converted[name] = df[name].astype(dtype)
+            except (ValueError, TypeError, OverflowError) as exc:
+                raise ValueError(f"Column {name!r} does not fit its declared type {dtype}: {exc}") from exc
+        return df.assign(**converted) if converted else df
+
+
+def memory_report(df: pd.DataFrame) -> Dict[str, int]:
+    """Deep memory usage in bytes per column, plus a ``__total__`` entry."""
+    usage = df.memory_usage(deep=True, index=False)
+    report = {str(name): int(size) for name, size in usage.items()}
+    report["__total__"] = int(usage.sum())
+    return report
@@ -0,0 +1,140 @@
+"""Compaction of per-run exception files into one consolidated file per ``as_of_date``."""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pyarrow.parquet as pq
+
+from security_recon.domain.exception_batch import EXCEPTION_COLS, ExceptionBatch, concat_exception_frames
+from security_recon.integration.parquet_writer import ParquetWriter
+from security_recon.integration.s3_uploader import S3Uploader
+from security_recon.repositories.artifact_repository import ArtifactRepository
+from security_recon.support import get_logger
+from security_recon.support.config import load_config
+
+logger = get_logger(__name__)
+
+COMPACTED_RUN_ID = "compacted"
+# Sort order of the compacted file: one instrument's exceptions across runs end up together.
+COMPACTION_SORT_KEYS = ["instrument_id", "attribute", "run_id"]
+
+
+def _load_compaction_config() -> Dict[str, Any]:
+    return load_config().get("compaction", {}) or {}
+
+
+@dataclass
+class CompactionResult:
+    as_of_date: date
+    path: Optional[Path]
+    run_ids: List[str] = field(default_factory=list)
+    row_count: int = 0
+    s3_uri: Optional[str] = None
+    purged: List[str] = field(default_factory=list)
+
+
+class ExceptionCompactor:
+    """Merges every uploaded exceptions file of a date into ``exceptions.compacted.<yyyymmdd>.parquet``.
+
+    Per-run files are read from ``<source_dir>/uploaded`` (where ``S3Uploader``
+    leaves them) together with any earlier compacted file for the date, so
+    re-compacting after new runs is incremental. The merged file is sorted,
+    written with the compaction encoding profile, uploaded, and ``artifact_log``
+    rows of the merged runs are repointed at it. Originals move to
+    ``uploaded/archive/<yyyymmdd>/`` and are deleted (locally and from S3) once
+    older than ``retention_days``.
+    """
+
+    def __init__(
+        self,
+        source_dir: str | Path | None = None,
+        *,
+        uploader: S3Uploader | None = None,
+        artifact_repo: ArtifactRepository | None = None,
+        profile: str | None = None,
+        retention_days: int | None = None,
+    ) -> None:
+        cfg = _load_compaction_config()
+        self.source_dir = Path(source_dir) if source_dir else ParquetWriter().base_dir
+        self.uploaded_dir = self.source_dir / "uploaded"
+        self.archive_dir = self.uploaded_dir / "archive"
+        self.writer = ParquetWriter(base_dir=self.source_dir, profile=profile or cfg.get("profile", "archival"))
+        self.retention_days = int(cfg.get("retention_days", 30) if retention_days is None else retention_days)
+        self.uploader = uploader
+        self.artifact_repo = artifact_repo
+
+    def compact(self, as_of_date: date) -> CompactionResult:
+        compacted_name = self.writer.filename_for(COMPACTED_RUN_ID, as_of_date)
+        previous = self.uploaded_dir / compacted_name
+        originals = [
+            path
+            for path in sorted(self.uploaded_dir.glob(self.writer.filename_for("*", as_of_date)))
+            if path.name != compacted_name and self._is_exceptions_file(path)
+        ]
+        if not originals:
+            logger.info("Nothing to compact for %s", as_of_date)
+            return CompactionResult(as_of_date=as_of_date, path=previous if previous.exists() else None)
+
+        sources = ([previous] if previous.exists() else []) + originals
+        merged = (
+            concat_exception_frames(pq.read_table(path).to_pandas() for path in sources)
+            .sort_values(COMPACTION_SORT_KEYS, kind="mergesort")
+            .reset_index(drop=True)
+        )
+        staged = self.writer.write_exceptions(ExceptionBatch.from_frame(merged), as_of_date, COMPACTED_RUN_ID)
+        run_ids = sorted(str(run_id) for run_id in merged["run_id"].unique())
+
+        if self.uploader is not None:
+            s3_uri = self.uploader.upload(staged.name)
+            target = self.uploader.uploaded_dir / staged.name
+        else:
+            s3_uri = None
+            target = self.uploaded_dir / staged.name
+            staged.replace(target)
+        if s3_uri is not None and self.artifact_repo is not None:
+            repointed = self.artifact_repo.repoint(as_of_date=as_of_date, run_ids=run_ids, s3_uri=s3_uri)
+            logger.info("Repointed %s artifact_log rows for %s at %s", repointed, as_of_date, s3_uri)
+
+        archive = self.archive_dir / as_of_date.strftime("%Y%m%d")
+        archive.mkdir(parents=True, exist_ok=True)
+        for path in originals:
+            path.replace(archive / path.name)
+        logger.info(
+            "Compacted %s files (%s rows) for %s into %s", len(originals), len(merged), as_of_date, target
+        )
+        return CompactionResult(
+            as_of_date=as_of_date,
+            path=target,
+            run_ids=run_ids,
+            row_count=len(merged),
+            s3_uri=s3_uri,
+            purged=self.apply_retention(),
+        )
+
+    def apply_retention(self, now: float | None = None) -> List[str]:
+        """Delete archived originals older than ``retention_days``; returns their file names."""
+        cutoff = (time.time() if now is None else now) - self.retention_days * 86_400
+        purged = []
+        for path in sorted(self.archive_dir.glob("*/*.parquet")):
+            if path.stat().st_mtime >= cutoff:
+                continue
+            if self.uploader is not None:
+                self.uploader.delete(path.name)
+            path.unlink()
+            purged.append(path.name)
+        for folder in self.archive_dir.glob("*"):
+            if folder.is_dir() and not any(folder.iterdir()):
+                folder.rmdir()
+        return purged
+
+    @staticmethod
+    def _is_exceptions_file(path: Path) -> bool:
+        names = pq.read_schema(path).names
+        if all(name in names for name in EXCEPTION_COLS):
+            return True
+        logger.warning("Skipping %s: not in the exceptions layout", path)
+        return False
@@ -0,0 +1,249 @@
+"""Filtered, projected, paginated reads of a run's exceptions straight from Parquet."""
+from __future__ import annotations
+
+import base64
+import json
+from fnmatch import fnmatch
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+from security_recon.domain.exception_batch import EXCEPTION_COLS, EXCEPTION_SCHEMA
+from security_recon.integration.compaction import COMPACTED_RUN_ID
+from security_recon.integration.parquet_writer import DATASET_PARTITIONING, ParquetWriter
+from security_recon.repositories.artifact_repository import ArtifactRepository
+from security_recon.repositories.data_models import ArtifactLog
+from security_recon.support import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_PAGE_SIZE = 1_000
+MAX_PAGE_SIZE = 100_000
+SCAN_BATCH_SIZE = 64 * 1024
+_CURSOR_KEY = "instrument_id"
+
+
+class RunNotFoundError(LookupError):
+    """No exceptions file could be located for a run."""
+
+
+class InvalidCursorError(ValueError):
+    """A pagination cursor that was not issued by ``ExceptionsQuery``."""
+
+
+@dataclass
+class ExceptionsPage:
+    schema: pa.Schema
+    batches: List[pa.RecordBatch] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+    @property
+    def num_rows(self) -> int:
+        return sum(batch.num_rows for batch in self.batches)
+
+    def iter_ndjson(self) -> Iterator[bytes]:
+        for batch in self.batches:
+            rows = batch.to_pylist()
+            if rows:
+                yield "".join(json.dumps(row, default=str) + "\n" for row in rows).encode()
+
+    def iter_arrow_ipc(self) -> Iterator[bytes]:
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, self.schema) as writer:
+            for batch in self.batches:
+                writer.write_batch(batch)
+        yield sink.getvalue().to_pybytes()
+
+
+@dataclass(frozen=True)
+class _Cursor:
+    """Resume point: fragment index, last key emitted and rows already emitted with that key.
+
+    Every exceptions file (and dataset fragment) is written in key order, so
+    ``instrument_id >= key`` restarts the scan with row-group pruning and only
+    the rows of the boundary instrument are skipped.
+    """
+
+    fragment: int = 0
+    key: Optional[str] = None
+    emitted: int = 0
+
+    def encode(self) -> str:
+        payload = json.dumps([self.fragment, self.key, self.emitted]).encode()
+        return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, token: Optional[str]) -> "_Cursor":
+        if not token:
+            return cls()
+        try:
+            fragment, key, emitted = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+            return cls(int(fragment), key, int(emitted))
+        except (ValueError, TypeError) as exc:
+            raise InvalidCursorError(f"Invalid cursor: {token!r}") from exc
+
+
+def _prefix_filter(prefix: str) -> pc.Expression:
+    """``startswith`` written as a range so Parquet min/max statistics can prune row groups."""
+    column = pc.field(_CURSOR_KEY)
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return (column >= prefix) & (column < upper)
+
+
+class ExceptionsQuery:
+    """Serves pages of one run's exceptions without reading whole files into memory.
+
+    The run's data is located, in order, as the per-run file under
+    ``exception_file.directory`` (pending, ``uploaded/`` or archived), the
+    run's parts of the partitioned dataset, or the artifact recorded in
+    ``artifact_log`` (a local file for a queued upload, else a local copy of
+    the uploaded object if present, else S3). Compacted artifacts hold every
+    run of a date and are filtered on ``run_id`` like the rest; only a dedup
+    hit, an uploaded object named for another run, is read whole with its
+    ``run_id`` column reported as the requested run. Filters are
+    pushed into the dataset scan, so partitions and row groups whose
+    statistics cannot match are skipped, and at most one page of rows is
+    materialized.
+    """
+
+    def __init__(
+        self,
+        writer: ParquetWriter | None = None,
+        artifact_repo: ArtifactRepository | None = None,
+    ) -> None:
+        self.writer = writer or ParquetWriter()
+        self.artifact_repo = artifact_repo
+
+    def locate(self, run_id: str) -> Tuple[ds.Dataset, bool]:
+        """The run's data and whether it is a shared artifact whose rows carry another ``run_id``."""
+        name = self.writer.filename_for(run_id, "*")  # type: ignore[arg-type] - "*" globs over dates
+        base = self.writer.base_dir
+        for folder in (base, base / "uploaded", *sorted((base / "uploaded" / "archive").glob("*"))):
+            files = sorted(folder.glob(name))
+            if files:
+                return ds.dataset([str(path) for path in files], format="parquet"), False
+
+        dataset_dir = self.writer.dataset_dir
+        parts = sorted(dataset_dir.rglob(f"part-{ParquetWriter._format_run_id(run_id)}-*.parquet"))
+        if parts:
+            return ds.dataset(
+                [str(path) for path in parts],
+                format="parquet",
+                partitioning=DATASET_PARTITIONING,
+                partition_base_dir=str(dataset_dir),
+            ), False
+
+        artifact = None
+        if self.artifact_repo is not None:
+            artifact = self.artifact_repo.fetch_latest(run_id, artifact_type="exceptions")
+        if artifact is not None and artifact.s3_uri.startswith("file://"):
+            # Upload still queued: the file is on disk, possibly already moved to uploaded/.
+            local = Path(url2pathname(urlparse(artifact.s3_uri).path))
+            for path in (local, local.parent / "uploaded" / local.name):
+                if path.exists():
+                    return ds.dataset(str(path), format="parquet"), False
+        if artifact is not None and artifact.s3_uri.startswith("s3://"):
+            local = base / "uploaded" / Path(artifact.s3_uri).name
+            source = str(local) if local.exists() else artifact.s3_uri
+            return ds.dataset(source, format="parquet"), self._is_dedup_hit(run_id, artifact)
+        raise RunNotFoundError(f"No exceptions found for run {run_id}")
+
+    def _is_dedup_hit(self, run_id: str, artifact: ArtifactLog) -> bool:
+        """Another run's identical upload, as opposed to this run's own or a compacted file."""
+        name = Path(artifact.s3_uri).name
+        own = (run_id, COMPACTED_RUN_ID)
+        return artifact.status == "uploaded" and not any(
+            fnmatch(name, self.writer.filename_for(owner, "*")) for owner in own  # type: ignore[arg-type]
+        )
+
+    def page(
+        self,
+        run_id: str,
+        *,
+        attributes: Sequence[str] | None = None,
+        difference_types: Sequence[str] | None = None,
+        instrument_prefix: str | None = None,
+        columns: Sequence[str] | None = None,
+        cursor: str | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ) -> ExceptionsPage:
+        if not 0 < limit <= MAX_PAGE_SIZE:
+            raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+        columns = list(columns or EXCEPTION_COLS)
+        unknown = sorted(set(columns) - set(EXCEPTION_COLS))
+        if unknown:
+            raise ValueError(f"Unknown exception columns: {unknown}")
+        columns = [name for name in EXCEPTION_COLS if name in columns]
+        schema = pa.schema([EXCEPTION_SCHEMA.field(name) for name in columns])
+        position = _Cursor.decode(cursor)
+
+        dataset, shared = self.locate(run_id)
+        condition = pc.scalar(True) if shared else pc.field("run_id") == run_id
+        if attributes:
+            condition &= pc.field("attribute").isin(list(attributes))
+        if difference_types:
+            condition &= pc.field("difference_type").isin(list(difference_types))
+        if instrument_prefix:
+            condition &= _prefix_filter(instrument_prefix)
+        fragments = sorted(dataset.get_fragments(filter=condition), key=lambda fragment: fragment.path)
+        scan_columns = columns if _CURSOR_KEY in columns else [*columns, _CURSOR_KEY]
+        logger.debug("Scanning %s fragments of run %s from %s", len(fragments), run_id, position)
+
+        page = ExceptionsPage(schema=schema)
+        remaining = limit
+        key, emitted = position.key, position.emitted
+        for index in range(position.fragment, len(fragments)):
+            if index != position.fragment:
+                key, emitted = None, 0
+            resume = condition if key is None else condition & (pc.field(_CURSOR_KEY) >= key)
+            skip = emitted
+            for batch in self._scan(fragments[index], dataset.schema, scan_columns, resume):
+                if skip:
+                    # Rows of the boundary instrument already sent on the previous page.
+                    boundary = pc.sum(pc.equal(batch.column(_CURSOR_KEY), key)).as_py() or 0
+                    dropped = min(skip, boundary)
+                    batch, skip = batch.slice(dropped), skip - dropped
+                if not batch.num_rows:
+                    continue
+                batch = batch.slice(0, remaining)
+                keys = batch.column(_CURSOR_KEY)
+                last = keys[-1].as_py()
+                same = pc.sum(pc.equal(keys, last)).as_py()
+                emitted = emitted + same if last == key else same
+                key = last
+                page.batches.append(self._project(batch, schema, run_id if shared else None))
+                remaining -= batch.num_rows
+                if not remaining:
+                    page.next_cursor = _Cursor(index, key, emitted).encode()
+                    return page
+        return page
+
+    @staticmethod
+    def _scan(
+        fragment: ds.Fragment, schema: pa.Schema, columns: List[str], condition: pc.Expression
+    ) -> Iterator[pa.RecordBatch]:
+        """Scan a file one row group at a time, skipping groups whose statistics rule them out.
+
+        Scanning row groups separately (rather than the whole file) keeps the
+        scanner's read-ahead from decoding the rest of the file once a page is full.
+        """
+        for row_group in fragment.split_by_row_group(filter=condition, schema=schema):
+            scanner = ds.Scanner.from_fragment(
+                row_group, schema=schema, columns=columns, filter=condition, batch_size=SCAN_BATCH_SIZE
+            )
+            yield from scanner.to_batches()
+
+    @staticmethod
+    def _project(batch: pa.RecordBatch, schema: pa.Schema, run_id: str | None = None) -> pa.RecordBatch:
+        table = pa.Table.from_batches([batch]).select(schema.names).cast(schema)
+        if run_id is not None and "run_id" in schema.names:
+            index = schema.get_field_index("run_id")
+            column = pa.array([run_id] * table.num_rows).dictionary_encode().cast(schema.field("run_id").type)
+            table = table.set_column(index, schema.field("run_id"), column)
+        return table.combine_chunks().to_batches()[0]
@@ -1,44 +1,295 @@
 """Parquet IO helpers."""
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import date
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Mapping, Tuple
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 
+from security_recon.domain.exception_batch import (
+    CATEGORY_COLS,
+    EXCEPTION_COLS,
+    EXCEPTION_SCHEMA,
+    ExceptionBatch,
+)
 from security_recon.support.config import load_config
 
 
+DEFAULT_ROW_GROUP_SIZE = 100_000
+
+# Hive layout of the optional exceptions dataset:
+# <root>/as_of_date=YYYY-MM-DD/difference_type=.../attribute=.../part-<runid>-<n>.parquet
+DATASET_PARTITIONING = ds.partitioning(
+    pa.schema([("as_of_date", pa.date32()), ("difference_type", pa.string()), ("attribute", pa.string())]),
+    flavor="hive",
+)
+
+
 def _load_exception_config() -> Dict[str, Any]:
     return load_config().get("exception_file", {}) or {}
 
 
+@dataclass(frozen=True)
+class EncodingProfile:
+    """Named set of Parquet writer options (compression, dictionary encoding, row groups)."""
+    name: str
+    compression: str = "snappy"
+    compression_level: int | None = None
+    # True/False for every column, or the columns to dictionary-encode.
+    use_dictionary: bool | Tuple[str, ...] = True
+    # Raised to keep dictionary encoding on instead of falling back to plain pages.
+    dictionary_pagesize_limit: int | None = None
+    row_group_size: int | None = None
+
+    @classmethod
+    def from_config(cls, name: str, options: Mapping[str, Any]) -> "EncodingProfile":
+        use_dictionary = options.get("use_dictionary", True)
+        if not isinstance(use_dictionary, bool):
+            use_dictionary = tuple(use_dictionary)
+        return cls(
+            name=name,
+            compression=options.get("compression", "snappy"),
+            compression_level=options.get("compression_level"),
+            use_dictionary=use_dictionary,
+            dictionary_pagesize_limit=options.get("dictionary_pagesize_limit"),
+            row_group_size=options.get("row_group_size"),
+        )
+
+    def writer_options(self) -> Dict[str, Any]:
+        """Keyword arguments accepted by ``pq.write_table``/``pq.ParquetWriter``."""
+        options: Dict[str, Any] = {
+            "compression": self.compression,
+            "use_dictionary": (
+                self.use_dictionary if isinstance(self.use_dictionary, bool) else list(self.use_dictionary)
+            ),
+            "write_statistics": True,
+        }
+        if self.compression_level is not None:
+            options["compression_level"] = self.compression_level
+        if self.dictionary_pagesize_limit is not None:
+            options["dictionary_pagesize_limit"] = self.dictionary_pagesize_limit
+        return options
+
+
+DEFAULT_PROFILES: Dict[str, EncodingProfile] = {
+    "fast": EncodingProfile("fast", compression="snappy"),
+    "archival": EncodingProfile("archival", compression="zstd", compression_level=19, row_group_size=1_000_000),
+    "dictionary": EncodingProfile(
+        "dictionary",
+        compression="zstd",
+        compression_level=3,
+        use_dictionary=CATEGORY_COLS,
+        dictionary_pagesize_limit=16 * 1024**2,
+    ),
+}
+
+
+def load_profiles(cfg: Mapping[str, Any] | None = None) -> Dict[str, EncodingProfile]:
+    """Built-in profiles overlaid with ``exception_file.profiles`` from the config."""
+    cfg = _load_exception_config() if cfg is None else cfg
+    profiles = dict(DEFAULT_PROFILES)
+    for name, options in (cfg.get("profiles", {}) or {}).items():
+        profiles[name] = EncodingProfile.from_config(name, options or {})
+    return profiles
+
+
+class ExceptionStreamWriter:
+    """Writes exception batches to one Parquet file as they arrive.
+
+    Batches are buffered until ``row_group_size`` rows are pending, then
+    flushed as a row group through ``pyarrow.parquet.ParquetWriter``, so memory
+    stays bounded by one row group. Data goes to a ``.tmp`` sibling that is
+    renamed onto ``path`` on ``close``; ``abort`` (or an exception inside a
+    ``with`` block) removes it, so readers never see a partial file.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+        profile: EncodingProfile = DEFAULT_PROFILES["fast"],
+    ) -> None:
+        self.path = Path(path)
+        self.row_group_size = int(row_group_size)
+        self.rows_written = 0
+        self._tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+        self._pending: List[pa.Table] = []
+        self._pending_rows = 0
+        self._writer = pq.ParquetWriter(self._tmp_path, EXCEPTION_SCHEMA, **profile.writer_options())
+
+    def write(self, exceptions: pd.DataFrame | ExceptionBatch) -> None:
+        batch = exceptions if isinstance(exceptions, ExceptionBatch) else ExceptionBatch.from_frame(exceptions)
+        if not len(batch):
+            return
+        self._pending.append(batch.to_arrow())
+        self._pending_rows += len(batch)
+        if self._pending_rows >= self.row_group_size:
+            self._flush(final=False)
+
+    def close(self) -> Path:
+        self._flush(final=True)
+        self._writer.close()
+        self._tmp_path.replace(self.path)
+        return self.path
+
+    def abort(self) -> None:
+        self._writer.close()
+        self._tmp_path.unlink(missing_ok=True)
+
+    def _flush(self, *, final: bool) -> None:
+        """Write every complete row group; the remainder waits for more rows unless ``final``."""
+        if not self._pending:
+            return
+        table = pa.concat_tables(self._pending)
+        complete = table.num_rows if final else table.num_rows - table.num_rows % self.row_group_size
+        for offset in range(0, complete, self.row_group_size):
+            self._writer.write_table(table.slice(offset, min(self.row_group_size, complete - offset)))
+        self.rows_written += complete
+        remainder = table.slice(complete)
+        self._pending = [remainder] if remainder.num_rows else []
+        self._pending_rows = remainder.num_rows
+
+    def __enter__(self) -> "ExceptionStreamWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
 class ParquetWriter:
-    def __init__(self, base_dir: str | Path | None = None, filename_pattern: str | None = None) -> None:
+    def __init__(
+        self,
+        base_dir: str | Path | None = None,
+        filename_pattern: str | None = None,
+        profile: str | None = None,
+        dataset_dir: str | Path | None = None,
+    ) -> None:
         cfg = _load_exception_config()
         directory = base_dir or cfg.get("directory", "./parquet")
         pattern = filename_pattern or cfg.get("filename", "exceptions.<runid>.<yyyymmdd>.parquet")
 
         self.base_dir = Path(directory)
         self.filename_pattern = pattern
+        profiles = load_profiles(cfg)
+        profile_name = profile or cfg.get("profile", "fast")
+        if profile_name not in profiles:
+            raise ValueError(f"Unknown exception_file profile: {profile_name!r}")
+        self.profile = profiles[profile_name]
+        self.row_group_size = int(
+            self.profile.row_group_size or cfg.get("row_group_size", DEFAULT_ROW_GROUP_SIZE)
+        )
+        dataset_cfg = cfg.get("dataset", {}) or {}
+        self.dataset_enabled = bool(dataset_cfg.get("enabled", False))
+        self.dataset_dir = Path(dataset_dir or dataset_cfg.get("directory") or self.base_dir / "dataset")
 
     def write_exceptions(
         self,
-        df: pd.DataFrame,
+        df: pd.DataFrame | ExceptionBatch,
         run_date: date,
         run_id: str | int,
     ) -> Path:
-        """Persist exceptions under the configured directory using the run metadata."""
+        """Persist exceptions under the configured directory using the run metadata.
+
+        Exception batches (and frames in the exception layout) are written with
+        the fixed ``EXCEPTION_SCHEMA``; any other frame is written as-is.
+        """
 
         target_dir = self.base_dir
         target_dir.mkdir(parents=True, exist_ok=True)
 
         file_name = self._render_filename(run_id, run_date)
         out_path = target_dir / file_name
-        df.to_parquet(out_path, index=False)
+        if isinstance(df, pd.DataFrame) and list(df.columns) == EXCEPTION_COLS:
+            df = ExceptionBatch.from_frame(df)
+        if isinstance(df, ExceptionBatch):
+            pq.write_table(
+                df.to_arrow(),
+                out_path,
+                row_group_size=self.row_group_size,
+                **self.profile.writer_options(),
+            )
+        else:
+            df.to_parquet(out_path, index=False, **self.profile.writer_options())
         return out_path
 
+    def write_exceptions_buffer(
+        self,
+        df: pd.DataFrame | ExceptionBatch,
+        run_date: date,
+        run_id: str | int,
+    ) -> Tuple[str, pa.Buffer]:
+        """In-memory counterpart of ``write_exceptions``: the file name and its Parquet bytes.
+
+        Used to hand a file straight to ``S3Uploader.upload_buffer`` without a
+        local copy.
+        """
+        batch = df if isinstance(df, ExceptionBatch) else ExceptionBatch.from_frame(df)
+        sink = pa.BufferOutputStream()
+        pq.write_table(batch.to_arrow(), sink, row_group_size=self.row_group_size, **self.profile.writer_options())
+        return self._render_filename(run_id, run_date), sink.getvalue()
+
+    def open_exceptions(self, run_date: date, run_id: str | int) -> ExceptionStreamWriter:
+        """Streaming counterpart of ``write_exceptions``: same target path, written batch by batch."""
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        return ExceptionStreamWriter(
+            self.base_dir / self._render_filename(run_id, run_date),
+            self.row_group_size,
+            self.profile,
+        )
+
+    def write_exceptions_dataset(
+        self,
+        exceptions: pd.DataFrame | ExceptionBatch | Path,
+        run_id: str | int,
+    ) -> Path:
+        """Add a run's exceptions to the Hive-partitioned dataset under ``dataset_dir``.
+
+        Files are partitioned by ``as_of_date``/``difference_type``/``attribute``,
+        sorted by ``instrument_id`` and written with column statistics, so readers
+        can prune directories and row groups. A ``Path`` is read back as an
+        already key-ordered exceptions file (the streaming path) and is
+        repartitioned batch by batch. Re-writing a run replaces its own files.
+        """
+        if isinstance(exceptions, Path):
+            data: ds.Dataset | pa.Table = ds.dataset(exceptions, format="parquet", schema=EXCEPTION_SCHEMA)
+        else:
+            batch = exceptions if isinstance(exceptions, ExceptionBatch) else ExceptionBatch.from_frame(exceptions)
+            data = batch.to_arrow().sort_by("instrument_id")
+
+        # Remove the run's earlier files first: a partition the run no longer
+        # produces would otherwise keep stale rows.
+        for stale in self.dataset_dir.rglob(f"part-{self._format_run_id(run_id)}-*.parquet"):
+            stale.unlink()
+
+        file_format = ds.ParquetFileFormat()
+        ds.write_dataset(
+            data,
+            self.dataset_dir,
+            format=file_format,
+            partitioning=DATASET_PARTITIONING,
+            basename_template=f"part-{self._format_run_id(run_id)}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+            file_options=file_format.make_write_options(**self.profile.writer_options()),
+            max_rows_per_group=self.row_group_size,
+        )
+        return self.dataset_dir
+
+    def exceptions_dataset(self) -> ds.Dataset:
+        """Open the partitioned exceptions dataset for filtered, projected scans."""
+        return ds.dataset(self.dataset_dir, format="parquet", partitioning=DATASET_PARTITIONING)
+
+    def filename_for(self, run_id: str | int, run_date: date) -> str:
+        """File name ``write_exceptions`` uses for a run (``"*"`` yields a glob over runs)."""
+        return self._render_filename(run_id, run_date)
+
     def _render_filename(self, run_id: str | int, run_date: date) -> str:
         run_id_token = self._format_run_id(run_id)
         date_tokens = self._format_dates(run_date)
@@ -1,14 +1,77 @@
 """Helpers for uploading parquet outputs to Amazon S3."""
 from __future__ import annotations
 
+import hashlib
+from datetime import date
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Any, BinaryIO, Dict, Optional
 
 import boto3
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError
 
+from security_recon.support import get_logger
 from security_recon.support.config import load_config
 
+if TYPE_CHECKING:
+    from security_recon.repositories.artifact_repository import ArtifactRepository
+
+logger = get_logger(__name__)
+
+MiB = 1024 * 1024
+# S3 validates each part against this checksum on receipt, so a corrupted
+# upload fails the request itself and no follow-up ``head_object`` is needed.
+CHECKSUM_ALGORITHM = "SHA256"
+# User metadata key holding ``content_hash`` of an uploaded file.
+CONTENT_HASH_METADATA = "content-sha256"
+# Columns that differ between runs of the same data and so are left out of the content hash.
+_RUN_COLUMNS = ("run_id",)
+
+
+def content_hash(path: str | Path, as_of_date: date) -> str:
+    """SHA-256 over the rows of a parquet file, ignoring ``run_id`` and the physical encoding.
+
+    Re-running an unchanged date yields the same hash even though the run id,
+    file name and compression may differ. The hash is seeded with
+    ``as_of_date`` so files without rows never match across dates.
+    """
+    parquet = pq.ParquetFile(path)
+    columns = [name for name in parquet.schema_arrow.names if name not in _RUN_COLUMNS]
+    digest = hashlib.sha256("\x1f".join([as_of_date.isoformat(), *columns]).encode())
+    for batch in parquet.iter_batches(columns=columns):
+        rows = pd.util.hash_pandas_object(batch.to_pandas(), index=False)
+        digest.update(rows.to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def try_content_hash(path: str | Path, as_of_date: date) -> Optional[str]:
+    """``content_hash`` or ``None`` when the file is not readable parquet (it is then uploaded as-is)."""
+    try:
+        return content_hash(path, as_of_date)
+    except (OSError, pa.ArrowException) as exc:
+        logger.warning("Cannot hash %s, uploading without dedup: %s", path, exc)
+        return None
+
+
+@lru_cache(maxsize=None)
+def _s3_client(endpoint_url: Optional[str], region_name: Optional[str]) -> Any:
+    """One client per endpoint, shared by every uploader (clients are thread-safe)."""
+    return boto3.client("s3", endpoint_url=endpoint_url, region_name=region_name)
+
+
+def _transfer_config(config: Dict[str, Any]) -> TransferConfig:
+    return TransferConfig(
+        multipart_threshold=int(config.get("multipart_threshold_mb", 8)) * MiB,
+        multipart_chunksize=int(config.get("multipart_chunksize_mb", 16)) * MiB,
+        max_concurrency=int(config.get("max_concurrency", 10)),
+        use_threads=True,
+    )
+
+
 class S3Uploader:
     """Streams parquet artifacts to S3 and archives them locally."""
 
@@ -17,9 +80,12 @@ class S3Uploader:
         bucket: Optional[str] = None,
         prefix: Optional[str] = None,
         source_dir: Optional[str | Path] = None,
+        client: Any = None,
+        artifact_repo: "ArtifactRepository | None" = None,
     ) -> None:
-        self._s3 = boto3.client("s3")
-        config = load_config().get("s3", {})
+        config = load_config().get("s3", {}) or {}
+        self._s3 = client or _s3_client(config.get("endpoint_url"), config.get("region"))
+        self._transfer = _transfer_config(config)
 
         self.bucket = bucket or config.get("bucket")
         self.prefix = prefix or config.get("prefix", "results")
@@ -30,32 +96,92 @@ class S3Uploader:
             )
         self.source_dir = Path(source_dir or "parquet").resolve()
         self.uploaded_dir = self.source_dir / "uploaded"
+        self.artifact_repo = artifact_repo
 
-    def upload(self, file_name: str) -> str:
-        """Upload a parquet file to S3 and move it to ``parquet/uploaded`` locally."""
-        source_path = self.source_dir / file_name
-        if not source_path.exists():
-            raise FileNotFoundError(f"Parquet file not found: {source_path}")
-
-        key = self._build_key(file_name)
+    def upload(
+        self,
+        file_name: str,
+        content_hash: Optional[str] = None,
+        as_of_date: Optional[date] = None,
+    ) -> str:
+        """Upload a parquet file to S3 and move it to ``parquet/uploaded`` locally.
 
-        with source_path.open("rb") as file_handle:
-            self._s3.upload_fileobj(file_handle, self.bucket, key)
+        With a ``content_hash``, identical content already stored under the
+        same key, or (given ``as_of_date``) recorded in ``artifact_log`` for
+        that date, is not sent again; the existing object's URI is returned
+        instead. A file already moved to ``uploaded/`` by an attempt that was
+        interrupted before it was recorded is resolved the same way, so
+        retrying an upload is safe.
+        """
+        source_path = self.local_path(file_name)
 
-        self._verify_upload(key)
+        duplicate = self.find_duplicate(file_name, content_hash, as_of_date) if content_hash else None
+        if duplicate is not None:
+            logger.info("Skipping upload of %s: identical content already at %s", file_name, duplicate)
+            uri = duplicate
+        else:
+            with source_path.open("rb") as file_handle:
+                uri = self.upload_buffer(file_handle, file_name, content_hash=content_hash)
 
         self.uploaded_dir.mkdir(parents=True, exist_ok=True)
         destination_path = self.uploaded_dir / file_name
-        source_path.replace(destination_path)
+        if source_path != destination_path:
+            source_path.replace(destination_path)
+
+        return uri
+
+    def local_path(self, file_name: str) -> Path:
+        """Where ``file_name`` is on disk: ``source_dir``, else its ``uploaded/`` copy."""
+        for path in (self.source_dir / file_name, self.uploaded_dir / file_name):
+            if path.exists():
+                return path
+        raise FileNotFoundError(f"Parquet file not found: {self.source_dir / file_name}")
 
+    def upload_buffer(
+        self,
+        data: BinaryIO | bytes | pa.Buffer,
+        file_name: str,
+        content_hash: Optional[str] = None,
+    ) -> str:
+        """Upload an in-memory buffer or readable stream as ``file_name``; nothing is written locally.
+
+        Large payloads go up as parallel multipart uploads sized by ``s3.multipart_*``
+        and ``s3.max_concurrency``, each part carrying a SHA-256 checksum.
+        """
+        if isinstance(data, (bytes, bytearray, memoryview, pa.Buffer)):
+            data = pa.BufferReader(data)
+        key = self._build_key(file_name)
+        extra_args: Dict[str, Any] = {"ChecksumAlgorithm": CHECKSUM_ALGORITHM}
+        if content_hash:
+            extra_args["Metadata"] = {CONTENT_HASH_METADATA: content_hash}
+        self._s3.upload_fileobj(data, self.bucket, key, ExtraArgs=extra_args, Config=self._transfer)
         return f"s3://{self.bucket}/{key}"
 
+    def find_duplicate(
+        self, file_name: str, content_hash: str, as_of_date: Optional[date] = None
+    ) -> Optional[str]:
+        """URI of an uploaded object with ``content_hash``: first ``artifact_log``, then the target key.
+
+        ``artifact_log`` is only consulted for ``as_of_date``, so a date's
+        record never points at an object another date's retention may delete.
+        """
+        if self.artifact_repo is not None and as_of_date is not None:
+            record = self.artifact_repo.find_by_content_hash(content_hash, as_of_date=as_of_date)
+            if record is not None:
+                return record.s3_uri
+        key = self._build_key(file_name)
+        try:
+            head = self._s3.head_object(Bucket=self.bucket, Key=key)
+        except ClientError:
+            return None
+        if (head.get("Metadata") or {}).get(CONTENT_HASH_METADATA) == content_hash:
+            return f"s3://{self.bucket}/{key}"
+        return None
+
+    def delete(self, file_name: str) -> None:
+        """Remove a previously uploaded file from S3 (missing keys are ignored by S3)."""
+        self._s3.delete_object(Bucket=self.bucket, Key=self._build_key(file_name))
+
     def _build_key(self, file_name: str) -> str:
         prefix = self.prefix.rstrip("/")
         return f"{prefix}/{file_name}" if prefix else file_name
-
-    def _verify_upload(self, key: str) -> None:
-        try:
-            self._s3.head_object(Bucket=self.bucket, Key=key)
-        except ClientError as exc:  # noqa: BLE001
-            raise RuntimeError(f"Failed to verify S3 upload for {key}") from exc
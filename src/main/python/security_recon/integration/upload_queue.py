@@ -0,0 +1,323 @@
+"""Durable background queue for S3 uploads, journaled in SQLite."""
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from security_recon.integration.s3_uploader import S3Uploader, try_content_hash
+from security_recon.repositories.artifact_repository import ArtifactRepository
+from security_recon.support import get_logger
+from security_recon.support.config import load_config
+
+logger = get_logger(__name__)
+
+QUEUED = "queued"
+UPLOADING = "uploading"
+UPLOADED = "uploaded"
+FAILED = "failed"
+UPLOAD_STATUSES = (QUEUED, UPLOADING, UPLOADED, FAILED)
+
+# Errors that no retry can fix (missing bucket config, file gone).
+PERMANENT_ERRORS = (ValueError, FileNotFoundError)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS upload_jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT NOT NULL,
+    as_of_date TEXT NOT NULL,
+    artifact_type TEXT NOT NULL,
+    file_path TEXT NOT NULL,
+    artifact_id INTEGER,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    s3_uri TEXT,
+    last_error TEXT
+)
+"""
+
+
+def _load_queue_config() -> Dict[str, Any]:
+    return load_config().get("upload_queue", {}) or {}
+
+
+@dataclass
+class UploadJob:
+    id: int
+    run_id: str
+    as_of_date: date
+    artifact_type: str
+    file_path: Path
+    artifact_id: Optional[int]
+    status: str
+    attempts: int
+    next_attempt_at: float
+    s3_uri: Optional[str] = None
+    last_error: Optional[str] = None
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> "UploadJob":
+        return cls(
+            id=row["id"],
+            run_id=row["run_id"],
+            as_of_date=date.fromisoformat(row["as_of_date"]),
+            artifact_type=row["artifact_type"],
+            file_path=Path(row["file_path"]),
+            artifact_id=row["artifact_id"],
+            status=row["status"],
+            attempts=row["attempts"],
+            next_attempt_at=row["next_attempt_at"],
+            s3_uri=row["s3_uri"],
+            last_error=row["last_error"],
+        )
+
+
+class UploadQueue:
+    """Uploads files to S3 off the request path, surviving process restarts.
+
+    Every job is a row in a SQLite journal; ``workers`` background threads
+    claim due jobs, upload them and record ``artifact_log`` transitions
+    (``queued`` -> ``uploading`` -> ``uploaded``/``failed``). Failed attempts
+    are retried with exponential backoff (``base_delay * 2**attempt``, capped at
+    ``max_delay``) up to ``max_attempts``. Jobs left ``uploading`` by a crash
+    are re-queued on ``start``.
+    """
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        *,
+        artifact_repo: ArtifactRepository | None = None,
+        uploader_factory: Callable[[Path], S3Uploader] | None = None,
+        workers: int | None = None,
+        max_attempts: int | None = None,
+        base_delay: float | None = None,
+        max_delay: float | None = None,
+        poll_interval: float | None = None,
+    ) -> None:
+        cfg = _load_queue_config()
+        self.path = Path(path or cfg.get("path", "./resources/upload_queue.sqlite"))
+        self.artifact_repo = artifact_repo
+        self.uploader_factory = uploader_factory or (
+            lambda source_dir: S3Uploader(source_dir=source_dir, artifact_repo=artifact_repo)
+        )
+        self.workers = max(1, int(workers or cfg.get("workers", 2)))
+        self.max_attempts = int(max_attempts or cfg.get("max_attempts", 5))
+        self.base_delay = float(cfg.get("base_delay_seconds", 2.0) if base_delay is None else base_delay)
+        self.max_delay = float(cfg.get("max_delay_seconds", 300.0) if max_delay is None else max_delay)
+        self.poll_interval = float(
+            cfg.get("poll_interval_seconds", 1.0) if poll_interval is None else poll_interval
+        )
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._initialized = False
+
+    # -- producer side --
+
+    def enqueue(
+        self,
+        *,
+        run_id: str,
+        as_of_date: date,
+        file_path: Path,
+        artifact_type: str = "exceptions",
+    ) -> int:
+        """Journal an upload and return its job id; the caller does not wait for S3."""
+        file_path = Path(file_path).resolve()
+        artifact_id = None
+        if self.artifact_repo is not None:
+            artifact_id = self.artifact_repo.record_upload(
+                run_id=run_id,
+                as_of_date=as_of_date,
+                artifact_type=artifact_type,
+                s3_uri=file_path.as_uri(),
+                status=QUEUED,
+            ).id
+        with closing(self._connect()) as conn:
+            job_id = conn.execute(
+                "INSERT INTO upload_jobs (run_id, as_of_date, artifact_type, file_path, artifact_id, status, "
+                "next_attempt_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    run_id,
+                    as_of_date.isoformat(),
+                    artifact_type,
+                    str(file_path),
+                    artifact_id,
+                    QUEUED,
+                    time.time(),
+                ),
+            ).lastrowid
+        self._wakeup.set()
+        return int(job_id)
+
+    def job(self, job_id: int) -> Optional[UploadJob]:
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT * FROM upload_jobs WHERE id = ?", (job_id,)).fetchone()
+        return UploadJob.from_row(row) if row else None
+
+    def jobs(self, status: str | None = None) -> List[UploadJob]:
+        with closing(self._connect()) as conn:
+            if status is None:
+                rows = conn.execute("SELECT * FROM upload_jobs ORDER BY id").fetchall()
+            else:
+                rows = conn.execute(
+                    "SELECT * FROM upload_jobs WHERE status = ? ORDER BY id", (status,)
+                ).fetchall()
+        return [UploadJob.from_row(row) for row in rows]
+
+    def retry_failed(self) -> int:
+        """Give jobs that exhausted their attempts a fresh set of retries."""
+        with closing(self._connect()) as conn:
+            count = conn.execute(
+                "UPDATE upload_jobs SET status = ?, attempts = 0, next_attempt_at = ? WHERE status = ?",
+                (QUEUED, time.time(), FAILED),
+            ).rowcount
+        self._wakeup.set()
+        return count
+
+    # -- worker side --
+
+    def start(self) -> None:
+        """Re-queue jobs interrupted by a previous process and start the worker threads."""
+        if self._threads:
+            return
+        with closing(self._connect()) as conn:
+            recovered = conn.execute(
+                "UPDATE upload_jobs SET status = ? WHERE status = ?", (QUEUED, UPLOADING)
+            ).rowcount
+        if recovered:
+            logger.info("Re-queued %s interrupted uploads", recovered)
+        self._stopping.clear()
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"upload-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stop the workers after their current upload; queued jobs stay in the journal."""
+        self._stopping.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def drain(self) -> int:
+        """Process every job that is due now on the calling thread; returns the jobs attempted."""
+        attempted = 0
+        while (job := self._claim()) is not None:
+            self._process(job)
+            attempted += 1
+        return attempted
+
+    def _work(self) -> None:
+        while not self._stopping.is_set():
+            job = self._claim()
+            if job is None:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                continue
+            self._process(job)
+
+    def _claim(self) -> Optional[UploadJob]:
+        """Take the next due job; safe across threads and across processes sharing the journal."""
+        with closing(self._connect()) as conn:
+            while True:
+                row = conn.execute(
+                    "SELECT * FROM upload_jobs WHERE status = ? AND next_attempt_at <= ? "
+                    "ORDER BY next_attempt_at, id LIMIT 1",
+                    (QUEUED, time.time()),
+                ).fetchone()
+                if row is None:
+                    return None
+                # Only one claimant's conditional update matches; the others look again.
+                claimed = conn.execute(
+                    "UPDATE upload_jobs SET status = ? WHERE id = ? AND status = ?",
+                    (UPLOADING, row["id"], QUEUED),
+                ).rowcount
+                if claimed:
+                    break
+        job = UploadJob.from_row(row)
+        job.status = UPLOADING
+        return job
+
+    def _process(self, job: UploadJob) -> None:
+        self._update_artifact(job, UPLOADING)
+        digest = None
+        try:
+            uploader = self.uploader_factory(job.file_path.parent)
+            # After a crash between the upload and the journal update the file is
+            # already in uploaded/; its hash lets the uploader find the stored object.
+            digest = try_content_hash(uploader.local_path(job.file_path.name), job.as_of_date)
+            s3_uri = uploader.upload(job.file_path.name, content_hash=digest, as_of_date=job.as_of_date)
+        except Exception as exc:  # noqa: BLE001 - recorded on the job and retried
+            self._record_failure(job, exc)
+            return
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "UPDATE upload_jobs SET status = ?, attempts = attempts + 1, s3_uri = ?, last_error = NULL "
+                "WHERE id = ?",
+                (UPLOADED, s3_uri, job.id),
+            )
+        self._update_artifact(job, UPLOADED, s3_uri=s3_uri, content_hash=digest)
+        logger.info("Uploaded %s for run %s to %s", job.file_path.name, job.run_id, s3_uri)
+
+    def _record_failure(self, job: UploadJob, exc: Exception) -> None:
+        attempts = job.attempts + 1
+        permanent = isinstance(exc, PERMANENT_ERRORS) or attempts >= self.max_attempts
+        status = FAILED if permanent else QUEUED
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempts - 1))
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "UPDATE upload_jobs SET status = ?, attempts = ?, next_attempt_at = ?, last_error = ? "
+                "WHERE id = ?",
+                (status, attempts, time.time() + delay, f"{type(exc).__name__}: {exc}", job.id),
+            )
+        if permanent:
+            logger.error(
+                "Upload of %s for run %s failed after %s attempts: %s", job.file_path, job.run_id, attempts, exc
+            )
+            self._update_artifact(job, FAILED)
+        else:
+            logger.warning(
+                "Upload of %s failed (attempt %s), retrying in %.0fs: %s", job.file_path, attempts, delay, exc
+            )
+            self._update_artifact(job, QUEUED)
+
+    def _update_artifact(
+        self,
+        job: UploadJob,
+        status: str,
+        *,
+        s3_uri: str | None = None,
+        content_hash: str | None = None,
+    ) -> None:
+        if self.artifact_repo is None or job.artifact_id is None:
+            return
+        try:
+            self.artifact_repo.update_status(
+                job.artifact_id,
+                status=status,
+                s3_uri=s3_uri,
+                uploaded_at=datetime.utcnow() if status == UPLOADED else None,
+                content_hash=content_hash,
+            )
+        except Exception:  # noqa: BLE001 - the journal stays authoritative
+            logger.exception("Could not record %s status for artifact %s", status, job.artifact_id)
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialized:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        if not self._initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_SCHEMA)
+            self._initialized = True
+        return conn
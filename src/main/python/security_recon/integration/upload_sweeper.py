@@ -0,0 +1,124 @@
+"""Retries uploads of exception files left behind in the output directory."""
+from __future__ import annotations
+
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import pyarrow.parquet as pq
+
+from security_recon.integration.parquet_writer import ParquetWriter
+from security_recon.integration.s3_uploader import S3Uploader, try_content_hash
+from security_recon.integration.upload_queue import QUEUED, UPLOADING, UploadQueue
+from security_recon.repositories.artifact_repository import ArtifactRepository
+from security_recon.support import get_logger
+from security_recon.support.config import load_config
+
+logger = get_logger(__name__)
+
+
+def _load_sweeper_config() -> Dict[str, Any]:
+    return load_config().get("upload_sweeper", {}) or {}
+
+
+@dataclass
+class SweptFile:
+    path: Path
+    s3_uri: Optional[str] = None
+    error: Optional[str] = None
+
+
+class UploadSweeper:
+    """Uploads every exceptions file still sitting in ``exception_file.directory``.
+
+    A file stays there only if its upload never succeeded (uploaded files move
+    to ``uploaded/``). Files younger than ``min_age_seconds`` or owned by a
+    pending ``UploadQueue`` job are left alone. Uploads run on a bounded thread
+    pool and go through content-hash dedup, so content already in S3 is only
+    recorded, not re-sent.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path | None = None,
+        *,
+        artifact_repo: ArtifactRepository | None = None,
+        uploader_factory: Callable[[Path], S3Uploader] | None = None,
+        upload_queue: UploadQueue | None = None,
+        workers: int | None = None,
+        min_age_seconds: float | None = None,
+    ) -> None:
+        cfg = _load_sweeper_config()
+        exception_cfg = load_config().get("exception_file", {}) or {}
+        self.directory = Path(directory or exception_cfg.get("directory", "./parquet"))
+        self._name_pattern = self._filename_regex(ParquetWriter(self.directory).filename_pattern)
+        self.artifact_repo = artifact_repo
+        self.uploader_factory = uploader_factory or (
+            lambda source_dir: S3Uploader(source_dir=source_dir, artifact_repo=artifact_repo)
+        )
+        self.upload_queue = upload_queue
+        self.workers = max(1, int(workers or cfg.get("workers", 4)))
+        self.min_age_seconds = float(
+            cfg.get("min_age_seconds", 300) if min_age_seconds is None else min_age_seconds
+        )
+
+    def pending_files(self) -> List[Path]:
+        cutoff = time.time() - self.min_age_seconds
+        owned = set()
+        if self.upload_queue is not None:
+            owned = {job.file_path for status in (QUEUED, UPLOADING) for job in self.upload_queue.jobs(status)}
+        return [
+            path
+            for path in sorted(self.directory.glob("*.parquet"))
+            if path.stat().st_mtime <= cutoff and path.resolve() not in owned
+        ]
+
+    def sweep(self) -> List[SweptFile]:
+        files = self.pending_files()
+        if not files:
+            return []
+        logger.info("Sweeping %s unuploaded files from %s", len(files), self.directory)
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(files))) as pool:
+            return list(pool.map(self._upload, files))
+
+    def _upload(self, path: Path) -> SweptFile:
+        try:
+            run_id, as_of_date = self._run_of(path)
+            digest = try_content_hash(path, as_of_date)
+            uploader = self.uploader_factory(path.parent)
+            s3_uri = uploader.upload(path.name, content_hash=digest, as_of_date=as_of_date)
+            if self.artifact_repo is not None:
+                self.artifact_repo.record_upload(
+                    run_id=run_id,
+                    as_of_date=as_of_date,
+                    artifact_type="exceptions",
+                    s3_uri=s3_uri,
+                    content_hash=digest,
+                )
+        except Exception as exc:  # noqa: BLE001 - one bad file must not stop the sweep
+            logger.exception("Sweeper could not upload %s", path)
+            return SweptFile(path, error=f"{type(exc).__name__}: {exc}")
+        return SweptFile(path, s3_uri=s3_uri)
+
+    def _run_of(self, path: Path) -> tuple[str, date]:
+        """``run_id`` and ``as_of_date`` of an exceptions file: its first row, else its file name."""
+        parquet = pq.ParquetFile(path)
+        if parquet.metadata.num_rows:
+            row = parquet.read_row_group(0, columns=["run_id", "as_of_date"]).slice(0, 1).to_pylist()[0]
+            return str(row["run_id"]), row["as_of_date"]
+        match = self._name_pattern.fullmatch(path.name)
+        if match is None:
+            raise ValueError(f"Cannot tell the run of empty file {path.name}")
+        day = match.group("date").replace("-", "")
+        return match.group("run_id"), datetime.strptime(day, "%Y%m%d").date()
+
+    @staticmethod
+    def _filename_regex(pattern: str) -> re.Pattern[str]:
+        regex = re.escape(pattern)
+        regex = regex.replace(re.escape("<runid>"), r"(?P<run_id>.+?)")
+        regex = regex.replace(re.escape("<yyyy-mm-dd>"), r"(?P<date>\d{4}-\d{2}-\d{2})")
+        return re.compile(regex.replace(re.escape("<yyyymmdd>"), r"(?P<date>\d{8})"))
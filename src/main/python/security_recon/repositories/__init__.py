@@ -6,10 +6,13 @@ from .security_repository import (
 	LegacySecurityRepository,
 	StrategicSecurityRepository,
 )
+from .snapshot_cache import CachedSecurityRepository, SnapshotCache
 
 __all__ = [
 	"LegacySecurityRepository",
 	"StrategicSecurityRepository",
 	"MetricsRepository",
 	"ArtifactRepository",
+	"CachedSecurityRepository",
+	"SnapshotCache",
 ]
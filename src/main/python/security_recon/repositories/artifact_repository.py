@@ -2,9 +2,9 @@
 from __future__ import annotations
 
 from datetime import date, datetime
-from typing import Optional
+from typing import Iterable, Optional
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 
 from security_recon.repositories.data_models import ArtifactLog
@@ -26,6 +26,7 @@ class ArtifactRepository:
         s3_uri: str,
         status: str = "uploaded",
         uploaded_at: Optional[datetime] = None,
+        content_hash: Optional[str] = None,
     ) -> ArtifactLog:
         session: Session = self.db_service.postgres_session_factory()
         try:
@@ -36,6 +37,7 @@ class ArtifactRepository:
                 s3_uri=s3_uri,
                 status=status,
                 uploaded_at=uploaded_at or datetime.utcnow(),
+                content_hash=content_hash,
             )
             session.add(record)
             session.commit()
@@ -47,6 +49,57 @@ class ArtifactRepository:
         finally:
             session.close()
 
+    def update_status(
+        self,
+        artifact_id: int,
+        *,
+        status: str,
+        s3_uri: Optional[str] = None,
+        uploaded_at: Optional[datetime] = None,
+        content_hash: Optional[str] = None,
+    ) -> None:
+        """Move an artifact through its upload states, optionally recording where it landed."""
+        values: dict = {"status": status}
+        if s3_uri is not None:
+            values["s3_uri"] = s3_uri
+        if uploaded_at is not None:
+            values["uploaded_at"] = uploaded_at
+        if content_hash is not None:
+            values["content_hash"] = content_hash
+        session: Session = self.db_service.postgres_session_factory()
+        try:
+            session.execute(update(ArtifactLog).where(ArtifactLog.id == artifact_id).values(**values))
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def find_by_content_hash(
+        self,
+        content_hash: str,
+        *,
+        as_of_date: date,
+        artifact_type: str = "exceptions",
+    ) -> Optional[ArtifactLog]:
+        """Most recent uploaded artifact of ``as_of_date`` holding exactly this content, if any."""
+        session: Session = self.db_service.postgres_session_factory()
+        try:
+            stmt = (
+                select(ArtifactLog)
+                .where(
+                    ArtifactLog.content_hash == content_hash,
+                    ArtifactLog.as_of_date == as_of_date,
+                    ArtifactLog.artifact_type == artifact_type,
+                    ArtifactLog.status == "uploaded",
+                )
+                .order_by(ArtifactLog.uploaded_at.desc())
+            )
+            return session.execute(stmt).scalars().first()
+        finally:
+            session.close()
+
     def fetch_latest(self, run_id: str, *, artifact_type: str) -> Optional[ArtifactLog]:
         session: Session = self.db_service.postgres_session_factory()
         try:
@@ -61,3 +114,33 @@ class ArtifactRepository:
             return session.execute(stmt).scalars().first()
         finally:
             session.close()
+
+    def repoint(
+        self,
+        *,
+        as_of_date: date,
+        run_ids: Iterable[str],
+        s3_uri: str,
+        artifact_type: str = "exceptions",
+        status: str = "compacted",
+    ) -> int:
+        """Point the artifacts of ``run_ids`` at a consolidated file; returns the rows updated."""
+        session: Session = self.db_service.postgres_session_factory()
+        try:
+            stmt = (
+                update(ArtifactLog)
+                .where(
+                    ArtifactLog.as_of_date == as_of_date,
+                    ArtifactLog.artifact_type == artifact_type,
+                    ArtifactLog.run_id.in_(list(run_ids)),
+                )
+                .values(s3_uri=s3_uri, status=status)
+            )
+            updated = session.execute(stmt).rowcount
+            session.commit()
+            return updated
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
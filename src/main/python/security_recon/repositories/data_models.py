@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 from datetime import date, datetime
+from typing import Optional
 
 from sqlalchemy import Date, DateTime, Integer, String
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
@@ -33,6 +34,8 @@ class ArtifactLog(Base):
     s3_uri: Mapped[str] = mapped_column(String(1024), nullable=False)
     status: Mapped[str] = mapped_column(String(20), nullable=False, default="uploaded")
     uploaded_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    # SHA-256 of the file's rows (run_id excluded), used to skip re-uploading identical content.
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64), index=True, nullable=True)
 
 
 __all__ = ["Base", "ReconRunSummary", "ArtifactLog"]
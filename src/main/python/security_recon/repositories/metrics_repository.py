@@ -15,7 +15,10 @@ class MetricsRepository:
         self.db_service = DatabaseService()
 
     def compute_metrics(self, ex_df: pd.DataFrame, run_id: str, as_of_date: date) -> MetricsPayload:
-        total = len(ex_df)
+        return self.compute_metrics_for_count(len(ex_df), run_id=run_id, as_of_date=as_of_date)
+
+    def compute_metrics_for_count(self, total: int, run_id: str, as_of_date: date) -> MetricsPayload:
+        """Metrics for a run whose exceptions were streamed to disk rather than held in memory."""
         unexplained = total
         return MetricsPayload(
             run_id=run_id,
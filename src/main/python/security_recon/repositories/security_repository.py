@@ -1,55 +1,388 @@
 """Data access repositories for security snapshots."""
 from __future__ import annotations
 
+import io
 from datetime import date
+from typing import Any, Dict, Iterator, Sequence, Tuple
 
 import pandas as pd
-from sqlalchemy import text
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+from psycopg import sql
+from sqlalchemy import bindparam, text
+from sqlalchemy.engine import Engine
 
+from security_recon.domain.dictionary import AttributeRuleSet
+from security_recon.domain.dictionary_loader import load_rules_from_resource
+from security_recon.domain.extract_schema import ExtractSchema, memory_report
+from security_recon.support import get_logger
+from security_recon.support.config import load_config
 from security_recon.support.database_service import DatabaseService
 
-class LegacySecurityRepository:
-    def __init__(self) -> None:
+logger = get_logger(__name__)
+
+DEFAULT_CHUNK_SIZE = 50_000
+# Rendered in place of NULL inside checksum row text, so NULL and '' hash differently.
+CHECKSUM_NULL_TOKEN = "<NULL>"
+
+
+def _load_extract_config() -> Dict[str, Any]:
+    return load_config().get("extract", {}) or {}
+
+
+def rows_to_record_batch(rows: Sequence[Sequence[Any]], schema: pa.Schema) -> pa.RecordBatch:
+    """Build a record batch from DB rows, casting each column to the declared type.
+
+    Types are inferred per column first (``Decimal`` -> decimal128, tinyint ->
+    int64, all-null -> null) and then cast, so every chunk carries the same
+    schema regardless of driver quirks or null-only chunks.
+    """
+    columns = list(zip(*rows)) if rows else [()] * len(schema)
+    arrays = [pa.array(values).cast(field.type) for values, field in zip(columns, schema)]
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+class _SecurityRepository:
+    """Shared snapshot queries; subclasses bind the engine, table and key ordering.
+
+    The projected columns come from the data dictionary, so only keys and
+    reconciled attributes are read from the source.
+    """
+
+    table: str = ""
+    # Byte-wise ordering so both databases agree with Python string comparison.
+    binary_order_by: str = "instrument_id"
+
+    def __init__(
+        self,
+        chunk_size: int | None = None,
+        rule_set: AttributeRuleSet | None = None,
+        dtype_backend: str | None = None,
+    ) -> None:
+        cfg = _load_extract_config()
         self.db_service = DatabaseService()
+        self.chunk_size = int(chunk_size or cfg.get("chunk_size", DEFAULT_CHUNK_SIZE))
+        self.rule_set = rule_set or load_rules_from_resource()
+        self.extract_schema = ExtractSchema.from_rule_set(
+            self.rule_set,
+            dtype_backend or cfg.get("dtype_backend", "numpy"),
+        )
+        self.columns = self.extract_schema.columns
+        self.schema = self.extract_schema.arrow_schema()
 
-    def load_by_date(self, as_of_date: date) -> pd.DataFrame:
+    @property
+    def engine(self) -> Engine:
+        raise NotImplementedError
+
+    @staticmethod
+    def _cast_text_sql(expression: str) -> str:
+        """Cast ``expression`` to the dialect's text type (NULL stays NULL)."""
+        raise NotImplementedError
+
+    @staticmethod
+    def _decimal_text_sql(expression: str) -> str:
+        """Render a numeric column as fixed-scale decimal text, identically on both dialects."""
+        raise NotImplementedError
+
+    @staticmethod
+    def _date_text_sql(expression: str) -> str:
+        """Render a date column as ``YYYY-MM-DD``."""
+        raise NotImplementedError
+
+    @staticmethod
+    def _hash32_sql(expression: str) -> str:
+        """Unsigned 32-bit integer taken from the MD5 of a text expression."""
+        raise NotImplementedError
+
+    def _text_sql(self, expression: str, null_text: str = "") -> str:
+        """Render ``expression`` as text, with NULL as ``null_text``."""
+        return f"COALESCE({self._cast_text_sql(expression)}, '{null_text}')"
+
+    def _checksum_text_sql(self, column: str) -> str:
+        """Column rendered the same way in MySQL and Postgres, after dictionary normalization.
+
+        Floats are compared at a fixed decimal scale and strings are trimmed or
+        upper-cased per their rule, so rows the differ would consider equal
+        produce equal text. Values that only match within a float tolerance hash
+        differently, which is safe: their bucket is simply diffed in Python.
+        """
+        kind = self.extract_schema.kinds[column]
+        if kind == "float":
+            rendered = self._decimal_text_sql(column)
+        elif kind == "date":
+            rendered = self._date_text_sql(column)
+        elif kind == "bool":
+            # NULL must stay NULL so the COALESCE below keeps it apart from FALSE.
+            rendered = f"CASE WHEN {column} IS NULL THEN NULL WHEN {column} THEN '1' ELSE '0' END"
+        else:
+            rendered = self._cast_text_sql(column)
+            rule = self.rule_set.get_rule(column)
+            if rule is not None and rule.trim:
+                rendered = f"TRIM({rendered})"
+            if rule is not None and rule.ignore_case:
+                rendered = f"UPPER({rendered})"
+        return f"COALESCE({rendered}, '{CHECKSUM_NULL_TOKEN}')"
+
+    def _bucket_sql(self) -> str:
+        return f"MOD({self._hash32_sql(self._text_sql('instrument_id'))}, :bucket_count)"
+
+    def fingerprint(self, as_of_date: date) -> str:
+        """Cheap change-detection token for a snapshot: row count plus a content checksum.
+
+        The checksum is computed in the database (a sum of per-row MD5 prefixes)
+        so only two scalars cross the network.
+        """
+        # NULL gets its own token so a NULL <-> '' correction changes the fingerprint.
+        row_text = "CONCAT_WS('|', {})".format(
+            ", ".join(self._text_sql(column, CHECKSUM_NULL_TOKEN) for column in self.columns)
+        )
         query = text(
-            """
+            f"""
             SELECT
-                instrument_id,
-                as_of_date,
-                isin,
-                cfi_code,
-                coupon,
-                maturity_date,
-                currency,
-                callable_flag
-            FROM legacy_security_master.security_master
+                COUNT(*) AS row_count,
+                COALESCE(SUM({self._hash32_sql(row_text)}), 0) AS checksum
+            FROM {self.table}
             WHERE as_of_date = :as_of_date
             """
         )
-        with self.db_service.mysql_engine.connect() as connection:
-            return pd.read_sql(query, connection, params={"as_of_date": as_of_date})
+        with self.engine.connect() as connection:
+            row_count, checksum = connection.execute(query, {"as_of_date": as_of_date}).one()
+        return f"{int(row_count)}:{int(checksum)}"
 
+    def load_by_date_range(self, start_date: date, end_date: date) -> pd.DataFrame:
+        """Extract every snapshot with ``start_date <= as_of_date <= end_date`` in one query."""
+        query = text(self._select_sql(date_filter="as_of_date BETWEEN :start_date AND :end_date"))
+        with self.engine.connect() as connection:
+            df = pd.read_sql(
+                query,
+                connection,
+                params={"start_date": start_date, "end_date": end_date},
+                dtype_backend=self._read_sql_backend,
+            )
+        return self._typed(df, f"{start_date}..{end_date}")
 
-class StrategicSecurityRepository:
-    def __init__(self) -> None:
-        self.db_service = DatabaseService()
+    def bucket_checksums(self, as_of_date: date, bucket_count: int) -> Dict[int, Tuple[int, int]]:
+        """Per-bucket ``(row_count, checksum)`` for a snapshot, aggregated in the database.
 
-    def load_by_date(self, as_of_date: date) -> pd.DataFrame:
+        Rows are bucketed by ``MOD(hash(instrument_id), bucket_count)`` and each
+        bucket sums a hash of the normalized row text. Both dialects render the
+        same text and hash, so equal buckets mean equal rows on both sides.
+        """
+        row_text = "CONCAT_WS('|', {})".format(
+            ", ".join(self._checksum_text_sql(column) for column in self.columns)
+        )
         query = text(
-            """
-            SELECT instrument_id,
-                as_of_date,
-                isin,
-                cfi_code,
-                coupon,
-                maturity_date,
-                currency,
-                callable_flag
-            FROM security_master.security_master
+            f"""
+            SELECT
+                {self._bucket_sql()} AS bucket,
+                COUNT(*) AS row_count,
+                SUM({self._hash32_sql(row_text)}) AS checksum
+            FROM {self.table}
             WHERE as_of_date = :as_of_date
+            GROUP BY 1
+            """
+        )
+        with self.engine.connect() as connection:
+            rows = connection.execute(query, {"as_of_date": as_of_date, "bucket_count": bucket_count}).all()
+        return {int(bucket): (int(row_count), int(checksum)) for bucket, row_count, checksum in rows}
+
+    def load_by_buckets(self, as_of_date: date, buckets: Sequence[int], bucket_count: int) -> pd.DataFrame:
+        """Extract only the rows whose instrument falls in ``buckets``."""
+        query = text(self._select_sql(bucketed=True)).bindparams(bindparam("buckets", expanding=True))
+        with self.engine.connect() as connection:
+            df = pd.read_sql(
+                query,
+                connection,
+                params={
+                    "as_of_date": as_of_date,
+                    "bucket_count": bucket_count,
+                    "buckets": [int(bucket) for bucket in buckets],
+                },
+                dtype_backend=self._read_sql_backend,
+            )
+        return self._typed(df, as_of_date)
+
+    def _select_sql(
+        self,
+        *,
+        ordered: bool = False,
+        bucketed: bool = False,
+        as_of_date_param: str = ":as_of_date",
+        date_filter: str | None = None,
+    ) -> str:
+        columns = ",\n                ".join(self.columns)
+        query = f"""
+            SELECT
+                {columns}
+            FROM {self.table}
+            WHERE {date_filter or f"as_of_date = {as_of_date_param}"}
             """
+        if bucketed:
+            query += f"AND {self._bucket_sql()} IN :buckets\n"
+        if ordered:
+            query += f"ORDER BY {self.binary_order_by}\n"
+        return query
+
+    def load_by_date(self, as_of_date: date) -> pd.DataFrame:
+        query = text(self._select_sql())
+        with self.engine.connect() as connection:
+            df = pd.read_sql(
+                query,
+                connection,
+                params={"as_of_date": as_of_date},
+                dtype_backend=self._read_sql_backend,
+            )
+        return self._typed(df, as_of_date)
+
+    @property
+    def _read_sql_backend(self) -> str:
+        return "pyarrow" if self.extract_schema.dtype_backend == "pyarrow" else "numpy_nullable"
+
+    def _typed(self, df: pd.DataFrame, as_of_date: date | str) -> pd.DataFrame:
+        """Apply the declared extract schema and log the resulting memory footprint."""
+        df = self.extract_schema.apply(df)
+        report = memory_report(df)
+        logger.info(
+            "Extracted %s rows from %s for %s (%.1f MiB): %s",
+            len(df),
+            self.table,
+            as_of_date,
+            report["__total__"] / 2**20,
+            {name: size for name, size in report.items() if name != "__total__"},
+        )
+        return df
+
+    def iter_by_date(self, as_of_date: date, batch_size: int | None = None) -> Iterator[pd.DataFrame]:
+        """Yield the snapshot in ``instrument_id`` order, ``batch_size`` rows at a time."""
+        return self.iter_chunks_by_date(as_of_date, batch_size, ordered=True)
+
+    def iter_chunks_by_date(
+        self,
+        as_of_date: date,
+        chunk_size: int | None = None,
+        *,
+        as_arrow: bool = False,
+        ordered: bool = False,
+    ) -> Iterator[pd.DataFrame] | Iterator[pa.RecordBatch]:
+        """Stream the snapshot through a server-side (unbuffered) cursor.
+
+        Rows are fetched ``chunk_size`` at a time (``stream_results``/``yield_per``),
+        so neither PyMySQL nor psycopg buffer the full result set client-side.
+        Chunks are typed against the dictionary-derived ``schema`` and yielded
+        as DataFrames, or as Arrow record batches when ``as_arrow`` is set.
+        """
+        size = int(chunk_size or self.chunk_size)
+        query = text(self._select_sql(ordered=ordered))
+        with self.engine.connect() as connection:
+            result = connection.execution_options(stream_results=True, yield_per=size).execute(
+                query, {"as_of_date": as_of_date}
+            )
+            for rows in result.partitions(size):
+                batch = rows_to_record_batch(rows, self.schema)
+                yield batch if as_arrow else self.extract_schema.apply(batch.to_pandas())
+
+
+class LegacySecurityRepository(_SecurityRepository):
+    table = "legacy_security_master.security_master"
+    binary_order_by = "CAST(instrument_id AS BINARY)"
+
+    @property
+    def engine(self) -> Engine:
+        return self.db_service.mysql_engine
+
+    @staticmethod
+    def _cast_text_sql(expression: str) -> str:
+        return f"CAST({expression} AS CHAR)"
+
+    @staticmethod
+    def _decimal_text_sql(expression: str) -> str:
+        return f"CAST(CAST({expression} AS DECIMAL(38, 10)) AS CHAR)"
+
+    @staticmethod
+    def _date_text_sql(expression: str) -> str:
+        return f"CAST(CAST({expression} AS DATE) AS CHAR)"
+
+    @staticmethod
+    def _hash32_sql(expression: str) -> str:
+        return f"CAST(CONV(SUBSTRING(MD5({expression}), 1, 8), 16, 10) AS UNSIGNED)"
+
+
+class StrategicSecurityRepository(_SecurityRepository):
+    table = "security_master.security_master"
+    binary_order_by = 'instrument_id COLLATE "C"'
+
+    def __init__(
+        self,
+        chunk_size: int | None = None,
+        rule_set: AttributeRuleSet | None = None,
+        dtype_backend: str | None = None,
+        extract_mode: str | None = None,
+    ) -> None:
+        super().__init__(chunk_size=chunk_size, rule_set=rule_set, dtype_backend=dtype_backend)
+        mode = extract_mode or _load_extract_config().get("strategic_mode", "read_sql")
+        if mode not in ("read_sql", "copy"):
+            raise ValueError(f"Unsupported strategic extract mode: {mode!r}")
+        self.extract_mode = mode
+
+    @property
+    def engine(self) -> Engine:
+        return self.db_service.postgres_engine
+
+    @staticmethod
+    def _cast_text_sql(expression: str) -> str:
+        return f"CAST({expression} AS TEXT)"
+
+    @staticmethod
+    def _decimal_text_sql(expression: str) -> str:
+        return f"CAST(CAST({expression} AS NUMERIC(38, 10)) AS TEXT)"
+
+    @staticmethod
+    def _date_text_sql(expression: str) -> str:
+        return f"TO_CHAR({expression}, 'YYYY-MM-DD')"
+
+    @staticmethod
+    def _hash32_sql(expression: str) -> str:
+        return f"('x' || SUBSTR(MD5({expression}), 1, 8))::bit(32)::bigint"
+
+    def load_by_date(self, as_of_date: date) -> pd.DataFrame:
+        if self.extract_mode == "copy":
+            return self._typed(self.load_by_date_copy(as_of_date).to_pandas(), as_of_date)
+        return super().load_by_date(as_of_date)
+
+    def load_by_date_copy(self, as_of_date: date) -> pa.Table:
+        """Bulk-export the snapshot with ``COPY (SELECT ...) TO STDOUT`` and parse it with Arrow.
+
+        CSV is used rather than the binary COPY format because Arrow's
+        multi-threaded CSV reader can parse it straight into ``schema``
+        columns without a per-row Python decode.
+        """
+        statement = sql.SQL("COPY ({query}) TO STDOUT WITH (FORMAT CSV, HEADER)").format(
+            query=sql.SQL(self._select_sql(as_of_date_param="{as_of_date}")).format(
+                as_of_date=sql.Literal(as_of_date)
+            )
         )
-        with self.db_service.postgres_engine.connect() as connection:
-            return pd.read_sql(query, connection, params={"as_of_date": as_of_date})
+        buffer = self._copy_to_buffer(statement)
+        return pa_csv.read_csv(
+            buffer,
+            convert_options=pa_csv.ConvertOptions(
+                column_types=self.schema,
+                # COPY writes NULL as an empty field and '' as "", so only unquoted empties are null.
+                strings_can_be_null=True,
+                quoted_strings_can_be_null=False,
+                true_values=["t", "true"],
+                false_values=["f", "false"],
+            ),
+        )
+
+    def _copy_to_buffer(self, statement: sql.Composable) -> io.BytesIO:
+        buffer = io.BytesIO()
+        connection = self.engine.raw_connection()
+        try:
+            with connection.driver_connection.cursor() as cursor:
+                with cursor.copy(statement) as copy:
+                    for block in copy:
+                        buffer.write(block)
+        finally:
+            connection.close()
+        buffer.seek(0)
+        return buffer
@@ -0,0 +1,150 @@
+"""Local Parquet cache for security snapshots keyed by (system, as_of_date)."""
+from __future__ import annotations
+
+import json
+import os
+import threading
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, Optional, Protocol
+from uuid import uuid4
+
+import pandas as pd
+
+from security_recon.support import get_logger
+from security_recon.support.config import load_config
+
+logger = get_logger(__name__)
+
+DEFAULT_MAX_BYTES = 2 * 1024**3
+
+# One lock per cache directory, shared by every SnapshotCache in the process
+# (each ReconPipeline builds its own, and run jobs execute concurrently).
+_DIRECTORY_LOCKS: Dict[Path, threading.Lock] = {}
+_DIRECTORY_LOCKS_GUARD = threading.Lock()
+
+
+def _directory_lock(directory: Path) -> threading.Lock:
+    with _DIRECTORY_LOCKS_GUARD:
+        return _DIRECTORY_LOCKS.setdefault(directory.resolve(), threading.Lock())
+
+
+def _load_cache_config() -> Dict[str, Any]:
+    return load_config().get("snapshot_cache", {}) or {}
+
+
+class SnapshotSource(Protocol):
+    def load_by_date(self, as_of_date: date) -> pd.DataFrame: ...
+
+    def fingerprint(self, as_of_date: date) -> str: ...
+
+
+class SnapshotCache:
+    """Stores one Parquet file per (system, as_of_date) with LRU, size-bounded eviction.
+
+    Each entry has a JSON sidecar holding the source fingerprint it was built
+    from. The sidecar's mtime is bumped on every hit and serves as the LRU
+    clock.
+    """
+
+    def __init__(self, directory: str | Path, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = int(max_bytes)
+        self._lock = _directory_lock(self.directory)
+
+    @classmethod
+    def from_config(cls) -> Optional["SnapshotCache"]:
+        cfg = _load_cache_config()
+        if not cfg.get("enabled", False):
+            return None
+        return cls(
+            cfg.get("directory", "./resources/snapshot_cache"),
+            max_bytes=cfg.get("max_bytes", DEFAULT_MAX_BYTES),
+        )
+
+    def get(self, system: str, as_of_date: date, fingerprint: str) -> Optional[pd.DataFrame]:
+        data_path, meta_path = self._paths(system, as_of_date)
+        with self._lock:
+            if not (data_path.exists() and meta_path.exists()):
+                return None
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            if meta.get("fingerprint") != fingerprint:
+                logger.info("Snapshot cache stale for %s %s", system, as_of_date)
+                self._remove(data_path, meta_path)
+                return None
+            os.utime(meta_path)
+        try:
+            return pd.read_parquet(data_path)
+        except FileNotFoundError:
+            # Evicted by another process between the check and the read: a plain miss.
+            logger.info("Snapshot cache entry for %s %s vanished before it was read", system, as_of_date)
+            return None
+
+    def put(self, system: str, as_of_date: date, fingerprint: str, df: pd.DataFrame) -> Path:
+        data_path, meta_path = self._paths(system, as_of_date)
+        data_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = data_path.with_suffix(f".parquet.{uuid4().hex}.tmp")
+        df.to_parquet(tmp_path, index=False)
+        with self._lock:
+            tmp_path.replace(data_path)
+            meta_path.write_text(
+                json.dumps({"system": system, "as_of_date": str(as_of_date), "fingerprint": fingerprint}),
+                encoding="utf-8",
+            )
+            self._evict()
+        return data_path
+
+    def size_bytes(self) -> int:
+        return sum(path.stat().st_size for path in self.directory.glob("*.parquet"))
+
+    def _paths(self, system: str, as_of_date: date) -> tuple[Path, Path]:
+        stem = f"{system}.{as_of_date.isoformat() if isinstance(as_of_date, date) else as_of_date}"
+        return self.directory / f"{stem}.parquet", self.directory / f"{stem}.json"
+
+    def _evict(self) -> None:
+        entries = []
+        for meta_path in self.directory.glob("*.json"):
+            data_path = meta_path.with_suffix(".parquet")
+            if data_path.exists():
+                entries.append((meta_path.stat().st_mtime, data_path.stat().st_size, data_path, meta_path))
+
+        total = sum(size for _, size, _, _ in entries)
+        for _, size, data_path, meta_path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            logger.info("Evicting cached snapshot %s (%s bytes)", data_path.name, size)
+            self._remove(data_path, meta_path)
+            total -= size
+
+    @staticmethod
+    def _remove(data_path: Path, meta_path: Path) -> None:
+        data_path.unlink(missing_ok=True)
+        meta_path.unlink(missing_ok=True)
+
+
+class CachedSecurityRepository:
+    """Read-through cache in front of a security repository.
+
+    ``load_by_date`` asks the source for its fingerprint and only extracts
+    when the cached copy is missing or stale. Other attributes (streaming,
+    chunked extraction) pass through to the wrapped repository.
+    """
+
+    def __init__(self, repository: SnapshotSource, cache: SnapshotCache, system: str) -> None:
+        self.repository = repository
+        self.cache = cache
+        self.system = system
+
+    def load_by_date(self, as_of_date: date) -> pd.DataFrame:
+        fingerprint = self.repository.fingerprint(as_of_date)
+        cached = self.cache.get(self.system, as_of_date, fingerprint)
+        if cached is not None:
+            logger.info("Snapshot cache hit for %s %s", self.system, as_of_date)
+            return cached
+
+        df = self.repository.load_by_date(as_of_date)
+        self.cache.put(self.system, as_of_date, fingerprint, df)
+        return df
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.repository, name)
@@ -1,6 +1,18 @@
 """Service layer orchestrations and business logic."""
 
+from .incremental import RunStateStore
+from .parallel import PartitionedDiffer
 from .recon import DataFrameDiffer
-from .run import ReconPipeline, ReconResult
+from .run import ReconPipeline, ReconResult, SourceLoadError
+from .run_jobs import RunJob, RunJobManager
 
-__all__ = ["DataFrameDiffer", "ReconPipeline", "ReconResult"]
+__all__ = [
+    "DataFrameDiffer",
+    "PartitionedDiffer",
+    "ReconPipeline",
+    "ReconResult",
+    "RunJob",
+    "RunJobManager",
+    "RunStateStore",
+    "SourceLoadError",
+]
@@ -0,0 +1,134 @@
+"""Incremental re-runs: re-diff only instruments that changed since the last run for a date."""
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from security_recon.domain.dictionary import AttributeRuleSet
+from security_recon.domain.exception_batch import EXCEPTION_COLS, concat_exception_frames
+from security_recon.support import get_logger
+
+logger = get_logger(__name__)
+
+INSTRUMENT_KEY = "instrument_id"
+FINGERPRINT_COL = "fingerprint"
+
+
+def rules_digest(rules: AttributeRuleSet) -> str:
+    """Stable digest of a rule set; state built under different rules is not reused."""
+    return hashlib.sha256(repr((sorted(rules.keys.items()), sorted(rules.rules.items()))).encode()).hexdigest()
+
+
+def instrument_fingerprints(df: pd.DataFrame, rules: AttributeRuleSet) -> pd.Series:
+    """``uint64`` hash of each instrument's raw row, indexed by ``instrument_id``.
+
+    Raw (not normalized) values are hashed because exceptions carry raw
+    values: a change that normalizes away must still refresh the exception.
+    """
+    columns = [column for column in rules.columns if column in df.columns]
+    hashed = pd.util.hash_pandas_object(df[columns], index=False)
+    fingerprints = pd.Series(
+        hashed.to_numpy(), index=pd.Index(df[INSTRUMENT_KEY].astype(str), name=INSTRUMENT_KEY)
+    )
+    if fingerprints.index.has_duplicates:
+        # Duplicate-key rows fold into one order-sensitive hash per instrument.
+        fingerprints = fingerprints.groupby(level=0, sort=False).agg(_combine_hashes)
+    return fingerprints
+
+
+def _combine_hashes(values: pd.Series) -> np.uint64:
+    # Fingerprints are persisted between runs, so the combination must not depend on the interpreter.
+    digest = hashlib.blake2b(values.to_numpy(dtype="<u8").tobytes(), digest_size=8).digest()
+    return np.uint64(int.from_bytes(digest, "little"))
+
+
+def changed_instruments(previous: pd.Series, current: pd.Series) -> pd.Index:
+    """Instruments added, removed, or whose fingerprint differs between two runs."""
+    common = previous.index.intersection(current.index)
+    modified = common[previous.loc[common].to_numpy() != current.loc[common].to_numpy()]
+    return modified.union(previous.index.symmetric_difference(current.index))
+
+
+@dataclass
+class RunState:
+    run_id: str
+    legacy: pd.Series
+    strategic: pd.Series
+    exceptions: pd.DataFrame
+
+
+class RunStateStore:
+    """Keeps fingerprints and exceptions of the last successful run per ``as_of_date``.
+
+    Layout: ``<directory>/<as_of_date>/{legacy,strategic,exceptions}.parquet``
+    plus a ``state.json`` manifest written last, so a partial save is ignored.
+    """
+
+    def __init__(self, directory: str | Path) -> None:
+        self.directory = Path(directory)
+
+    def load(self, as_of_date: date, digest: str) -> RunState | None:
+        folder = self._folder(as_of_date)
+        manifest_path = folder / "state.json"
+        if not manifest_path.exists():
+            return None
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        if manifest.get("rules_digest") != digest:
+            logger.info("Ignoring recon state for %s built under different rules", as_of_date)
+            return None
+        return RunState(
+            run_id=manifest["run_id"],
+            legacy=self._read_fingerprints(folder / "legacy.parquet"),
+            strategic=self._read_fingerprints(folder / "strategic.parquet"),
+            exceptions=pd.read_parquet(folder / "exceptions.parquet"),
+        )
+
+    def save(self, as_of_date: date, digest: str, state: RunState) -> None:
+        folder = self._folder(as_of_date)
+        folder.mkdir(parents=True, exist_ok=True)
+        manifest_path = folder / "state.json"
+        manifest_path.unlink(missing_ok=True)
+        for name, fingerprints in (("legacy", state.legacy), ("strategic", state.strategic)):
+            fingerprints.rename(FINGERPRINT_COL).reset_index().to_parquet(folder / f"{name}.parquet", index=False)
+        state.exceptions.to_parquet(folder / "exceptions.parquet", index=False)
+        manifest_path.write_text(
+            json.dumps({"run_id": state.run_id, "as_of_date": str(as_of_date), "rules_digest": digest}),
+            encoding="utf-8",
+        )
+
+    def _folder(self, as_of_date: date) -> Path:
+        return self.directory / as_of_date.isoformat()
+
+    @staticmethod
+    def _read_fingerprints(path: Path) -> pd.Series:
+        frame = pd.read_parquet(path)
+        return pd.Series(
+            frame[FINGERPRINT_COL].to_numpy(),
+            index=pd.Index(frame[INSTRUMENT_KEY].astype(str), name=INSTRUMENT_KEY),
+        )
+
+
+def patch_exceptions(
+    previous: pd.DataFrame,
+    delta: pd.DataFrame,
+    changed: pd.Index,
+    rules: AttributeRuleSet,
+    run_id: str,
+) -> pd.DataFrame:
+    """Replace the previous exceptions of ``changed`` instruments with ``delta``.
+
+    Exceptions of one instrument are contiguous in a full run and ordered by
+    key, so a stable key sort of the kept and re-diffed rows reproduces it.
+    """
+    kept = previous[~previous[INSTRUMENT_KEY].astype(str).isin(changed)].assign(run_id=run_id)
+    return (
+        concat_exception_frames([kept, delta])
+        .sort_values([key for key in rules.key_names if key in EXCEPTION_COLS], kind="mergesort")
+        .reset_index(drop=True)
+    )
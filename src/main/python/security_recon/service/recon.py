@@ -2,32 +2,62 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import Any, List
+from typing import Any, List, Tuple
 
+import numpy as np
 import pandas as pd
 
-from security_recon.domain.dictionary import AttributeRule, AttributeRuleSet
+from security_recon.domain.dictionary import (
+    BOOL_TRUE_TOKENS,
+    AttributeRule,
+    AttributeRuleSet,
+    CompiledRuleSet,
+    canonical_type,
+)
+from security_recon.domain.exception_batch import EXCEPTION_COLS, ExceptionBatch
+from security_recon.support import get_logger
 
-KEY_COLS = ["instrument_id", "as_of_date"]
-ATTR_COLS = ["coupon", "cfi_code", "maturity_date", "callable_flag"]
+logger = get_logger(__name__)
+
+
+# How rows sharing a key are handled before the outer merge: "exclude" drops
+# the key from both sides, "dedup" keeps the first row of each key.
+DUPLICATE_KEY_POLICIES = ("exclude", "dedup")
 
 
 class DataFrameDiffer:
-    def __init__(self, rule_set: AttributeRuleSet):
+    def __init__(
+        self,
+        rule_set: AttributeRuleSet,
+        *,
+        fingerprint_prefilter: bool = False,
+        duplicate_keys: str = "exclude",
+    ):
+        if duplicate_keys not in DUPLICATE_KEY_POLICIES:
+            raise ValueError(f"Unsupported duplicate key policy: {duplicate_keys!r}")
         self.rule_set = rule_set
+        self.plan = rule_set.compile()
+        self.fingerprint_prefilter = fingerprint_prefilter
+        self.duplicate_keys = duplicate_keys
 
     @staticmethod    
     def normalize_value(value: Any, rule: AttributeRule) -> Any:
         if value is None:
             return None
 
-        if rule.type == "float":
+        kind = canonical_type(rule.type)
+        if kind == "float":
             return float(value)
 
-        if rule.type == "boolean":
+        if kind == "bool":
+            if isinstance(value, str):
+                return value.strip().lower() in BOOL_TRUE_TOKENS
             return bool(value)
 
-        if rule.type == "string":
+        if kind == "date":
+            return pd.Timestamp(value).normalize()
+
+        if kind == "string":
             s = str(value)
             if rule.trim:
                 s = s.strip()
@@ -46,93 +76,216 @@ class DataFrameDiffer:
         normalized_src = DataFrameDiffer.normalize_value(src, rule)
         normalized_tgt = DataFrameDiffer.normalize_value(tgt, rule)
 
-        if rule.type == "float" and rule.tolerance is not None:
+        if canonical_type(rule.type) == "float" and rule.tolerance is not None:
             return abs(float(normalized_src) - float(normalized_tgt)) <= rule.tolerance
         return normalized_src == normalized_tgt
 
+    def row_fingerprints(self, df: pd.DataFrame, rules: AttributeRuleSet | None = None) -> pd.Series:
+        """Hash each row's rule-normalized attributes into a single ``uint64``.
+
+        Rows that are equal after normalization hash identically, so matching
+        fingerprints can skip the attribute-by-attribute comparison. Differing
+        fingerprints only mean the row needs a full comparison (e.g. floats
+        within tolerance still hash differently).
+        """
+        rules = rules or self.rule_set
+        plan = self._plan_for(rules)
+        normalized = pd.DataFrame(
+            {
+                attr: plan.kernel_for(attr).normalize_column(self._column_or_none(df, attr))
+                for attr in rules.attribute_names
+            },
+            index=df.index,
+        )
+        return pd.util.hash_pandas_object(normalized, index=False)
+
     def build_exceptions_df(
         self,
         legacy_df: pd.DataFrame,
         strategic_df: pd.DataFrame,
         rules: AttributeRuleSet,
         run_id: str,
-        as_of_date: date,
+        as_of_date: date | None,
     ) -> pd.DataFrame:
+        """Exceptions between two snapshots, in merged key order.
+
+        ``as_of_date`` stamps every exception; pass ``None`` when the frames
+        span several dates and each exception should carry its row's date.
+        Keys that occur more than once on a side are reported as
+        ``DUPLICATE_KEY`` and resolved per ``duplicate_keys`` before the merge,
+        which would otherwise multiply their rows.
+        """
+        key_cols = list(rules.key_names)
+        stamp = {"run_id": run_id, "as_of_date": as_of_date}
+        legacy_df, strategic_df, duplicates = self._resolve_duplicates(legacy_df, strategic_df, key_cols, stamp)
+
+        if self.fingerprint_prefilter:
+            legacy_df = legacy_df.assign(_fingerprint=self.row_fingerprints(legacy_df, rules))
+            strategic_df = strategic_df.assign(_fingerprint=self.row_fingerprints(strategic_df, rules))
+
         # full outer join on key columns
         legacy_df = legacy_df.copy()
-        legacy_df.columns = [f"{c}_legacy" if c not in KEY_COLS else c for c in legacy_df.columns]
+        legacy_df.columns = [f"{c}_legacy" if c not in key_cols else c for c in legacy_df.columns]
 
         strategic_df = strategic_df.copy()
-        strategic_df.columns = [f"{c}_strategic" if c not in KEY_COLS else c for c in strategic_df.columns]
+        strategic_df.columns = [f"{c}_strategic" if c not in key_cols else c for c in strategic_df.columns]
 
         merged_df = pd.merge(
             legacy_df,
             strategic_df,
-            on = KEY_COLS,
+            on = key_cols,
             how = "outer",
             indicator = True,
         )
+        merged_df = merged_df.reset_index(drop=True)
+        side = merged_df["_merge"].to_numpy()
 
-        records: List[dict] = []
-
-        for _, row in merged_df.iterrows():
-            key = {k: row[k] for k in KEY_COLS}
-            side = row["_merge"]
-
-            if side == "left_only":
-                records.append(
-                    {
-                        "run_id": run_id,
-                        "as_of_date": as_of_date,
-                        "instrument_id": key["instrument_id"],
-                        "attribute": "__record__",
-                        "source_system": "legacy",
-                        "target_system": "strategic",
-                        "source_value": "present",
-                        "target_value": "missing",
-                        "difference_type": "ONLY_IN_LEGACY",
-                    }
-                )
-                continue
+        # Each slice carries its merged row position and attribute ordinal so the
+        # concatenated batch can be put back into row-major order.
+        slices: List[Tuple[ExceptionBatch, np.ndarray, int]] = [
+            self._record_slice(merged_df, side == "left_only", "ONLY_IN_LEGACY", ("present", "missing"), stamp),
+            self._record_slice(
+                merged_df, side == "right_only", "ONLY_IN_STRATEGIC", ("missing", "present"), stamp
+            ),
+        ]
+
+        plan = self._plan_for(rules)
+        both_df = merged_df[side == "both"]
+        if self.fingerprint_prefilter:
+            changed = (
+                both_df["_fingerprint_legacy"].to_numpy() != both_df["_fingerprint_strategic"].to_numpy()
+            )
+            logger.debug(
+                "Fingerprint pre-filter: %s of %s matched rows need attribute comparison",
+                int(changed.sum()),
+                len(both_df),
+            )
+            both_df = both_df[changed]
+        for ordinal, attr in enumerate(rules.attribute_names, start=1):
+            src = self._column_or_none(both_df, f"{attr}_legacy")
+            tgt = self._column_or_none(both_df, f"{attr}_strategic")
+            mismatched = ~plan.kernel_for(attr).equal_mask(src, tgt)
+            batch = ExceptionBatch.build(
+                instrument_id=both_df["instrument_id"].to_numpy()[mismatched],
+                attribute=attr,
+                source_value=self._exception_values(src[mismatched]),
+                target_value=self._exception_values(tgt[mismatched]),
+                difference_type="VALUE_MISMATCH",
+                **self._stamp(stamp, both_df, mismatched),
+            )
+            slices.append((batch, both_df.index.to_numpy()[mismatched], ordinal))
+
+        slices = [item for item in slices if len(item[0])]
+        if not slices and not len(duplicates):
+            return pd.DataFrame(columns=EXCEPTION_COLS)
 
-            if side == "right_only":
-                records.append(
-                    {
-                        "run_id": run_id,
-                        "as_of_date": as_of_date,
-                        "instrument_id": key["instrument_id"],
-                        "attribute": "__record__",
-                        "source_system": "legacy",
-                        "target_system": "strategic",
-                        "source_value": "missing",
-                        "target_value": "present",
-                        "difference_type": "ONLY_IN_STRATEGIC",
-                    }
-                )
+        exceptions = ExceptionBatch.concat(batch for batch, _, _ in slices)
+        if slices:
+            rows = np.concatenate([row for _, row, _ in slices])
+            ordinals = np.concatenate([np.full(len(row), ordinal) for _, row, ordinal in slices])
+            exceptions = exceptions.take(np.lexsort((ordinals, rows)))
+        if len(duplicates):
+            # Merged rows are in key order, so a stable key sort slots each
+            # duplicate report in front of its key's other exceptions.
+            exceptions = ExceptionBatch.concat([duplicates, exceptions])
+            order_keys = [key for key in key_cols if key in EXCEPTION_COLS]
+            order = (
+                pd.DataFrame({key: exceptions.columns[key] for key in order_keys})
+                .sort_values(order_keys, kind="mergesort")
+                .index.to_numpy()
+            )
+            exceptions = exceptions.take(order)
+        return exceptions.to_pandas()
+
+    @staticmethod
+    def _stamp(stamp: dict, df: pd.DataFrame, mask: np.ndarray) -> dict:
+        """Run-level columns for a slice; rows carry their own date when none is stamped."""
+        if stamp["as_of_date"] is None:
+            return {**stamp, "as_of_date": DataFrameDiffer._row_dates(df, mask)}
+        return stamp
+
+    def _resolve_duplicates(
+        self,
+        legacy_df: pd.DataFrame,
+        strategic_df: pd.DataFrame,
+        key_cols: List[str],
+        stamp: dict,
+    ) -> Tuple[pd.DataFrame, pd.DataFrame, ExceptionBatch]:
+        """Report and resolve repeated keys with one hash pass per side."""
+        reports = []
+        excluded = []
+        resolved = []
+        for df, side in ((legacy_df, "legacy"), (strategic_df, "strategic")):
+            repeated = df.duplicated(subset=key_cols, keep=False).to_numpy()
+            if not repeated.any():
+                resolved.append(df)
                 continue
+            counts = df.loc[repeated, key_cols].value_counts(sort=False, dropna=False).reset_index(name="_count")
+            logger.warning("%s rows share %s duplicated keys in %s", int(repeated.sum()), len(counts), side)
+            reports.append(self._duplicate_slice(counts, side, stamp))
+            excluded.append(counts[key_cols])
+            if self.duplicate_keys == "dedup":
+                df = df[~df.duplicated(subset=key_cols, keep="first").to_numpy()]
+            resolved.append(df)
+
+        if not reports:
+            return legacy_df, strategic_df, ExceptionBatch.empty()
+
+        if self.duplicate_keys == "exclude":
+            dropped = pd.MultiIndex.from_frame(pd.concat(excluded, ignore_index=True))
+            resolved = [df[~pd.MultiIndex.from_frame(df[key_cols]).isin(dropped)] for df in resolved]
+        return resolved[0], resolved[1], ExceptionBatch.concat(reports)
+
+    @staticmethod
+    def _duplicate_slice(counts: pd.DataFrame, side: str, stamp: dict) -> ExceptionBatch:
+        rows = counts["_count"].map(lambda count: f"{count} rows").to_numpy(dtype=object)
+        return ExceptionBatch.build(
+            instrument_id=counts["instrument_id"].to_numpy(),
+            attribute="__record__",
+            source_value=rows if side == "legacy" else None,
+            target_value=None if side == "legacy" else rows,
+            difference_type="DUPLICATE_KEY",
+            **DataFrameDiffer._stamp(stamp, counts, np.ones(len(counts), dtype=bool)),
+        )
+
+    def _plan_for(self, rules: AttributeRuleSet | None) -> CompiledRuleSet:
+        if rules is None or rules is self.rule_set:
+            return self.plan
+        return rules.compile()
 
-            for attr in ATTR_COLS:
-                rule = rules.get_rule(attr)
-                src_value = row.get(f"{attr}_legacy")
-                tgt_value = row.get(f"{attr}_strategic")
-
-                if rule is None:
-                    equal = src_value == tgt_value
-                else:
-                    equal = DataFrameDiffer.value_equal(src_value, tgt_value, rule)
-
-                if not equal:
-                    records.append(
-                        {
-                            "run_id": run_id,
-                            "as_of_date": as_of_date,
-                            "instrument_id": key["instrument_id"],
-                            "attribute": attr,
-                            "source_system": "legacy",
-                            "target_system": "strategic",
-                            "source_value": src_value,
-                            "target_value": tgt_value,
-                            "difference_type": "VALUE_MISMATCH",
-                        }
-                    )
-        return pd.DataFrame.from_records(records)
+    @staticmethod
+    def _record_slice(
+        merged_df: pd.DataFrame,
+        mask: np.ndarray,
+        difference_type: str,
+        values: tuple[str, str],
+        stamp: dict,
+    ) -> Tuple[ExceptionBatch, np.ndarray, int]:
+        batch = ExceptionBatch.build(
+            instrument_id=merged_df["instrument_id"].to_numpy()[mask],
+            attribute="__record__",
+            source_value=values[0],
+            target_value=values[1],
+            difference_type=difference_type,
+            **DataFrameDiffer._stamp(stamp, merged_df, mask),
+        )
+        return batch, merged_df.index.to_numpy()[mask], 0
+
+    @staticmethod
+    def _row_dates(df: pd.DataFrame, mask: np.ndarray) -> np.ndarray:
+        if "as_of_date" not in df.columns:
+            return np.full(int(mask.sum()), None, dtype=object)
+        return DataFrameDiffer._exception_values(df["as_of_date"][mask])
+
+    @staticmethod
+    def _exception_values(values: pd.Series) -> np.ndarray:
+        """Raw values for the exceptions frame; datetime columns are reported as dates."""
+        if pd.api.types.is_datetime64_any_dtype(values.dtype):
+            values = values.dt.date
+        return values.astype(object).to_numpy()
+
+    @staticmethod
+    def _column_or_none(df: pd.DataFrame, column: str) -> pd.Series:
+        if column in df.columns:
+            return df[column]
+        return pd.Series([None] * len(df), index=df.index, dtype=object)
@@ -1,16 +1,21 @@
 """Core reconciliation pipeline orchestration."""
 from __future__ import annotations
 
-from dataclasses import dataclass
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import date
 from pathlib import Path
-from typing import Optional
+from functools import partial
+from typing import Any, Callable, Dict, Iterator, List, Optional
 from uuid import uuid4
 
+import numpy as np
 import pandas as pd
 
 from security_recon.domain.dictionary import AttributeRuleSet
 from security_recon.domain.dictionary_loader import load_rules_from_resource
+from security_recon.domain.exception_batch import ExceptionBatch, concat_exception_frames
 from security_recon.domain.metrics import MetricsPayload
 from security_recon.integration.parquet_writer import ParquetWriter
 from security_recon.repositories.metrics_repository import MetricsRepository
@@ -18,12 +23,47 @@ from security_recon.repositories.security_repository import (
     LegacySecurityRepository,
     StrategicSecurityRepository,
 )
-from security_recon.service.recon import DataFrameDiffer
-from security_recon.support import get_logger
+from security_recon.repositories.snapshot_cache import CachedSecurityRepository, SnapshotCache
+from security_recon.service.incremental import (
+    INSTRUMENT_KEY,
+    RunState,
+    RunStateStore,
+    changed_instruments,
+    instrument_fingerprints,
+    patch_exceptions,
+    rules_digest,
+)
+from security_recon.service.parallel import PartitionedDiffer
+from security_recon.service.recon import EXCEPTION_COLS, DataFrameDiffer
+from security_recon.service.streaming import StreamingReconciler
+from security_recon.support import get_logger, load_config
 
 logger = get_logger(__name__)
 
 
+def _load_recon_config() -> Dict[str, Any]:
+    return load_config().get("recon", {}) or {}
+
+
+def differing_buckets(
+    legacy: Dict[int, tuple[int, int]],
+    strategic: Dict[int, tuple[int, int]],
+) -> List[int]:
+    """Buckets whose ``(row_count, checksum)`` differ, including buckets present on one side only."""
+    return sorted(
+        bucket for bucket in legacy.keys() | strategic.keys() if legacy.get(bucket) != strategic.get(bucket)
+    )
+
+
+class SourceLoadError(RuntimeError):
+    """Raised when one side's snapshot extraction fails."""
+
+    def __init__(self, side: str, as_of_date: date) -> None:
+        super().__init__(f"Failed to load {side} snapshot for {as_of_date}")
+        self.side = side
+        self.as_of_date = as_of_date
+
+
 @dataclass
 class ReconResult:
     run_id: str
@@ -32,6 +72,7 @@ class ReconResult:
     exceptions_file: str
     exception_count: int
     metrics: Optional[MetricsPayload] = None
+    load_timings: Dict[str, float] = field(default_factory=dict)
 
 
 class ReconPipeline:
@@ -46,18 +87,66 @@ class ReconPipeline:
         metrics_repo: MetricsRepository | None = None,
         parquet_writer: ParquetWriter | None = None,
         rule_set: AttributeRuleSet | None = None,
+        fingerprint_prefilter: bool | None = None,
+        workers: int | None = None,
+        streaming: bool | None = None,
+        batch_size: int | None = None,
+        checksum_buckets: int | None = None,
+        incremental: bool | None = None,
+        state_store: RunStateStore | None = None,
     ) -> None:
-        self.legacy_repo = legacy_repo or LegacySecurityRepository()
-        self.strategic_repo = strategic_repo or StrategicSecurityRepository()
-        self.metrics_repo = metrics_repo or MetricsRepository()
+        cfg = _load_recon_config()
+        snapshot_cache = None if legacy_repo and strategic_repo else SnapshotCache.from_config()
         self.rule_set = rule_set or load_rules_from_resource("data_dictionary.yml")
-        self._differ = DataFrameDiffer(self.rule_set)
+        self.legacy_repo = legacy_repo or self._default_repository(
+            LegacySecurityRepository(rule_set=self.rule_set), "legacy", snapshot_cache
+        )
+        self.strategic_repo = strategic_repo or self._default_repository(
+            StrategicSecurityRepository(rule_set=self.rule_set), "strategic", snapshot_cache
+        )
+        self.metrics_repo = metrics_repo or MetricsRepository()
+        if fingerprint_prefilter is None:
+            fingerprint_prefilter = bool(cfg.get("fingerprint_prefilter", False))
+        differ = DataFrameDiffer(
+            self.rule_set,
+            fingerprint_prefilter=fingerprint_prefilter,
+            duplicate_keys=cfg.get("duplicate_keys", "exclude"),
+        )
+
+        workers = int(workers or cfg.get("workers", 1) or 1)
+        self._differ: DataFrameDiffer | PartitionedDiffer = differ
+        if workers > 1:
+            self._differ = PartitionedDiffer(
+                differ,
+                workers=workers,
+                partitions=cfg.get("partitions"),
+                min_rows=int(cfg.get("parallel_min_rows", 0) or 0),
+            )
+
+        self.streaming = bool(cfg.get("streaming", False)) if streaming is None else streaming
+        # Falls back to each repository's extract.chunk_size when unset.
+        self.batch_size: int | None = batch_size or cfg.get("batch_size")
+        self._streaming_reconciler = StreamingReconciler(differ)
+        if checksum_buckets is None:
+            checksum_buckets = int(cfg.get("checksum_buckets", 0) or 0)
+        self.checksum_buckets = checksum_buckets
+        self.incremental = bool(cfg.get("incremental", False)) if incremental is None else incremental
+        self.state_store = state_store or RunStateStore(cfg.get("state_dir", "./resources/recon_state"))
+        self._pending_state: RunState | None = None
+        self.load_timings: Dict[str, float] = {}
 
         if parquet_writer is not None:
             self.parquet_writer = parquet_writer
         else:
             self.parquet_writer = ParquetWriter(base_output_dir)
 
+    @staticmethod
+    def _default_repository(repository: Any, system: str, cache: SnapshotCache | None) -> Any:
+        """Put the snapshot cache in front of repositories the pipeline builds itself."""
+        if cache is None:
+            return repository
+        return CachedSecurityRepository(repository, cache, system)
+
     @property
     def base_output_dir(self) -> Path:
         return self.parquet_writer.base_dir
@@ -66,24 +155,112 @@ class ReconPipeline:
     def base_output_dir(self, value: str | Path) -> None:
         self.parquet_writer = ParquetWriter(value)
 
-    def run(self, as_of_date: date, *, persist_metrics: bool = True) -> ReconResult:
-        run_id = str(uuid4())
+    def run(
+        self,
+        as_of_date: date,
+        *,
+        persist_metrics: bool = True,
+        run_id: str | None = None,
+    ) -> ReconResult:
+        run_id = run_id or str(uuid4())
         logger.info("Starting reconciliation for %s (run_id=%s)", as_of_date, run_id)
 
-        exceptions_df = self._build_exceptions(as_of_date, run_id)
-        exception_count = len(exceptions_df)
+        if self.streaming and not self.incremental:
+            # Batches go straight to a row-group writer; the full set is never in memory.
+            with self.parquet_writer.open_exceptions(as_of_date, run_id) as writer:
+                for exceptions_df in self._stream_exceptions(as_of_date, run_id):
+                    writer.write(exceptions_df)
+            logger.info("Exceptions streamed to %s", writer.path)
+            if self.parquet_writer.dataset_enabled:
+                self.parquet_writer.write_exceptions_dataset(writer.path, run_id)
+            result = self._record_run(writer.path, writer.rows_written, as_of_date, run_id, persist_metrics)
+        else:
+            exceptions_df = self._build_exceptions(as_of_date, run_id)
+            result = self._persist_run(exceptions_df, as_of_date, run_id, persist_metrics)
+
+        if self._pending_state is not None:
+            self.state_store.save(as_of_date, rules_digest(self.rule_set), self._pending_state)
+            self._pending_state = None
+
+        return result
+
+    def run_range(
+        self,
+        start_date: date,
+        end_date: date,
+        *,
+        persist_metrics: bool = True,
+    ) -> List[ReconResult]:
+        """Reconcile every as-of date in ``[start_date, end_date]`` from one extraction per side.
+
+        Both sides are loaded with a single ``BETWEEN`` query and diffed in one
+        pass with ``as_of_date`` as part of the key. Results fan out to one run
+        (exceptions file and metrics row) per date present in either source.
+        """
+        logger.info("Starting range reconciliation for %s..%s", start_date, end_date)
+        legacy_df, strategic_df = self._load_source_frames(
+            start_date,
+            {
+                "legacy": partial(self.legacy_repo.load_by_date_range, end_date=end_date),
+                "strategic": partial(self.strategic_repo.load_by_date_range, end_date=end_date),
+            },
+        )
+        exceptions_df = self._differ.build_exceptions_df(
+            legacy_df,
+            strategic_df,
+            self.rule_set,
+            "",
+            None,
+        )
+        exceptions = ExceptionBatch.from_frame(exceptions_df)
+        exception_dates = self._as_dates(exceptions_df["as_of_date"])
+
+        run_dates = sorted(
+            set(self._as_dates(legacy_df["as_of_date"])) | set(self._as_dates(strategic_df["as_of_date"]))
+        )
+        results = []
+        for as_of_date in run_dates:
+            run_id = str(uuid4())
+            date_df = (
+                exceptions.take(np.flatnonzero(exception_dates == as_of_date)).with_columns(run_id=run_id).to_pandas()
+            )
+            results.append(self._persist_run(date_df, as_of_date, run_id, persist_metrics))
+        return results
+
+    @staticmethod
+    def _as_dates(values: pd.Series) -> np.ndarray:
+        return pd.to_datetime(values).dt.date.to_numpy()
 
+    def _persist_run(
+        self,
+        exceptions_df: pd.DataFrame,
+        as_of_date: date,
+        run_id: str,
+        persist_metrics: bool,
+    ) -> ReconResult:
         exceptions_path = self.parquet_writer.write_exceptions(
             exceptions_df,
             run_date=as_of_date,
             run_id=run_id,
         )
         logger.info("Exceptions written to %s", exceptions_path)
+        if self.parquet_writer.dataset_enabled:
+            dataset_dir = self.parquet_writer.write_exceptions_dataset(exceptions_df, run_id)
+            logger.info("Exceptions added to dataset %s", dataset_dir)
+        return self._record_run(exceptions_path, len(exceptions_df), as_of_date, run_id, persist_metrics)
 
+    def _record_run(
+        self,
+        exceptions_path: Path,
+        exception_count: int,
+        as_of_date: date,
+        run_id: str,
+        persist_metrics: bool,
+    ) -> ReconResult:
         metrics_payload: MetricsPayload | None = None
         if persist_metrics:
-            metrics_payload = self.metrics_repo.compute_metrics(
-                exceptions_df,
+            metrics_payload = self.metrics_repo.compute_metrics_for_count(
+                exception_count,
                 run_id=run_id,
                 as_of_date=as_of_date,
             )
@@ -97,10 +274,23 @@ class ReconPipeline:
             exceptions_file=exceptions_path.name,
             exception_count=exception_count,
             metrics=metrics_payload,
+            load_timings=dict(self.load_timings),
         )
 
     def _build_exceptions(self, as_of_date: date, run_id: str) -> pd.DataFrame:
-        legacy_df, strategic_df = self._load_source_frames(as_of_date)
+        if self.incremental:
+            return self._build_incremental(as_of_date, run_id)
+
+        if self.streaming:
+            return concat_exception_frames(self._stream_exceptions(as_of_date, run_id))
+
+        if self.checksum_buckets:
+            frames = self._load_differing_buckets(as_of_date)
+            if frames is None:
+                return pd.DataFrame(columns=EXCEPTION_COLS)
+            legacy_df, strategic_df = frames
+        else:
+            legacy_df, strategic_df = self._load_source_frames(as_of_date)
         exceptions_df = self._differ.build_exceptions_df(
             legacy_df,
             strategic_df,
@@ -108,21 +298,147 @@ class ReconPipeline:
             run_id,
             as_of_date,
         )
+        return self._finalize_exceptions(exceptions_df, run_id)
+
+    def _build_incremental(self, as_of_date: date, run_id: str) -> pd.DataFrame:
+        """Re-diff only instruments whose rows changed since the last run for ``as_of_date``.
+
+        Exceptions of unchanged instruments are carried over from that run; the
+        new fingerprints and exceptions are saved once this run succeeds.
+        """
+        legacy_df, strategic_df = self._load_source_frames(as_of_date)
+        legacy_fp = instrument_fingerprints(legacy_df, self.rule_set)
+        strategic_fp = instrument_fingerprints(strategic_df, self.rule_set)
+        previous = self.state_store.load(as_of_date, rules_digest(self.rule_set))
+
+        if previous is None:
+            exceptions_df = self._differ.build_exceptions_df(
+                legacy_df, strategic_df, self.rule_set, run_id, as_of_date
+            )
+            exceptions_df = self._finalize_exceptions(exceptions_df, run_id)
+        else:
+            changed = changed_instruments(previous.legacy, legacy_fp).union(
+                changed_instruments(previous.strategic, strategic_fp)
+            )
+            logger.info(
+                "Incremental recon for %s: %s changed instruments since run %s",
+                as_of_date,
+                len(changed),
+                previous.run_id,
+            )
+            delta = self._differ.build_exceptions_df(
+                legacy_df[legacy_df[INSTRUMENT_KEY].astype(str).isin(changed)],
+                strategic_df[strategic_df[INSTRUMENT_KEY].astype(str).isin(changed)],
+                self.rule_set,
+                run_id,
+                as_of_date,
+            )
+            exceptions_df = patch_exceptions(
+                previous.exceptions,
+                self._finalize_exceptions(delta, run_id),
+                changed,
+                self.rule_set,
+                run_id,
+            )
+
+        self._pending_state = RunState(run_id, legacy_fp, strategic_fp, exceptions_df)
+        return exceptions_df
+
+    def _stream_exceptions(self, as_of_date: date, run_id: str) -> Iterator[pd.DataFrame]:
+        """Merge-join key-ordered batches from both repositories, yielding exception batches."""
+        for exceptions_df in self._streaming_reconciler.iter_exceptions(
+            self.legacy_repo.iter_by_date(as_of_date, self.batch_size),
+            self.strategic_repo.iter_by_date(as_of_date, self.batch_size),
+            self.rule_set,
+            run_id,
+            as_of_date,
+        ):
+            yield self._finalize_exceptions(exceptions_df, run_id)
 
+    @staticmethod
+    def _finalize_exceptions(exceptions_df: pd.DataFrame, run_id: str) -> pd.DataFrame:
+        """Bring an exceptions frame into the ``ExceptionBatch`` layout (categoricals, string values)."""
         if "run_id" not in exceptions_df.columns:
             exceptions_df = exceptions_df.assign(run_id=run_id)
+        return ExceptionBatch.from_frame(exceptions_df).to_pandas()
 
-        for value_col in ("source_value", "target_value"):
-            if value_col in exceptions_df.columns:
-                exceptions_df[value_col] = (
-                    exceptions_df[value_col]
-                    .astype("string")
-                    .where(exceptions_df[value_col].notna(), None)
-                )
+    def _load_differing_buckets(self, as_of_date: date) -> Optional[tuple[pd.DataFrame, pd.DataFrame]]:
+        """Compare per-bucket checksums in the databases and extract only buckets that differ.
 
-        return exceptions_df
+        Returns ``None`` when every bucket matches, i.e. there is nothing to diff.
+        """
+        bucket_count = self.checksum_buckets
+        legacy_sums, strategic_sums = self._load_source_frames(
+            as_of_date,
+            {
+                "legacy": partial(self.legacy_repo.bucket_checksums, bucket_count=bucket_count),
+                "strategic": partial(self.strategic_repo.bucket_checksums, bucket_count=bucket_count),
+            },
+        )
+        buckets = differing_buckets(legacy_sums, strategic_sums)
+        logger.info(
+            "Checksum pushdown for %s: %s of %s buckets differ",
+            as_of_date,
+            len(buckets),
+            bucket_count,
+        )
+        if not buckets:
+            return None
+        if len(buckets) == bucket_count:
+            return self._load_source_frames(as_of_date)
+        return self._load_source_frames(
+            as_of_date,
+            {
+                "legacy": partial(self.legacy_repo.load_by_buckets, buckets=buckets, bucket_count=bucket_count),
+                "strategic": partial(
+                    self.strategic_repo.load_by_buckets, buckets=buckets, bucket_count=bucket_count
+                ),
+            },
+        )
+
+    def _load_source_frames(
+        self,
+        as_of_date: date,
+        loaders: Dict[str, Callable[[date], Any]] | None = None,
+    ) -> tuple[Any, Any]:
+        """Extract both snapshots concurrently; wall-clock is the slower side, not the sum."""
+        if loaders is None:
+            loaders = {
+                "legacy": self.legacy_repo.load_by_date,
+                "strategic": self.strategic_repo.load_by_date,
+            }
+        self.load_timings = {}
+        frames: Dict[str, Any] = {}
+        failures: list[tuple[str, BaseException]] = []
 
-    def _load_source_frames(self, as_of_date: date) -> tuple[pd.DataFrame, pd.DataFrame]:
-        legacy_df = self.legacy_repo.load_by_date(as_of_date)
-        strategic_df = self.strategic_repo.load_by_date(as_of_date)
-        return legacy_df, strategic_df
\ No newline at end of file
+        with ThreadPoolExecutor(max_workers=len(loaders), thread_name_prefix="recon-extract") as pool:
+            futures = {
+                side: pool.submit(self._timed_load, side, loader, as_of_date)
+                for side, loader in loaders.items()
+            }
+            for side, future in futures.items():
+                try:
+                    frames[side] = future.result()
+                except Exception as exc:  # noqa: BLE001 - re-raised below with the side attached
+                    logger.error("Loading %s snapshot for %s failed: %s", side, as_of_date, exc)
+                    failures.append((side, exc))
+
+        if failures:
+            side, exc = failures[0]
+            raise SourceLoadError(side, as_of_date) from exc
+
+        return frames["legacy"], frames["strategic"]
+
+    def _timed_load(
+        self,
+        side: str,
+        loader: Callable[[date], Any],
+        as_of_date: date,
+    ) -> Any:
+        started = time.perf_counter()
+        try:
+            return loader(as_of_date)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.load_timings[side] = elapsed
+            logger.info("Loaded %s snapshot for %s in %.3fs", side, as_of_date, elapsed)
\ No newline at end of file
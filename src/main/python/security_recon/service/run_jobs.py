@@ -0,0 +1,180 @@
+"""Background execution of reconciliation runs: priority queue, bounded workers, single-flight per date."""
+from __future__ import annotations
+
+import itertools
+import queue
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional
+from uuid import uuid4
+
+from security_recon.support import get_logger
+from security_recon.support.config import load_config
+
+logger = get_logger(__name__)
+
+QUEUED = "QUEUED"
+RUNNING = "RUNNING"
+COMPLETED = "COMPLETED"
+FAILED = "FAILED"
+
+# Lower runs first: an interactive request overtakes queued backfills.
+PRIORITIES: Dict[str, int] = {"interactive": 0, "backfill": 10}
+
+# runner(as_of_date, run_id, progress) -> ReconResult; ``progress`` reports the current stage.
+RunRunner = Callable[[date, str, Callable[[str], None]], Any]
+
+
+def _load_jobs_config() -> Dict[str, Any]:
+    return load_config().get("run_jobs", {}) or {}
+
+
+@dataclass
+class RunJob:
+    run_id: str
+    as_of_date: date
+    priority: str
+    status: str = QUEUED
+    stage: str = "queued"
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    exception_count: Optional[int] = None
+    error: Optional[str] = None
+    coalesced_requests: int = 0
+
+    @property
+    def active(self) -> bool:
+        return self.status in (QUEUED, RUNNING)
+
+    def timings(self, now: float | None = None) -> Dict[str, Optional[float]]:
+        now = time.time() if now is None else now
+        return {
+            "queued_seconds": (self.started_at or now) - self.submitted_at,
+            "run_seconds": None if self.started_at is None else (self.finished_at or now) - self.started_at,
+        }
+
+
+class RunJobManager:
+    """Runs recons on ``workers`` dedicated threads instead of the request thread pool.
+
+    ``submit`` returns at once. A request for a date that already has a queued
+    or running job joins that job (single-flight) and, if more urgent, raises
+    its priority. Finished jobs are kept for status queries up to
+    ``max_finished_jobs``.
+    """
+
+    def __init__(
+        self,
+        runner: RunRunner,
+        *,
+        workers: int | None = None,
+        max_finished_jobs: int | None = None,
+    ) -> None:
+        cfg = _load_jobs_config()
+        self.runner = runner
+        self.workers = max(1, int(workers or cfg.get("workers", 2)))
+        self.max_finished_jobs = int(max_finished_jobs or cfg.get("max_finished_jobs", 1000))
+        self._queue: "queue.PriorityQueue[tuple[int, int, Optional[str]]]" = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, RunJob] = {}
+        self._finished: "OrderedDict[str, None]" = OrderedDict()
+        self._inflight: Dict[date, str] = {}
+        # Submission order; a priority bump keeps it so the job stays ahead of later submissions.
+        self._order: Dict[str, int] = {}
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> None:
+        if self._threads:
+            return
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"recon-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Let running recons finish; queued jobs are dropped."""
+        for _ in self._threads:
+            self._queue.put((-1, next(self._sequence), None))
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def submit(self, as_of_date: date, priority: str = "interactive") -> tuple[RunJob, bool]:
+        """Queue a run for ``as_of_date``; returns the job and whether it joined an existing one."""
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown run priority: {priority!r}")
+        with self._lock:
+            existing = self._jobs.get(self._inflight.get(as_of_date, ""))
+            if existing is not None and existing.active:
+                existing.coalesced_requests += 1
+                if existing.status == QUEUED and PRIORITIES[priority] < PRIORITIES[existing.priority]:
+                    existing.priority = priority
+                    self._queue.put((PRIORITIES[priority], self._order[existing.run_id], existing.run_id))
+                return existing, True
+            job = RunJob(run_id=str(uuid4()), as_of_date=as_of_date, priority=priority)
+            self._jobs[job.run_id] = job
+            self._inflight[as_of_date] = job.run_id
+            self._order[job.run_id] = next(self._sequence)
+            self._queue.put((PRIORITIES[priority], self._order[job.run_id], job.run_id))
+        logger.info("Queued %s run %s for %s", priority, job.run_id, as_of_date)
+        return job, False
+
+    def get(self, run_id: str) -> Optional[RunJob]:
+        with self._lock:
+            return self._jobs.get(run_id)
+
+    def queue_position(self, run_id: str) -> Optional[int]:
+        """1-based place among queued jobs in execution order, ``None`` once the job has started."""
+        with self._lock:
+            job = self._jobs.get(run_id)
+            if job is None or job.status != QUEUED:
+                return None
+            waiting = sorted(
+                (PRIORITIES[other.priority], self._order[other.run_id], other.run_id)
+                for other in self._jobs.values()
+                if other.status == QUEUED
+            )
+            return 1 + [entry[2] for entry in waiting].index(run_id)
+
+    def _work(self) -> None:
+        while True:
+            rank, _, run_id = self._queue.get()
+            if run_id is None:
+                return
+            with self._lock:
+                job = self._jobs.get(run_id)
+                # Skip entries superseded by a priority bump or already picked up.
+                if job is None or job.status != QUEUED or PRIORITIES[job.priority] != rank:
+                    continue
+                job.status, job.stage, job.started_at = RUNNING, "running", time.time()
+            self._execute(job)
+
+    def _execute(self, job: RunJob) -> None:
+        def progress(stage: str) -> None:
+            job.stage = stage
+
+        try:
+            result = self.runner(job.as_of_date, job.run_id, progress)
+        except Exception as exc:  # noqa: BLE001 - reported through the job status
+            logger.exception("Run %s for %s failed", job.run_id, job.as_of_date)
+            self._finish(job, FAILED, error=f"{type(exc).__name__}: {exc}")
+        else:
+            self._finish(job, COMPLETED, exception_count=getattr(result, "exception_count", None))
+
+    def _finish(self, job: RunJob, status: str, **outcome: Any) -> None:
+        with self._lock:
+            job.status, job.stage, job.finished_at = status, status.lower(), time.time()
+            for name, value in outcome.items():
+                setattr(job, name, value)
+            if self._inflight.get(job.as_of_date) == job.run_id:
+                del self._inflight[job.as_of_date]
+            self._finished[job.run_id] = None
+            while len(self._finished) > self.max_finished_jobs:
+                evicted, _ = self._finished.popitem(last=False)
+                self._jobs.pop(evicted, None)
+                self._order.pop(evicted, None)
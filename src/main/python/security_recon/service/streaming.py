@@ -0,0 +1,106 @@
+"""Streaming sorted merge-join reconciliation over key-ordered batches."""
+from __future__ import annotations
+
+from datetime import date
+from typing import Iterable, Iterator, Optional, Tuple
+
+import pandas as pd
+
+from security_recon.domain.dictionary import AttributeRuleSet
+from security_recon.service.recon import DataFrameDiffer
+
+MERGE_KEY = "instrument_id"
+
+
+def _concat(buffer: Optional[pd.DataFrame], batch: pd.DataFrame) -> pd.DataFrame:
+    if buffer is None or buffer.empty:
+        return batch
+    return pd.concat([buffer, batch], ignore_index=True)
+
+
+def merge_join_batches(
+    legacy_batches: Iterable[pd.DataFrame],
+    strategic_batches: Iterable[pd.DataFrame],
+    key: str = MERGE_KEY,
+) -> Iterator[Tuple[pd.DataFrame, pd.DataFrame]]:
+    """Align two ``key``-ordered batch streams into chunk pairs covering the same keys.
+
+    Each yielded pair holds every row of both sides for the keys it covers, so
+    the pairs can be diffed independently. Only rows below the smallest
+    "last seen" key of the still-open streams are emitted; anything at or above
+    it stays buffered until the lagging stream catches up.
+    """
+    streams = [iter(legacy_batches), iter(strategic_batches)]
+    buffers: list[Optional[pd.DataFrame]] = [None, None]
+    done = [False, False]
+
+    def pull(side: int) -> None:
+        for batch in streams[side]:
+            if not batch.empty:
+                buffers[side] = _concat(buffers[side], batch.reset_index(drop=True))
+                return
+        done[side] = True
+
+    def pair(legacy: Optional[pd.DataFrame], strategic: Optional[pd.DataFrame]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        if legacy is None:
+            legacy = strategic.iloc[0:0]
+        if strategic is None:
+            strategic = legacy.iloc[0:0]
+        return legacy, strategic
+
+    while True:
+        for side in (0, 1):
+            if not done[side] and (buffers[side] is None or buffers[side].empty):
+                pull(side)
+
+        if all(done):
+            legacy, strategic = buffers
+            if (legacy is not None and not legacy.empty) or (strategic is not None and not strategic.empty):
+                yield pair(legacy, strategic)
+            return
+
+        bound = min(buffers[side][key].iloc[-1] for side in (0, 1) if not done[side])
+        emitted: list[Optional[pd.DataFrame]] = [None, None]
+        for side in (0, 1):
+            buffer = buffers[side]
+            if buffer is None or buffer.empty:
+                continue
+            below = (buffer[key] < bound).to_numpy()
+            emitted[side] = buffer[below]
+            buffers[side] = buffer[~below].reset_index(drop=True)
+
+        if all(frame is None or frame.empty for frame in emitted):
+            # Every buffered row sits on the boundary key; read further on the
+            # open streams that stopped there.
+            for side in (0, 1):
+                if not done[side] and buffers[side][key].iloc[-1] == bound:
+                    pull(side)
+            continue
+
+        yield pair(*emitted)
+
+
+class StreamingReconciler:
+    """Runs the differ over merge-joined chunks, yielding exception batches as it goes."""
+
+    def __init__(self, differ: DataFrameDiffer) -> None:
+        self.differ = differ
+
+    def iter_exceptions(
+        self,
+        legacy_batches: Iterable[pd.DataFrame],
+        strategic_batches: Iterable[pd.DataFrame],
+        rules: AttributeRuleSet,
+        run_id: str,
+        as_of_date: date,
+    ) -> Iterator[pd.DataFrame]:
+        for legacy_chunk, strategic_chunk in merge_join_batches(legacy_batches, strategic_batches):
+            exceptions_df = self.differ.build_exceptions_df(
+                legacy_chunk,
+                strategic_chunk,
+                rules,
+                run_id,
+                as_of_date,
+            )
+            if not exceptions_df.empty:
+                yield exceptions_df
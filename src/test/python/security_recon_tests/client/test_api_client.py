@@ -22,7 +22,7 @@ def test_trigger_run(set_as_of_date: date, api_client: APIClient) -> None:
     response = api_client.trigger_run(as_of_date = set_as_of_date)
     assert "run_id" in response
     assert response["as_of_date"] == set_as_of_date.isoformat()
-    assert response["status"] == "COMPLETED"
+    assert response["status"] in {"QUEUED", "RUNNING"}
 
 def test_list_run_ids(set_as_of_date: date, api_client: APIClient) -> None:
     logger.info (api_client.list_run_ids(as_of_date = set_as_of_date))
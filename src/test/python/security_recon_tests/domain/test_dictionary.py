@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import pickle
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from security_recon.domain.dictionary import AttributeRule, AttributeRuleSet
+from security_recon.domain.dictionary_loader import load_rules_from_resource
+
+
+def test_compile_is_cached_per_rule_set() -> None:
+    rule_set = load_rules_from_resource()
+    assert rule_set.compile() is rule_set.compile()
+    assert load_rules_from_resource() is rule_set
+
+
+def test_compiled_kernels_resolve_dictionary_types() -> None:
+    plan = load_rules_from_resource().compile()
+    assert plan.kernel_for("coupon").kind == "float"
+    assert plan.kernel_for("cfi_code").kind == "string"
+    assert plan.kernel_for("maturity_date").kind == "date"
+    assert plan.kernel_for("callable_flag").kind == "bool"
+    assert plan.kernel_for("unknown").kind == "raw"
+
+
+def test_bool_and_date_kernels() -> None:
+    plan = AttributeRuleSet(
+        {
+            "flag": AttributeRule(name="flag", type="bool"),
+            "matures": AttributeRule(name="matures", type="date"),
+        }
+    ).compile()
+
+    flags = plan.kernel_for("flag").equal_mask(
+        pd.Series([1, 0, 1, None], dtype=object),
+        pd.Series([True, False, "N", None], dtype=object),
+    )
+    assert flags.tolist() == [True, True, False, True]
+
+    dates = plan.kernel_for("matures").equal_mask(
+        pd.Series([date(2033, 12, 29), date(2025, 6, 15)]),
+        pd.Series(["2033-12-29", "2025-06-16"]),
+    )
+    assert dates.tolist() == [True, False]
+
+
+def test_date_kernel_handles_far_future_and_unparseable_values() -> None:
+    rule_set = AttributeRuleSet({"matures": AttributeRule(name="matures", type="date")})
+    kernel = rule_set.compile().kernel_for("matures")
+
+    far_future = kernel.equal_mask(
+        pd.Series([date(9999, 12, 31), date(9999, 12, 31)]),
+        pd.Series(["9999-12-31", "9999-12-30"]),
+    )
+    raw = kernel.equal_mask(
+        pd.Series(["perpetual", "perpetual", "2033-12-29"], dtype=object),
+        pd.Series(["perpetual", "undated", date(2033, 12, 29)], dtype=object),
+    )
+
+    assert far_future.tolist() == [True, False]
+    assert raw.tolist() == [True, False, True]
+
+
+def test_unknown_rule_type_is_rejected() -> None:
+    rule_set = AttributeRuleSet({"field": AttributeRule(name="field", type="blob")})
+    with pytest.raises(ValueError):
+        rule_set.compile()
+
+
+def test_compiled_plan_is_picklable() -> None:
+    plan = load_rules_from_resource().compile()
+    restored = pickle.loads(pickle.dumps(plan))
+    assert restored.names == plan.names
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from pathlib import Path
 
+import pytest
+
 from security_recon.domain.dictionary import AttributeRuleSet
 from security_recon.domain.dictionary_loader import load_rules_from_resource, load_rules_from_yaml
 
@@ -34,3 +36,24 @@ def test_load_rules_from_yaml_round_trip(tmp_path: Path) -> None:
     assert field_a_rule.ignore_case is True
     assert field_b_rule is not None
     assert field_b_rule.tolerance == 1.5
+
+
+def test_rule_set_drives_projected_columns() -> None:
+    rule_set = load_rules_from_resource()
+    assert rule_set.key_names == ("instrument_id", "as_of_date")
+    assert rule_set.attribute_names == ("coupon", "cfi_code", "maturity_date", "callable_flag")
+    assert rule_set.columns == rule_set.key_names + rule_set.attribute_names
+
+
+def test_invalid_column_names_are_rejected(tmp_path: Path) -> None:
+    yaml_path = tmp_path / "rules.yml"
+    yaml_path.write_text(
+        """
+        attributes:
+          "coupon; DROP TABLE x":
+            type: float
+        """,
+        encoding="utf-8",
+    )
+    with pytest.raises(ValueError):
+        load_rules_from_yaml(yaml_path)
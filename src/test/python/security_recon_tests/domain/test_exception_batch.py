@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from security_recon.domain.exception_batch import (
+    EXCEPTION_COLS,
+    EXCEPTION_SCHEMA,
+    ExceptionBatch,
+    concat_exception_frames,
+)
+
+
+def _mismatches(size: int, attribute: str = "coupon") -> ExceptionBatch:
+    return ExceptionBatch.build(
+        instrument_id=[f"US{i:06d}" for i in range(size)],
+        attribute=attribute,
+        source_value=np.arange(size, dtype=float).astype(object),
+        target_value=[None] * size,
+        difference_type="VALUE_MISMATCH",
+        as_of_date=date(2023, 12, 29),
+        run_id="run-1",
+    )
+
+
+def test_build_broadcasts_constants_as_categoricals() -> None:
+    df = _mismatches(3).to_pandas()
+
+    assert list(df.columns) == EXCEPTION_COLS
+    assert all(df[name].dtype == "category" for name in ("run_id", "attribute", "difference_type"))
+    assert df["source_value"].tolist() == ["0.0", "1.0", "2.0"]
+    assert df["target_value"].isna().all()
+    assert df["as_of_date"].tolist() == [date(2023, 12, 29)] * 3
+
+
+def test_concat_unions_categories_and_keeps_order() -> None:
+    combined = ExceptionBatch.concat([_mismatches(2, "coupon"), ExceptionBatch.empty(), _mismatches(1, "cfi_code")])
+
+    df = combined.to_pandas()
+    assert df["attribute"].tolist() == ["coupon", "coupon", "cfi_code"]
+    assert list(df["attribute"].cat.categories) == ["cfi_code", "coupon"]
+    assert combined.take(np.array([2, 0])).to_pandas()["instrument_id"].tolist() == ["US000000", "US000000"]
+
+
+def test_to_arrow_uses_exception_schema() -> None:
+    table = _mismatches(4).to_arrow()
+
+    assert table.schema == EXCEPTION_SCHEMA
+    assert table.column("as_of_date").to_pylist() == [date(2023, 12, 29)] * 4
+
+
+def test_categorical_layout_is_smaller_than_object_frame() -> None:
+    batch = _mismatches(10_000)
+    as_objects = batch.to_pandas().astype(object)
+
+    assert batch.to_pandas().memory_usage(deep=True).sum() < as_objects.memory_usage(deep=True).sum() / 2
+
+
+def test_concat_exception_frames_round_trips_frames() -> None:
+    frames = [_mismatches(2).to_pandas(), pd.DataFrame(columns=EXCEPTION_COLS), _mismatches(1).to_pandas()]
+
+    combined = concat_exception_frames(frames)
+
+    assert len(combined) == 3
+    assert combined["run_id"].dtype == "category"
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from security_recon.domain.dictionary_loader import load_rules_from_resource
+from security_recon.domain.extract_schema import ExtractSchema, memory_report
+from security_recon.service.recon import DataFrameDiffer
+
+
+def _raw_extract(rows: int = 2_000) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "instrument_id": [f"US{i:06d}" for i in range(rows)],
+            "as_of_date": [date(2023, 12, 29)] * rows,
+            "coupon": [float(i % 7) for i in range(rows)],
+            "cfi_code": [("DBFTFB", "ESVUFR", None)[i % 3] for i in range(rows)],
+            "maturity_date": [date(2033, 12, 29)] * rows,
+            "callable_flag": [i % 2 for i in range(rows)],
+        }
+    )
+
+
+def test_schema_types_every_dictionary_column() -> None:
+    schema = ExtractSchema.from_rule_set(load_rules_from_resource())
+
+    df = schema.apply(_raw_extract())
+
+    assert df["instrument_id"].dtype == "string"
+    assert df["as_of_date"].dtype == "datetime64[s]"
+    assert df["coupon"].dtype == "float64"
+    assert df["cfi_code"].dtype == "category"
+    assert df["maturity_date"].dtype == "datetime64[s]"
+    assert df["callable_flag"].dtype == "boolean"
+    assert not any(dtype == object for dtype in df.dtypes)
+    assert df["cfi_code"].isna().sum() == len(df) // 3
+
+
+def test_far_future_dates_survive_typing_and_are_diffed() -> None:
+    schema = ExtractSchema.from_rule_set(load_rules_from_resource())
+    raw = _raw_extract(2)
+    raw["maturity_date"] = [date(9999, 12, 31), None]
+    legacy = schema.apply(raw)
+    strategic = schema.apply(raw.assign(maturity_date=[None, None]))
+
+    assert legacy["maturity_date"].dt.date.tolist()[0] == date(9999, 12, 31)
+    exceptions = DataFrameDiffer(load_rules_from_resource()).build_exceptions_df(
+        legacy, strategic, load_rules_from_resource(), "run-1", date(2023, 12, 29)
+    )
+    assert exceptions[["instrument_id", "attribute"]].values.tolist() == [["US000000", "maturity_date"]]
+
+
+def test_values_that_do_not_fit_the_declared_type_are_rejected() -> None:
+    schema = ExtractSchema.from_rule_set(load_rules_from_resource())
+
+    with pytest.raises(ValueError, match="maturity_date"):
+        schema.apply(_raw_extract(2).assign(maturity_date=["2033-12-29", "not a date"]))
+
+
+def test_typed_extract_is_smaller_than_object_frame() -> None:
+    raw = _raw_extract()
+    typed = ExtractSchema.from_rule_set(load_rules_from_resource()).apply(raw)
+
+    assert memory_report(typed)["__total__"] < memory_report(raw)["__total__"]
+    assert memory_report(typed)["cfi_code"] < memory_report(raw)["cfi_code"] / 4
+
+
+def test_pyarrow_backend_uses_arrow_dtypes() -> None:
+    schema = ExtractSchema.from_rule_set(load_rules_from_resource(), dtype_backend="pyarrow")
+
+    df = schema.apply(_raw_extract(10))
+
+    assert all(isinstance(dtype, pd.ArrowDtype) for dtype in df.dtypes)
+    assert schema.arrow_schema().names == list(schema.columns)
+
+
+def test_unknown_backend_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        ExtractSchema.from_rule_set(load_rules_from_resource(), dtype_backend="polars")
+
+
+@pytest.mark.parametrize("dtype_backend", ["numpy", "pyarrow"])
+def test_typed_frames_diff_like_object_frames(dtype_backend: str) -> None:
+    rules = load_rules_from_resource()
+    schema = ExtractSchema.from_rule_set(rules, dtype_backend=dtype_backend)
+    legacy = _raw_extract(30)
+    strategic = legacy.copy()
+    strategic.loc[3, "coupon"] = 9.5
+    strategic.loc[4, "cfi_code"] = "XXXXXX"
+    strategic.loc[5, "maturity_date"] = date(2030, 1, 1)
+    strategic.loc[6, "callable_flag"] = 1 - strategic.loc[6, "callable_flag"]
+    strategic = strategic.drop(index=7)
+    differ = DataFrameDiffer(rules)
+
+    expected = differ.build_exceptions_df(legacy, strategic, rules, "run-1", date(2023, 12, 29))
+    actual = differ.build_exceptions_df(
+        schema.apply(legacy), schema.apply(strategic), rules, "run-1", date(2023, 12, 29)
+    )
+
+    columns = ["instrument_id", "attribute", "difference_type"]
+    assert actual[columns].astype(str).values.tolist() == expected[columns].astype(str).values.tolist()
+    maturity = actual[actual["attribute"] == "maturity_date"]
+    assert maturity["target_value"].tolist() == ["2030-01-01"]
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import os
+import time
+from datetime import date
+from pathlib import Path
+
+import pyarrow.parquet as pq
+
+from security_recon.domain.exception_batch import ExceptionBatch
+from security_recon.integration.compaction import ExceptionCompactor
+from security_recon.integration.parquet_writer import ParquetWriter
+from security_recon.integration.s3_uploader import S3Uploader
+
+AS_OF = date(2023, 12, 29)
+
+
+class _FakeS3Client:
+    def __init__(self) -> None:
+        self.objects: set[str] = set()
+
+    def upload_fileobj(self, file_handle, bucket: str, key: str, **kwargs) -> None:
+        file_handle.read()
+        self.objects.add(key)
+
+    def delete_object(self, Bucket: str, Key: str) -> None:  # noqa: N803 - boto naming
+        self.objects.discard(Key)
+
+
+class _FakeArtifactRepository:
+    def __init__(self) -> None:
+        self.repointed: list[tuple[date, list[str], str]] = []
+
+    def repoint(self, *, as_of_date: date, run_ids, s3_uri: str) -> int:
+        self.repointed.append((as_of_date, list(run_ids), s3_uri))
+        return len(self.repointed[-1][1])
+
+
+def _upload_run(uploaded_dir: Path, run_id: str, instruments: list[str]) -> Path:
+    batch = ExceptionBatch.build(
+        instrument_id=instruments,
+        attribute="coupon",
+        difference_type="VALUE_MISMATCH",
+        source_value=["1.0"] * len(instruments),
+        target_value=["2.0"] * len(instruments),
+        as_of_date=AS_OF,
+        run_id=run_id,
+    )
+    return ParquetWriter(uploaded_dir).write_exceptions(batch, AS_OF, run_id)
+
+
+def test_compaction_merges_runs_into_one_sorted_file(tmp_path: Path) -> None:
+    uploaded = tmp_path / "uploaded"
+    _upload_run(uploaded, "run-b", ["US0003", "US0001"])
+    _upload_run(uploaded, "run-a", ["US0002", "US0001"])
+    _upload_run(uploaded, "run-c", ["US0009"]).rename(uploaded / "exceptions.run-c.20231230.parquet")
+
+    result = ExceptionCompactor(tmp_path, retention_days=30).compact(AS_OF)
+
+    assert result.path == uploaded / "exceptions.compacted.20231229.parquet"
+    assert result.run_ids == ["run-a", "run-b"]
+    table = pq.read_table(result.path).to_pandas()
+    assert table["instrument_id"].tolist() == ["US0001", "US0001", "US0002", "US0003"]
+    assert table["run_id"].astype(str).tolist() == ["run-a", "run-b", "run-a", "run-b"]
+    assert sorted(path.name for path in uploaded.glob("*.parquet")) == [
+        "exceptions.compacted.20231229.parquet",
+        "exceptions.run-c.20231230.parquet",
+    ]
+    assert len(list((uploaded / "archive" / "20231229").glob("*.parquet"))) == 2
+
+
+def test_recompaction_folds_new_runs_into_previous_file(tmp_path: Path) -> None:
+    uploaded = tmp_path / "uploaded"
+    compactor = ExceptionCompactor(tmp_path, retention_days=30)
+    _upload_run(uploaded, "run-a", ["US0001"])
+    compactor.compact(AS_OF)
+    _upload_run(uploaded, "run-b", ["US0001", "US0002"])
+
+    result = compactor.compact(AS_OF)
+
+    assert result.run_ids == ["run-a", "run-b"]
+    assert result.row_count == 3
+    assert compactor.compact(AS_OF).row_count == 0
+
+
+def test_compaction_uploads_repoints_artifacts_and_applies_retention(tmp_path: Path) -> None:
+    client = _FakeS3Client()
+    uploader = S3Uploader(bucket="security-recon-bucket", prefix="results", source_dir=tmp_path, client=client)
+    client.objects.update({"results/exceptions.run-a.20231229.parquet", "results/exceptions.run-b.20231229.parquet"})
+    repository = _FakeArtifactRepository()
+    uploaded = tmp_path / "uploaded"
+    stale = _upload_run(uploaded, "run-a", ["US0001"])
+    old = time.time() - 10 * 86_400
+    os.utime(stale, (old, old))
+    _upload_run(uploaded, "run-b", ["US0002"])
+
+    result = ExceptionCompactor(
+        tmp_path, uploader=uploader, artifact_repo=repository, retention_days=7  # type: ignore[arg-type]
+    ).compact(AS_OF)
+
+    uri = "s3://security-recon-bucket/results/exceptions.compacted.20231229.parquet"
+    assert result.s3_uri == uri
+    assert repository.repointed == [(AS_OF, ["run-a", "run-b"], uri)]
+    assert result.purged == ["exceptions.run-a.20231229.parquet"]
+    assert client.objects == {
+        "results/exceptions.run-b.20231229.parquet",
+        "results/exceptions.compacted.20231229.parquet",
+    }
+    assert [path.name for path in (uploaded / "archive" / "20231229").iterdir()] == [
+        "exceptions.run-b.20231229.parquet"
+    ]
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import json
+from datetime import date
+from pathlib import Path
+from types import SimpleNamespace
+
+import pyarrow as pa
+import pytest
+
+from security_recon.controller.benchmark import benchmark_queries, generate_exceptions
+from security_recon.domain.exception_batch import ExceptionBatch
+from security_recon.integration.compaction import ExceptionCompactor
+from security_recon.integration.exceptions_query import ExceptionsQuery, InvalidCursorError, RunNotFoundError
+from security_recon.integration.parquet_writer import ParquetWriter
+
+AS_OF = date(2023, 12, 29)
+ATTRIBUTES = ["coupon", "cfi_code", "maturity_date"]
+
+
+def _batch(run_id: str = "run-1", instruments: int = 40) -> ExceptionBatch:
+    # Key-ordered like a real run: every instrument has one exception per attribute.
+    ids = [f"US{i:04d}" for i in range(instruments) for _ in ATTRIBUTES]
+    return ExceptionBatch.build(
+        instrument_id=ids,
+        attribute=ATTRIBUTES * instruments,
+        difference_type=["VALUE_MISMATCH", "MISSING_IN_TARGET", "VALUE_MISMATCH"] * instruments,
+        source_value=[str(i) for i in range(len(ids))],
+        target_value=None,
+        as_of_date=AS_OF,
+        run_id=run_id,
+    )
+
+
+def _writer(tmp_path: Path) -> ParquetWriter:
+    writer = ParquetWriter(tmp_path / "parquet", dataset_dir=tmp_path / "dataset")
+    writer.row_group_size = 16
+    return writer
+
+
+class _ArtifactRepository:
+    def __init__(self, s3_uri: str, status: str = "uploaded") -> None:
+        self.artifact = SimpleNamespace(s3_uri=s3_uri, status=status)
+
+    def fetch_latest(self, run_id: str, *, artifact_type: str) -> SimpleNamespace:
+        return self.artifact
+
+
+def _collect(query: ExceptionsQuery, run_id: str, **options) -> tuple[list[dict], int]:
+    rows, pages, cursor = [], 0, None
+    while True:
+        page = query.page(run_id, cursor=cursor, **options)
+        rows.extend(row for batch in page.batches for row in batch.to_pylist())
+        pages += 1
+        if page.next_cursor is None:
+            return rows, pages
+        cursor = page.next_cursor
+
+
+def test_pages_cover_every_row_once_in_file_order(tmp_path: Path) -> None:
+    writer = _writer(tmp_path)
+    batch = _batch()
+    writer.write_exceptions(batch, AS_OF, "run-1")
+    query = ExceptionsQuery(writer)
+
+    rows, pages = _collect(query, "run-1", limit=7)
+
+    expected = batch.to_pandas()
+    assert [row["source_value"] for row in rows] == expected["source_value"].tolist()
+    assert pages == len(expected) // 7 + 1
+
+
+def test_filters_and_projection_are_pushed_down(tmp_path: Path) -> None:
+    writer = _writer(tmp_path)
+    writer.write_exceptions(_batch(), AS_OF, "run-1")
+    query = ExceptionsQuery(writer)
+
+    rows, _ = _collect(
+        query,
+        "run-1",
+        attributes=["coupon", "maturity_date"],
+        difference_types=["VALUE_MISMATCH"],
+        instrument_prefix="US001",
+        columns=["attribute", "instrument_id"],
+        limit=4,
+    )
+
+    assert len(rows) == 20
+    assert all(set(row) == {"instrument_id", "attribute"} for row in rows)
+    assert {row["instrument_id"][:5] for row in rows} == {"US001"}
+    assert {row["attribute"] for row in rows} == {"coupon", "maturity_date"}
+
+
+def test_partitioned_dataset_is_used_when_the_run_file_is_gone(tmp_path: Path) -> None:
+    writer = _writer(tmp_path)
+    writer.write_exceptions_dataset(_batch("run-1"), "run-1")
+    writer.write_exceptions_dataset(_batch("run-2", instruments=5), "run-2")
+    query = ExceptionsQuery(writer)
+
+    rows, _ = _collect(query, "run-1", attributes=["cfi_code"], limit=9)
+
+    assert len(rows) == 40
+    assert {row["run_id"] for row in rows} == {"run-1"}
+    assert [row["instrument_id"] for row in rows] == [f"US{i:04d}" for i in range(40)]
+
+
+def test_deduplicated_artifact_is_served_as_the_requested_run(tmp_path: Path) -> None:
+    writer = _writer(tmp_path)
+    path = writer.write_exceptions(_batch("run-1", instruments=5), AS_OF, "run-1")
+    (writer.base_dir / "uploaded").mkdir()
+    path.rename(writer.base_dir / "uploaded" / path.name)
+
+    # run-2 had identical content, so its artifact_log row reuses run-1's object.
+    repository = _ArtifactRepository(f"s3://security-recon-bucket/results/{path.name}")
+    query = ExceptionsQuery(writer, artifact_repo=repository)  # type: ignore[arg-type]
+    rows, _ = _collect(query, "run-2", limit=4)
+
+    assert len(rows) == 15
+    assert {row["run_id"] for row in rows} == {"run-2"}
+
+
+def test_compacted_artifact_is_filtered_to_the_requested_run(tmp_path: Path) -> None:
+    writer = _writer(tmp_path)
+    (writer.base_dir / "uploaded").mkdir(parents=True)
+    for run_id in ("run-a", "run-b"):
+        path = writer.write_exceptions(_batch(run_id, instruments=10), AS_OF, run_id)
+        path.rename(writer.base_dir / "uploaded" / path.name)
+    # Retention has already purged the per-run originals, so only the compacted file is left.
+    compacted = ExceptionCompactor(writer.base_dir, retention_days=0).compact(AS_OF).path
+
+    repository = _ArtifactRepository(f"s3://security-recon-bucket/results/{compacted.name}")
+    query = ExceptionsQuery(writer, artifact_repo=repository)  # type: ignore[arg-type]
+    rows, _ = _collect(query, "run-a", limit=7)
+
+    assert len(rows) == 30
+    assert {row["run_id"] for row in rows} == {"run-a"}
+
+
+def test_queued_upload_is_read_from_its_local_file(tmp_path: Path) -> None:
+    writer = _writer(tmp_path)
+    elsewhere = ParquetWriter(tmp_path / "elsewhere").write_exceptions(_batch(instruments=3), AS_OF, "run-1")
+
+    repository = _ArtifactRepository(elsewhere.as_uri(), status="queued")
+    query = ExceptionsQuery(writer, artifact_repo=repository)  # type: ignore[arg-type]
+    rows, _ = _collect(query, "run-1")
+
+    assert len(rows) == 9
+
+
+def test_page_serializes_as_ndjson_and_arrow_ipc(tmp_path: Path) -> None:
+    writer = _writer(tmp_path)
+    writer.write_exceptions(_batch(), AS_OF, "run-1")
+    page = ExceptionsQuery(writer).page("run-1", columns=["instrument_id", "as_of_date"], limit=5)
+
+    lines = b"".join(page.iter_ndjson()).splitlines()
+    table = pa.ipc.open_stream(b"".join(page.iter_arrow_ipc())).read_all()
+
+    assert json.loads(lines[0]) == {"as_of_date": "2023-12-29", "instrument_id": "US0000"}
+    assert table.num_rows == 5 and table.column_names == ["as_of_date", "instrument_id"]
+
+
+def test_unknown_run_and_bad_cursor_are_rejected(tmp_path: Path) -> None:
+    writer = _writer(tmp_path)
+    writer.write_exceptions(_batch(), AS_OF, "run-1")
+    query = ExceptionsQuery(writer)
+
+    with pytest.raises(RunNotFoundError):
+        query.page("run-404")
+    with pytest.raises(InvalidCursorError):
+        query.page("run-1", cursor="not-a-cursor")
+    with pytest.raises(ValueError):
+        query.page("run-1", columns=["coupon"])
+
+
+def test_query_benchmark_reports_each_case(tmp_path: Path) -> None:
+    timings = benchmark_queries(generate_exceptions(5_000), tmp_path, page_size=100)
+
+    assert [timing.case for timing in timings][:3] == ["full file read", "first page", "10 pages"]
+    assert timings[0].rows == 5_000 and timings[1].rows == 100
@@ -1,20 +1,22 @@
 from __future__ import annotations
+from datetime import date
 from pathlib import Path
+from types import SimpleNamespace
 
-from botocore.exceptions import ClientError
-from security_recon.integration.s3_uploader import S3Uploader
+from security_recon.domain.exception_batch import ExceptionBatch
+from security_recon.integration.parquet_writer import ParquetWriter
+from security_recon.integration.s3_uploader import CHECKSUM_ALGORITHM, S3Uploader, content_hash
+import pyarrow.parquet as pq
+import pyarrow as pa
 
 class _FakeS3Client:
     def __init__(self) -> None:
-        self._uploaded: set[tuple[str, str]] = set()
+        self.objects: dict[tuple[str, str], bytes] = {}
+        self.calls: list[dict] = []
 
-    def upload_fileobj(self, file_handle, bucket: str, key: str) -> None:
-        file_handle.read()  # exhaust the stream like boto does
-        self._uploaded.add((bucket, key))
-
-    def head_object(self, Bucket: str, Key: str) -> None:  # noqa: N803 - boto naming
-        if (Bucket, Key) not in self._uploaded:
-            raise ClientError({"Error": {"Code": "404", "Message": "Not Found"}}, "HeadObject")
+    def upload_fileobj(self, file_handle, bucket: str, key: str, **kwargs) -> None:
+        self.objects[(bucket, key)] = file_handle.read()  # exhaust the stream like boto does
+        self.calls.append(kwargs)
 
 
 def test_s3_upload(tmp_path: Path) -> None:
@@ -23,11 +25,93 @@ def test_s3_upload(tmp_path: Path) -> None:
     source_dir.mkdir()
     (source_dir / file_name).write_text("dummy parquet contents", encoding="utf-8")
 
-    uploader = S3Uploader(bucket="security-recon-bucket", prefix="test-prefix", source_dir=source_dir)
-    uploader._s3 = _FakeS3Client()  # type: ignore[attr-defined] - test double
+    client = _FakeS3Client()
+    uploader = S3Uploader(bucket="security-recon-bucket", prefix="test-prefix", source_dir=source_dir, client=client)
 
     uploaded_url = uploader.upload(file_name)
 
     assert uploaded_url == "s3://security-recon-bucket/test-prefix/exceptions.test-run.20231230.parquet"
     assert not (source_dir / file_name).exists()
-    assert (source_dir / "uploaded" / file_name).exists()
\ No newline at end of file
+    assert (source_dir / "uploaded" / file_name).exists()
+    assert client.calls[0]["ExtraArgs"] == {"ChecksumAlgorithm": CHECKSUM_ALGORITHM}
+    assert client.calls[0]["Config"].max_concurrency >= 1
+
+
+def test_s3_upload_buffer_skips_local_disk(tmp_path: Path) -> None:
+    batch = ExceptionBatch.build(
+        instrument_id=["US0001", "US0002"],
+        attribute="coupon",
+        difference_type="VALUE_MISMATCH",
+        source_value=["1.0", "2.0"],
+        target_value=["1.5", "2.5"],
+        as_of_date=date(2023, 12, 30),
+        run_id="run-1",
+    )
+    file_name, buffer = ParquetWriter(tmp_path).write_exceptions_buffer(batch, date(2023, 12, 30), "run-1")
+    client = _FakeS3Client()
+    uploader = S3Uploader(bucket="security-recon-bucket", prefix="results", source_dir=tmp_path, client=client)
+
+    uploaded_url = uploader.upload_buffer(buffer, file_name)
+
+    assert uploaded_url == "s3://security-recon-bucket/results/exceptions.run-1.20231230.parquet"
+    assert list(tmp_path.iterdir()) == []
+    body = client.objects[("security-recon-bucket", "results/exceptions.run-1.20231230.parquet")]
+    assert pq.read_table(pa.BufferReader(body)).num_rows == 2
+
+
+AS_OF = date(2023, 12, 30)
+
+
+def _write_run(directory: Path, run_id: str, profile: str = "fast") -> Path:
+    batch = ExceptionBatch.build(
+        instrument_id=["US0001", "US0002"],
+        attribute="coupon",
+        difference_type="VALUE_MISMATCH",
+        source_value=["1.0", "2.0"],
+        target_value=["1.5", "2.5"],
+        as_of_date=AS_OF,
+        run_id=run_id,
+    )
+    return ParquetWriter(directory, profile=profile).write_exceptions(batch, AS_OF, run_id)
+
+
+def test_content_hash_ignores_run_id_and_encoding(tmp_path: Path) -> None:
+    first = content_hash(_write_run(tmp_path / "a", "run-1"), AS_OF)
+
+    assert content_hash(_write_run(tmp_path / "b", "run-2", profile="archival"), AS_OF) == first
+    changed = _write_run(tmp_path / "c", "run-3")
+    table = pq.read_table(changed)
+    pq.write_table(table.slice(0, 1), changed)
+    assert content_hash(changed, AS_OF) != first
+
+
+def test_content_hash_of_empty_files_differs_by_date(tmp_path: Path) -> None:
+    path = _write_run(tmp_path, "run-1")
+    pq.write_table(pq.read_table(path).slice(0, 0), path)
+
+    assert content_hash(path, AS_OF) != content_hash(path, date(2024, 3, 1))
+
+
+def test_s3_upload_skips_content_already_recorded(tmp_path: Path) -> None:
+    path = _write_run(tmp_path, "run-2")
+    digest = content_hash(path, AS_OF)
+
+    class _Repository:
+        def find_by_content_hash(self, value: str, *, as_of_date: date) -> SimpleNamespace | None:
+            if value != digest or as_of_date != AS_OF:
+                return None
+            return SimpleNamespace(s3_uri="s3://security-recon-bucket/results/run-1.parquet")
+
+    client = _FakeS3Client()
+    uploader = S3Uploader(
+        bucket="security-recon-bucket",
+        source_dir=tmp_path,
+        client=client,
+        artifact_repo=_Repository(),  # type: ignore[arg-type]
+    )
+
+    assert uploader.upload(path.name, content_hash=digest, as_of_date=AS_OF) == (
+        "s3://security-recon-bucket/results/run-1.parquet"
+    )
+    assert client.objects == {}
+    assert (tmp_path / "uploaded" / path.name).exists()
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import threading
+import time
+from datetime import date
+from pathlib import Path
+from types import SimpleNamespace
+
+from botocore.exceptions import ClientError
+
+from security_recon.domain.exception_batch import ExceptionBatch
+from security_recon.integration.parquet_writer import ParquetWriter
+from security_recon.integration.s3_uploader import S3Uploader, content_hash
+from security_recon.integration.upload_queue import FAILED, QUEUED, UPLOADED, UPLOADING, UploadQueue
+
+AS_OF = date(2023, 12, 29)
+
+
+class _FakeArtifactRepository:
+    def __init__(self) -> None:
+        self.transitions: list[str] = []
+
+    def record_upload(self, *, status: str, **_: object) -> SimpleNamespace:
+        self.transitions.append(status)
+        return SimpleNamespace(id=1)
+
+    def update_status(self, artifact_id: int, *, status: str, **_: object) -> None:
+        self.transitions.append(status)
+
+
+class _FlakyUploader:
+    """Fails the first ``failures`` uploads with ``error``, then succeeds."""
+
+    def __init__(self, failures: int = 0, error: Exception | None = None) -> None:
+        self.failures = failures
+        self.error = error or ConnectionError("S3 unavailable")
+        self.uploaded: list[str] = []
+
+    def __call__(self, source_dir: Path) -> "_FlakyUploader":
+        self.source_dir = source_dir
+        return self
+
+    def local_path(self, file_name: str) -> Path:
+        return self.source_dir / file_name
+
+    def upload(self, file_name: str, content_hash: str | None = None, as_of_date: date | None = None) -> str:
+        if self.failures:
+            self.failures -= 1
+            raise self.error
+        self.uploaded.append(file_name)
+        return f"s3://bucket/results/{file_name}"
+
+
+class _RecordingS3Client:
+    def __init__(self) -> None:
+        self.objects: dict[str, dict] = {}
+        self.uploads = 0
+
+    def upload_fileobj(self, file_handle, bucket: str, key: str, **kwargs) -> None:
+        file_handle.read()
+        self.uploads += 1
+        self.objects[key] = kwargs.get("ExtraArgs", {}).get("Metadata", {})
+
+    def head_object(self, Bucket: str, Key: str) -> dict:  # noqa: N803 - boto naming
+        if Key not in self.objects:
+            raise ClientError({"Error": {"Code": "404", "Message": "Not Found"}}, "HeadObject")
+        return {"Metadata": self.objects[Key]}
+
+
+def _queue(tmp_path: Path, uploader: _FlakyUploader, **options) -> UploadQueue:
+    options.setdefault("base_delay", 0.0)
+    return UploadQueue(tmp_path / "queue.sqlite", uploader_factory=uploader, **options)
+
+
+def _exceptions_file(tmp_path: Path) -> Path:
+    path = tmp_path / "exceptions.run-1.20231229.parquet"
+    path.write_bytes(b"parquet")
+    return path
+
+
+def test_enqueue_returns_immediately_and_drain_uploads(tmp_path: Path) -> None:
+    repository = _FakeArtifactRepository()
+    uploader = _FlakyUploader()
+    queue = _queue(tmp_path, uploader, artifact_repo=repository)
+
+    job_id = queue.enqueue(run_id="run-1", as_of_date=AS_OF, file_path=_exceptions_file(tmp_path))
+
+    assert queue.job(job_id).status == QUEUED
+    assert uploader.uploaded == []
+    assert queue.drain() == 1
+    job = queue.job(job_id)
+    assert job.status == UPLOADED
+    assert job.s3_uri == "s3://bucket/results/exceptions.run-1.20231229.parquet"
+    assert repository.transitions == [QUEUED, UPLOADING, UPLOADED]
+
+
+def test_failed_uploads_are_rescheduled_with_backoff(tmp_path: Path) -> None:
+    queue = _queue(tmp_path, _FlakyUploader(failures=1), base_delay=60)
+    job_id = queue.enqueue(run_id="run-1", as_of_date=AS_OF, file_path=_exceptions_file(tmp_path))
+
+    queue.drain()
+
+    job = queue.job(job_id)
+    assert job.status == QUEUED and job.attempts == 1
+    assert job.next_attempt_at > time.time() + 50
+    assert queue.drain() == 0  # not due yet
+
+
+def test_failed_uploads_give_up_after_max_attempts(tmp_path: Path) -> None:
+    repository = _FakeArtifactRepository()
+    queue = _queue(tmp_path, _FlakyUploader(failures=5), artifact_repo=repository, max_attempts=3)
+    job_id = queue.enqueue(run_id="run-1", as_of_date=AS_OF, file_path=_exceptions_file(tmp_path))
+
+    assert queue.drain() == 3
+
+    job = queue.job(job_id)
+    assert job.status == FAILED and job.attempts == 3
+    assert "S3 unavailable" in job.last_error
+    assert repository.transitions[-1] == FAILED
+    assert queue.retry_failed() == 1
+    assert queue.job(job_id).status == QUEUED
+
+
+def test_permanent_errors_fail_without_retrying(tmp_path: Path) -> None:
+    queue = _queue(tmp_path, _FlakyUploader(failures=1, error=ValueError("S3 bucket not configured")))
+    job_id = queue.enqueue(run_id="run-1", as_of_date=AS_OF, file_path=_exceptions_file(tmp_path))
+
+    queue.drain()
+
+    assert queue.job(job_id).status == FAILED
+    assert "S3 bucket not configured" in queue.job(job_id).last_error
+
+
+def test_jobs_survive_a_restart_and_drain_on_background_workers(tmp_path: Path) -> None:
+    crashed = _queue(tmp_path, _FlakyUploader())
+    job_id = crashed.enqueue(run_id="run-1", as_of_date=AS_OF, file_path=_exceptions_file(tmp_path))
+    crashed._claim()  # process died mid-upload
+    assert crashed.job(job_id).status == UPLOADING
+
+    uploader = _FlakyUploader()
+    restarted = _queue(tmp_path, uploader, workers=2, poll_interval=0.01)
+    restarted.start()
+    try:
+        deadline = time.time() + 5
+        while restarted.job(job_id).status != UPLOADED and time.time() < deadline:
+            time.sleep(0.01)
+    finally:
+        restarted.stop()
+
+    assert restarted.job(job_id).status == UPLOADED
+    assert uploader.uploaded == ["exceptions.run-1.20231229.parquet"]
+
+
+def test_queues_sharing_a_journal_claim_each_job_once(tmp_path: Path) -> None:
+    # Two queue objects stand in for two API processes using the same journal file.
+    uploader = _FlakyUploader()
+    first, second = _queue(tmp_path, uploader), _queue(tmp_path, uploader)
+    for index in range(40):
+        path = tmp_path / f"exceptions.run-{index}.20231229.parquet"
+        path.write_bytes(b"parquet")
+        first.enqueue(run_id=f"run-{index}", as_of_date=AS_OF, file_path=path)
+
+    threads = [threading.Thread(target=queue.drain) for queue in (first, second) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(uploader.uploaded) == sorted(f"exceptions.run-{index}.20231229.parquet" for index in range(40))
+    assert len(first.jobs(UPLOADED)) == 40
+
+
+def test_upload_interrupted_after_the_file_was_moved_completes_on_restart(tmp_path: Path) -> None:
+    client = _RecordingS3Client()
+    uploader_factory = lambda source_dir: S3Uploader(  # noqa: E731
+        bucket="security-recon-bucket", source_dir=source_dir, client=client
+    )
+    batch = ExceptionBatch.build(
+        instrument_id=["US0001"],
+        attribute="coupon",
+        difference_type="VALUE_MISMATCH",
+        source_value="1.0",
+        target_value="2.0",
+        as_of_date=AS_OF,
+        run_id="run-1",
+    )
+    path = ParquetWriter(tmp_path).write_exceptions(batch, AS_OF, "run-1")
+    crashed = UploadQueue(tmp_path / "queue.sqlite", uploader_factory=uploader_factory)
+    job_id = crashed.enqueue(run_id="run-1", as_of_date=AS_OF, file_path=path)
+    crashed._claim()
+    # The object reached S3 and the file was archived, but the journal was never updated.
+    uploader_factory(tmp_path).upload(path.name, content_hash=content_hash(path, AS_OF))
+    assert crashed.job(job_id).status == UPLOADING
+
+    restarted = UploadQueue(
+        tmp_path / "queue.sqlite", uploader_factory=uploader_factory, workers=1, poll_interval=0.01
+    )
+    restarted.start()
+    try:
+        deadline = time.time() + 5
+        while restarted.job(job_id).status not in (UPLOADED, FAILED) and time.time() < deadline:
+            time.sleep(0.01)
+    finally:
+        restarted.stop()
+
+    assert restarted.job(job_id).status == UPLOADED
+    assert restarted.job(job_id).s3_uri == f"s3://security-recon-bucket/results/{path.name}"
+    assert client.uploads == 1
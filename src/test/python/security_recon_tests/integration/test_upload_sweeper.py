@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import os
+import time
+from datetime import date
+from pathlib import Path
+
+from botocore.exceptions import ClientError
+
+from security_recon.domain.exception_batch import ExceptionBatch
+from security_recon.integration.parquet_writer import ParquetWriter
+from security_recon.integration.s3_uploader import CONTENT_HASH_METADATA, S3Uploader
+from security_recon.integration.upload_queue import UploadQueue
+from security_recon.integration.upload_sweeper import UploadSweeper
+
+AS_OF = date(2023, 12, 29)
+
+
+class _FakeS3Client:
+    def __init__(self) -> None:
+        self.objects: dict[str, dict] = {}
+        self.uploads = 0
+
+    def upload_fileobj(self, file_handle, bucket: str, key: str, **kwargs) -> None:
+        file_handle.read()
+        self.uploads += 1
+        self.objects[key] = kwargs.get("ExtraArgs", {}).get("Metadata", {})
+
+    def head_object(self, Bucket: str, Key: str) -> dict:  # noqa: N803 - boto naming
+        if Key not in self.objects:
+            raise ClientError({"Error": {"Code": "404", "Message": "Not Found"}}, "HeadObject")
+        return {"Metadata": self.objects[Key]}
+
+
+class _FakeArtifactRepository:
+    def __init__(self) -> None:
+        self.records: list[dict] = []
+
+    def find_by_content_hash(self, content_hash: str, *, as_of_date: date) -> None:
+        return None
+
+    def record_upload(self, **record: object) -> None:
+        self.records.append(record)
+
+
+def _write_run(directory: Path, run_id: str, rows: int = 2, *, age: float = 3_600) -> Path:
+    batch = ExceptionBatch.build(
+        instrument_id=[f"US{i:04d}" for i in range(rows)],
+        attribute="coupon",
+        difference_type="VALUE_MISMATCH",
+        source_value=["1.0"] * rows,
+        target_value=["2.0"] * rows,
+        as_of_date=AS_OF,
+        run_id=run_id,
+    )
+    path = ParquetWriter(directory).write_exceptions(batch, AS_OF, run_id)
+    stamp = time.time() - age
+    os.utime(path, (stamp, stamp))
+    return path
+
+
+def _sweeper(
+    directory: Path, client: _FakeS3Client, repository: _FakeArtifactRepository, **options
+) -> UploadSweeper:
+    return UploadSweeper(
+        directory,
+        artifact_repo=repository,  # type: ignore[arg-type]
+        uploader_factory=lambda source_dir: S3Uploader(
+            bucket="security-recon-bucket", source_dir=source_dir, client=client, artifact_repo=repository
+        ),
+        workers=2,
+        min_age_seconds=60,
+        **options,
+    )
+
+
+def test_sweeper_uploads_leftover_files_and_records_them(tmp_path: Path) -> None:
+    client, repository = _FakeS3Client(), _FakeArtifactRepository()
+    _write_run(tmp_path, "run-1")
+    _write_run(tmp_path, "run-2", rows=0)
+    _write_run(tmp_path, "run-3", age=0)  # a run that may still be uploading it
+    owned = _write_run(tmp_path, "run-4")
+    queue = UploadQueue(tmp_path / "queue" / "jobs.sqlite")
+    queue.enqueue(run_id="run-4", as_of_date=AS_OF, file_path=owned)
+
+    swept = _sweeper(tmp_path, client, repository, upload_queue=queue).sweep()
+
+    assert [(item.path.name, item.error) for item in swept] == [
+        ("exceptions.run-1.20231229.parquet", None),
+        ("exceptions.run-2.20231229.parquet", None),
+    ]
+    assert sorted(client.objects) == [
+        "results/exceptions.run-1.20231229.parquet",
+        "results/exceptions.run-2.20231229.parquet",
+    ]
+    assert sorted((record["run_id"], record["as_of_date"]) for record in repository.records) == [
+        ("run-1", AS_OF),
+        ("run-2", AS_OF),
+    ]
+    assert all(len(record["content_hash"]) == 64 for record in repository.records)
+    assert sorted(path.name for path in tmp_path.glob("*.parquet")) == [
+        "exceptions.run-3.20231229.parquet",
+        "exceptions.run-4.20231229.parquet",
+    ]
+
+
+def test_sweeper_does_not_resend_content_already_in_s3(tmp_path: Path) -> None:
+    client, repository = _FakeS3Client(), _FakeArtifactRepository()
+    path = _write_run(tmp_path, "run-1")
+    _sweeper(tmp_path, client, repository).sweep()
+    # Upload succeeded but the process died before the file was moved.
+    (tmp_path / "uploaded" / path.name).replace(path)
+
+    swept = _sweeper(tmp_path, client, repository).sweep()
+
+    assert swept[0].s3_uri == "s3://security-recon-bucket/results/exceptions.run-1.20231229.parquet"
+    assert client.uploads == 1
+    assert CONTENT_HASH_METADATA in client.objects["results/exceptions.run-1.20231229.parquet"]
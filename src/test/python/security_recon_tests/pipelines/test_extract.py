@@ -28,11 +28,9 @@ def test_get_legacy_securities_by_date() -> None:
     expected_columns = {
         "instrument_id",
         "as_of_date",
-        "isin",
         "cfi_code",
         "coupon",
         "maturity_date",
-        "currency",
         "callable_flag",
     }
     assert set(df.columns) == expected_columns
@@ -60,11 +58,9 @@ def test_strategic_securities_load_by_date() -> None:
     expected_columns = {
         "instrument_id",
         "as_of_date",
-        "isin",
         "cfi_code",
         "coupon",
         "maturity_date",
-        "currency",
         "callable_flag",
     }
     assert set(df.columns) == expected_columns
@@ -1,7 +1,13 @@
 from datetime import date
 from pathlib import Path
+from security_recon.domain.exception_batch import EXCEPTION_SCHEMA, ExceptionBatch
+from security_recon.controller.benchmark import benchmark_profiles, generate_exceptions
 from security_recon.integration.parquet_writer import ParquetWriter
+import numpy as np
 import pandas as pd
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+import pytest
 
 
 def test_write_to_parquet(tmp_path: Path) -> None:
@@ -20,3 +26,153 @@ def test_write_to_parquet(tmp_path: Path) -> None:
     expected_path = output_root / "exceptions.01.20231229.parquet"
     assert output_path == expected_path
     assert output_path.exists()
+
+
+def test_write_exception_batch_uses_exception_schema(tmp_path: Path) -> None:
+    writer = ParquetWriter(tmp_path)
+    batch = ExceptionBatch.build(
+        instrument_id=["US0001"],
+        attribute="coupon",
+        source_value=[5.0],
+        target_value=[5.5],
+        difference_type="VALUE_MISMATCH",
+        as_of_date=date(2023, 12, 29),
+        run_id="run-1",
+    )
+
+    output_path = writer.write_exceptions(batch, date(2023, 12, 29), "run-1")
+
+    assert pq.read_schema(output_path).remove_metadata() == EXCEPTION_SCHEMA
+    assert pd.read_parquet(output_path)["target_value"].tolist() == ["5.5"]
+
+
+def _coupon_batch(start: int, size: int) -> ExceptionBatch:
+    return ExceptionBatch.build(
+        instrument_id=[f"US{i:04d}" for i in range(start, start + size)],
+        attribute="coupon",
+        source_value=[1.0] * size,
+        target_value=[2.0] * size,
+        difference_type="VALUE_MISMATCH",
+        as_of_date=date(2023, 12, 29),
+        run_id="run-1",
+    )
+
+
+def test_streaming_writer_flushes_row_groups_and_renames_on_close(tmp_path: Path) -> None:
+    writer = ParquetWriter(tmp_path)
+    writer.row_group_size = 4
+
+    with writer.open_exceptions(date(2023, 12, 29), "run-1") as stream:
+        for start in range(0, 10, 3):
+            stream.write(_coupon_batch(start, 3))
+            assert not stream.path.exists()
+
+    metadata = pq.ParquetFile(stream.path).metadata
+    assert stream.path == tmp_path / "exceptions.run-1.20231229.parquet"
+    assert stream.rows_written == metadata.num_rows == 12
+    assert [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)] == [4, 4, 4]
+    assert pd.read_parquet(stream.path)["instrument_id"].tolist() == [f"US{i:04d}" for i in range(12)]
+    assert list(tmp_path.glob("*.tmp")) == []
+
+
+def test_streaming_writer_discards_partial_file_on_error(tmp_path: Path) -> None:
+    writer = ParquetWriter(tmp_path)
+
+    try:
+        with writer.open_exceptions(date(2023, 12, 29), "run-1") as stream:
+            stream.write(_coupon_batch(0, 2))
+            raise RuntimeError("diff failed")
+    except RuntimeError:
+        pass
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_exceptions_dataset_is_partitioned_sorted_and_prunable(tmp_path: Path) -> None:
+    writer = ParquetWriter(tmp_path, dataset_dir=tmp_path / "dataset")
+    batch = ExceptionBatch.concat(
+        [
+            _coupon_batch(0, 3).take(np.array([2, 0, 1])),
+            ExceptionBatch.build(
+                instrument_id=["US9999"],
+                attribute="__record__",
+                source_value="present",
+                target_value="missing",
+                difference_type="ONLY_IN_LEGACY",
+                as_of_date=date(2023, 12, 29),
+                run_id="run-1",
+            ),
+        ]
+    )
+
+    root = writer.write_exceptions_dataset(batch, "run-1")
+
+    assert root == tmp_path / "dataset"
+    coupon_dir = root / "as_of_date=2023-12-29" / "difference_type=VALUE_MISMATCH" / "attribute=coupon"
+    assert [path.name for path in coupon_dir.iterdir()] == ["part-run-1-0.parquet"]
+    coupon_file = pq.ParquetFile(coupon_dir / "part-run-1-0.parquet")
+    assert coupon_file.metadata.row_group(0).column(1).statistics.has_min_max
+    assert coupon_file.read().column("instrument_id").to_pylist() == ["US0000", "US0001", "US0002"]
+
+    dataset = writer.exceptions_dataset()
+    coupon_only = dataset.to_table(filter=pc.field("attribute") == "coupon")
+    assert coupon_only.num_rows == 3
+    fragments = list(dataset.get_fragments(filter=pc.field("difference_type") == "ONLY_IN_LEGACY"))
+    assert len(fragments) == 1
+
+
+def test_rewriting_a_run_drops_partitions_it_no_longer_produces(tmp_path: Path) -> None:
+    writer = ParquetWriter(tmp_path, dataset_dir=tmp_path / "dataset")
+    record_only = ExceptionBatch.build(
+        instrument_id=["US9999"],
+        attribute="__record__",
+        source_value="present",
+        target_value="missing",
+        difference_type="ONLY_IN_LEGACY",
+        as_of_date=date(2023, 12, 29),
+        run_id="run-1",
+    )
+    writer.write_exceptions_dataset(ExceptionBatch.concat([_coupon_batch(0, 3), record_only]), "run-1")
+    writer.write_exceptions_dataset(_coupon_batch(0, 2).take(np.array([1, 0])), "run-2")
+
+    writer.write_exceptions_dataset(_coupon_batch(0, 2), "run-1")
+
+    root = tmp_path / "dataset"
+    files = sorted(path.relative_to(root).as_posix() for path in root.rglob("*.parquet"))
+    assert files == [
+        "as_of_date=2023-12-29/difference_type=VALUE_MISMATCH/attribute=coupon/part-run-1-0.parquet",
+        "as_of_date=2023-12-29/difference_type=VALUE_MISMATCH/attribute=coupon/part-run-2-0.parquet",
+    ]
+    assert writer.exceptions_dataset().count_rows() == 4
+
+
+def test_encoding_profiles_set_compression_and_dictionary_columns(tmp_path: Path) -> None:
+    batch = generate_exceptions(1_000)
+
+    archival = ParquetWriter(tmp_path / "archival", profile="archival").write_exceptions(batch, date(2023, 12, 29), 1)
+    dictionary = ParquetWriter(tmp_path / "dictionary", profile="dictionary").write_exceptions(
+        batch, date(2023, 12, 29), 1
+    )
+
+    archival_group = pq.ParquetFile(archival).metadata.row_group(0)
+    assert archival_group.column(0).compression == "ZSTD"
+    dictionary_group = pq.ParquetFile(dictionary).metadata.row_group(0)
+    encodings = {
+        dictionary_group.column(i).path_in_schema: dictionary_group.column(i).encodings
+        for i in range(dictionary_group.num_columns)
+    }
+    assert "RLE_DICTIONARY" in encodings["attribute"]
+    assert "RLE_DICTIONARY" not in encodings["instrument_id"]
+    assert pq.read_table(dictionary).num_rows == len(batch)
+
+
+def test_unknown_encoding_profile_is_rejected(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        ParquetWriter(tmp_path, profile="lz4-turbo")
+
+
+def test_benchmark_reports_every_profile(tmp_path: Path) -> None:
+    results = benchmark_profiles(generate_exceptions(500), ["fast", "archival"], tmp_path)
+
+    assert [result.profile for result in results] == ["fast", "archival"]
+    assert all(result.rows == 500 and result.file_bytes > 0 for result in results)
@@ -2,6 +2,7 @@ import pandas as pd
 import pytest
 
 from security_recon.domain.dictionary import AttributeRule, AttributeRuleSet
+from security_recon.service.parallel import PartitionedDiffer, partition_frame
 from security_recon.service.recon import DataFrameDiffer
 
 
@@ -97,6 +98,103 @@ def test_attribute_mismatch_exceptions(
     assert both_sides["cfi_code_strategic"].iloc[0] == "DXXXXXX"
 
 
+@pytest.fixture(scope="module")
+def define_rules() -> AttributeRuleSet:
+    return AttributeRuleSet(
+        {
+            "coupon": AttributeRule(name="coupon", type="float", tolerance=0.01),
+            "cfi_code": AttributeRule(name="cfi_code", type="string", ignore_case=True, trim=True),
+            "maturity_date": AttributeRule(name="maturity_date", type="date"),
+            "callable_flag": AttributeRule(name="callable_flag", type="boolean"),
+        }
+    )
+
+
+def _as_text(value: object) -> object:
+    return None if pd.isna(value) else str(value)
+
+
+def _row_by_row_exceptions(
+    legacy_df: pd.DataFrame, strategic_df: pd.DataFrame, rules: AttributeRuleSet
+) -> list[tuple]:
+    merged_df = pd.merge(
+        legacy_df,
+        strategic_df,
+        on=["instrument_id", "as_of_date"],
+        how="outer",
+        suffixes=("_legacy", "_strategic"),
+        indicator=True,
+    )
+    expected = []
+    for _, row in merged_df.iterrows():
+        if row["_merge"] == "left_only":
+            expected.append((row["instrument_id"], "__record__", "present", "missing", "ONLY_IN_LEGACY"))
+            continue
+        if row["_merge"] == "right_only":
+            expected.append((row["instrument_id"], "__record__", "missing", "present", "ONLY_IN_STRATEGIC"))
+            continue
+        for attr in rules.attribute_names:
+            src, tgt = row[f"{attr}_legacy"], row[f"{attr}_strategic"]
+            if not DataFrameDiffer.value_equal(src, tgt, rules.get_rule(attr)):
+                expected.append((row["instrument_id"], attr, _as_text(src), _as_text(tgt), "VALUE_MISMATCH"))
+    return expected
+
+
+def test_vectorized_differ_matches_row_by_row(
+    define_source_data: pd.DataFrame,
+    define_target_data: pd.DataFrame,
+    define_rules: AttributeRuleSet,
+) -> None:
+    legacy_df = define_source_data.assign(cfi_code=[" dxxxxxx ", "DYYYYYY", "DZZZZZZ"])
+    strategic_df = define_target_data.assign(maturity_date=["2033-12-29", "2025-06-16", "2030-01-01"])
+    differ = DataFrameDiffer(define_rules)
+
+    exceptions = differ.build_exceptions_df(
+        legacy_df,
+        strategic_df,
+        define_rules,
+        run_id="test-run",
+        as_of_date=pd.Timestamp("2023-12-29").date(),
+    )
+
+    actual = list(
+        exceptions[["instrument_id", "attribute", "source_value", "target_value", "difference_type"]]
+        .astype(object)
+        .where(exceptions.notna(), None)
+        .itertuples(index=False, name=None)
+    )
+    assert actual == _row_by_row_exceptions(legacy_df, strategic_df, define_rules)
+    assert exceptions["run_id"].eq("test-run").all()
+    assert exceptions["source_system"].eq("legacy").all()
+    assert exceptions["target_system"].eq("strategic").all()
+
+
+def test_vectorized_differ_null_handling(define_rules: AttributeRuleSet) -> None:
+    legacy_df = pd.DataFrame(
+        {
+            "instrument_id": ["US0001", "US0002"],
+            "as_of_date": ["2023-12-29", "2023-12-29"],
+            "coupon": [None, 1.0],
+            "cfi_code": [None, "DXXXXXX"],
+        }
+    )
+    strategic_df = pd.DataFrame(
+        {
+            "instrument_id": ["US0001", "US0002"],
+            "as_of_date": ["2023-12-29", "2023-12-29"],
+            "coupon": [None, None],
+            "cfi_code": [None, "dxxxxxx"],
+        }
+    )
+    differ = DataFrameDiffer(define_rules)
+
+    exceptions = differ.build_exceptions_df(
+        legacy_df, strategic_df, define_rules, run_id="test-run", as_of_date=pd.Timestamp("2023-12-29").date()
+    )
+
+    assert exceptions[["instrument_id", "attribute"]].values.tolist() == [["US0002", "coupon"]]
+
+
 def test_dataframe_differ(define_source_data: pd.DataFrame, define_target_data: pd.DataFrame) -> None:
     rules = AttributeRuleSet(
         {
@@ -120,3 +218,124 @@ def test_dataframe_differ(define_source_data: pd.DataFrame, define_target_data:
         "ONLY_IN_STRATEGIC",
         "VALUE_MISMATCH",
     }
+
+
+def test_fingerprint_prefilter_matches_full_diff(
+    define_source_data: pd.DataFrame,
+    define_target_data: pd.DataFrame,
+    define_rules: AttributeRuleSet,
+) -> None:
+    legacy_df = define_source_data.assign(cfi_code=[" dxxxxxx ", "DYYYYYY", "DZZZZZZ"])
+    as_of_date = pd.Timestamp("2023-12-29").date()
+
+    full = DataFrameDiffer(define_rules).build_exceptions_df(
+        legacy_df, define_target_data, define_rules, run_id="test-run", as_of_date=as_of_date
+    )
+    prefiltered = DataFrameDiffer(define_rules, fingerprint_prefilter=True).build_exceptions_df(
+        legacy_df, define_target_data, define_rules, run_id="test-run", as_of_date=as_of_date
+    )
+
+    pd.testing.assert_frame_equal(prefiltered, full)
+
+
+def test_row_fingerprints_ignore_normalized_differences(define_rules: AttributeRuleSet) -> None:
+    differ = DataFrameDiffer(define_rules)
+    legacy_df = pd.DataFrame(
+        {
+            "coupon": [5.0, 5.0],
+            "cfi_code": [" dxxxxxx", "DXXXXXX"],
+            "maturity_date": ["2033-12-29", "2033-12-29"],
+            "callable_flag": [1, None],
+        }
+    )
+    strategic_df = pd.DataFrame(
+        {
+            "coupon": [5.0, 5.0],
+            "cfi_code": ["DXXXXXX", "DXXXXXX"],
+            "maturity_date": ["2033-12-29", "2033-12-29"],
+            "callable_flag": [True, False],
+        }
+    )
+
+    legacy_fp = differ.row_fingerprints(legacy_df)
+    strategic_fp = differ.row_fingerprints(strategic_df)
+
+    assert legacy_fp.iloc[0] == strategic_fp.iloc[0]
+    assert legacy_fp.iloc[1] != strategic_fp.iloc[1]
+
+
+def test_partitioned_differ_matches_serial(
+    define_source_data: pd.DataFrame,
+    define_target_data: pd.DataFrame,
+    define_rules: AttributeRuleSet,
+) -> None:
+    as_of_date = pd.Timestamp("2023-12-29").date()
+    differ = DataFrameDiffer(define_rules)
+
+    serial = differ.build_exceptions_df(
+        define_source_data, define_target_data, define_rules, run_id="test-run", as_of_date=as_of_date
+    )
+    partitioned = PartitionedDiffer(differ, workers=2, partitions=3).build_exceptions_df(
+        define_source_data, define_target_data, define_rules, run_id="test-run", as_of_date=as_of_date
+    )
+
+    pd.testing.assert_frame_equal(partitioned, serial)
+
+
+def test_partition_frame_is_exhaustive(define_source_data: pd.DataFrame) -> None:
+    parts = partition_frame(define_source_data, 4)
+    assert len(parts) == 4
+    assert sorted(pd.concat(parts)["instrument_id"]) == sorted(define_source_data["instrument_id"])
+
+
+def test_duplicate_keys_are_reported_and_excluded(
+    define_source_data: pd.DataFrame, define_target_data: pd.DataFrame, define_rules: AttributeRuleSet
+) -> None:
+    legacy_df = pd.concat([define_source_data, define_source_data.iloc[[1, 1]]], ignore_index=True)
+    strategic_df = define_target_data.assign(coupon=[5.0, 9.9, 4.5])
+    differ = DataFrameDiffer(define_rules)
+
+    exceptions = differ.build_exceptions_df(
+        legacy_df, strategic_df, define_rules, run_id="test-run", as_of_date=pd.Timestamp("2023-12-29").date()
+    )
+
+    assert exceptions[["instrument_id", "difference_type", "source_value"]].values.tolist() == [
+        ["US0002", "DUPLICATE_KEY", "3 rows"],
+        ["US0003", "ONLY_IN_LEGACY", "present"],
+        ["US0004", "ONLY_IN_STRATEGIC", "missing"],
+    ]
+    assert pd.isna(exceptions["target_value"].iloc[0])
+
+
+def test_duplicate_keys_dedup_keeps_first_row(
+    define_source_data: pd.DataFrame, define_target_data: pd.DataFrame, define_rules: AttributeRuleSet
+) -> None:
+    strategic_df = pd.concat(
+        [define_target_data, define_target_data.iloc[[1]].assign(coupon=0.0)], ignore_index=True
+    )
+    differ = DataFrameDiffer(define_rules, duplicate_keys="dedup")
+
+    exceptions = differ.build_exceptions_df(
+        define_source_data,
+        strategic_df,
+        define_rules,
+        run_id="test-run",
+        as_of_date=pd.Timestamp("2023-12-29").date(),
+    )
+    baseline = differ.build_exceptions_df(
+        define_source_data,
+        define_target_data,
+        define_rules,
+        run_id="test-run",
+        as_of_date=pd.Timestamp("2023-12-29").date(),
+    )
+
+    duplicate = exceptions[exceptions["difference_type"] == "DUPLICATE_KEY"]
+    assert duplicate[["instrument_id", "target_value"]].values.tolist() == [["US0002", "2 rows"]]
+    assert exceptions.drop(duplicate.index).astype(str).values.tolist() == baseline.astype(str).values.tolist()
+    assert exceptions.index[exceptions["instrument_id"] == "US0002"][0] == duplicate.index[0]
+
+
+def test_unknown_duplicate_policy_is_rejected(define_rules: AttributeRuleSet) -> None:
+    with pytest.raises(ValueError):
+        DataFrameDiffer(define_rules, duplicate_keys="merge")
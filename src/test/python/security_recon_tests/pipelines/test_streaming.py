@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from typing import Iterator
+
+import pandas as pd
+import pytest
+
+from security_recon.domain.dictionary_loader import load_rules_from_resource
+from security_recon.domain.exception_batch import concat_exception_frames
+from security_recon.service.recon import DataFrameDiffer
+from security_recon.service.streaming import StreamingReconciler, merge_join_batches
+
+
+def _snapshot(ids: list[str], coupon: float) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "instrument_id": ids,
+            "as_of_date": ["2023-12-29"] * len(ids),
+            "coupon": [coupon] * len(ids),
+            "cfi_code": ["DXXXXXX"] * len(ids),
+            "maturity_date": ["2033-12-29"] * len(ids),
+            "callable_flag": [True] * len(ids),
+        }
+    )
+
+
+def _batches(df: pd.DataFrame, size: int) -> Iterator[pd.DataFrame]:
+    for start in range(0, len(df), size):
+        yield df.iloc[start : start + size]
+
+
+@pytest.fixture(scope="module")
+def snapshots() -> tuple[pd.DataFrame, pd.DataFrame]:
+    legacy_ids = [f"US{i:04d}" for i in range(0, 40) if i % 7 != 3]
+    strategic_ids = [f"US{i:04d}" for i in range(5, 45) if i % 11 != 4]
+    legacy_df = _snapshot(legacy_ids, 5.0)
+    strategic_df = _snapshot(strategic_ids, 5.0)
+    strategic_df.loc[strategic_df["instrument_id"].isin(["US0010", "US0021"]), "coupon"] = 6.0
+    return legacy_df, strategic_df
+
+
+@pytest.mark.parametrize("legacy_size,strategic_size", [(1, 1), (3, 7), (8, 2), (100, 100)])
+def test_streaming_matches_in_memory(
+    snapshots: tuple[pd.DataFrame, pd.DataFrame], legacy_size: int, strategic_size: int
+) -> None:
+    legacy_df, strategic_df = snapshots
+    rules = load_rules_from_resource()
+    differ = DataFrameDiffer(rules)
+    as_of_date = pd.Timestamp("2023-12-29").date()
+
+    expected = differ.build_exceptions_df(legacy_df, strategic_df, rules, "run", as_of_date)
+    streamed = concat_exception_frames(
+        StreamingReconciler(differ).iter_exceptions(
+            _batches(legacy_df, legacy_size),
+            _batches(strategic_df, strategic_size),
+            rules,
+            "run",
+            as_of_date,
+        )
+    )
+
+    pd.testing.assert_frame_equal(streamed, expected)
+
+
+def test_merge_join_keeps_boundary_keys_together() -> None:
+    legacy_df = _snapshot(["A", "B", "B", "B", "C"], 1.0)
+    strategic_df = _snapshot(["B", "C"], 1.0)
+
+    chunks = list(merge_join_batches(_batches(legacy_df, 2), _batches(strategic_df, 1)))
+
+    for legacy_chunk, strategic_chunk in chunks:
+        keys = set(legacy_chunk["instrument_id"]) | set(strategic_chunk["instrument_id"])
+        for other_legacy, other_strategic in chunks:
+            if other_legacy is legacy_chunk:
+                continue
+            other_keys = set(other_legacy["instrument_id"]) | set(other_strategic["instrument_id"])
+            assert not keys & other_keys
+    assert sum(len(chunk[0]) for chunk in chunks) == len(legacy_df)
+    assert sum(len(chunk[1]) for chunk in chunks) == len(strategic_df)
+
+
+def test_merge_join_handles_empty_side() -> None:
+    legacy_df = _snapshot(["A", "B"], 1.0)
+
+    chunks = list(merge_join_batches(_batches(legacy_df, 1), iter(())))
+
+    assert sum(len(chunk[0]) for chunk in chunks) == 2
+    assert all(list(chunk[1].columns) == list(legacy_df.columns) for chunk in chunks)
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import hashlib
+import io
+from datetime import date
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+from psycopg import sql
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+
+from security_recon.repositories.security_repository import (
+    StrategicSecurityRepository,
+    _SecurityRepository,
+)
+
+
+class _SqliteSecurityRepository(_SecurityRepository):
+    table = "security_master"
+
+    def __init__(self, engine: Engine, chunk_size: int) -> None:
+        super().__init__(chunk_size=chunk_size)
+        self._engine = engine
+
+    @property
+    def engine(self) -> Engine:
+        return self._engine
+
+    @staticmethod
+    def _cast_text_sql(expression: str) -> str:
+        return f"CAST({expression} AS TEXT)"
+
+    @staticmethod
+    def _decimal_text_sql(expression: str) -> str:
+        return f"printf('%.10f', {expression})"
+
+    @staticmethod
+    def _date_text_sql(expression: str) -> str:
+        return expression
+
+    @staticmethod
+    def _hash32_sql(expression: str) -> str:
+        return f"md5_32({expression})"
+
+
+def _register_functions(dbapi_connection, _record) -> None:
+    dbapi_connection.create_function(
+        "md5_32", 1, lambda value: int(hashlib.md5(value.encode()).hexdigest()[:8], 16)
+    )
+    dbapi_connection.create_function("concat_ws", -1, lambda sep, *values: sep.join(values))
+    dbapi_connection.create_function("mod", 2, lambda value, divisor: value % divisor)
+
+
+def _sqlite_engine():
+    engine = create_engine("sqlite://")
+    event.listen(engine, "connect", _register_functions)
+    return engine
+
+
+@pytest.fixture
+def repository() -> _SqliteSecurityRepository:
+    engine = _sqlite_engine()
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                """
+                CREATE TABLE security_master (
+                    instrument_id TEXT, as_of_date DATE, isin TEXT, cfi_code TEXT,
+                    coupon NUMERIC, maturity_date DATE, currency TEXT, callable_flag INTEGER
+                )
+                """
+            )
+        )
+        for i in (3, 1, 4, 2, 5):
+            connection.execute(
+                text(
+                    "INSERT INTO security_master VALUES "
+                    "(:id, '2023-12-29', NULL, 'DXXXXXX', :coupon, '2033-12-29', 'USD', :flag)"
+                ),
+                {"id": f"US000{i}", "coupon": i + 0.5, "flag": i % 2},
+            )
+    return _SqliteSecurityRepository(engine, chunk_size=2)
+
+
+def test_iter_chunks_by_date_streams_typed_chunks(repository: _SqliteSecurityRepository) -> None:
+    chunks = list(repository.iter_chunks_by_date(date(2023, 12, 29), as_arrow=True))
+
+    assert [chunk.num_rows for chunk in chunks] == [2, 2, 1]
+    assert all(chunk.schema == repository.schema for chunk in chunks)
+    assert repository.schema.names == [
+        "instrument_id",
+        "as_of_date",
+        "coupon",
+        "cfi_code",
+        "maturity_date",
+        "callable_flag",
+    ]
+    assert pa.Table.from_batches(chunks).column("callable_flag").to_pylist() == [True, True, False, False, True]
+
+
+def test_iter_by_date_orders_by_instrument(repository: _SqliteSecurityRepository) -> None:
+    frames = list(repository.iter_by_date(date(2023, 12, 29)))
+
+    combined = pd.concat(frames, ignore_index=True)
+    assert combined["instrument_id"].tolist() == ["US0001", "US0002", "US0003", "US0004", "US0005"]
+    assert combined["coupon"].dtype == "float64"
+
+
+def test_load_by_date_range_reads_every_date(repository: _SqliteSecurityRepository) -> None:
+    with repository.engine.begin() as connection:
+        connection.execute(
+            text(
+                "INSERT INTO security_master VALUES "
+                "('US0001', '2023-12-28', NULL, 'DXXXXXX', 1.5, '2033-12-29', 'USD', 1), "
+                "('US0001', '2023-12-31', NULL, 'DXXXXXX', 1.5, '2033-12-29', 'USD', 1)"
+            )
+        )
+
+    df = repository.load_by_date_range(date(2023, 12, 28), date(2023, 12, 29))
+
+    assert len(df) == 6
+    assert sorted(df["as_of_date"].dt.date.unique()) == [date(2023, 12, 28), date(2023, 12, 29)]
+
+
+def test_bucket_checksums_isolate_changed_rows(repository: _SqliteSecurityRepository) -> None:
+    as_of_date = date(2023, 12, 29)
+    before = repository.bucket_checksums(as_of_date, bucket_count=4)
+    with repository.engine.begin() as connection:
+        connection.execute(text("UPDATE security_master SET coupon = 9.25 WHERE instrument_id = 'US0003'"))
+        connection.execute(text("UPDATE security_master SET cfi_code = NULL WHERE instrument_id = 'US0005'"))
+    after = repository.bucket_checksums(as_of_date, bucket_count=4)
+
+    assert sum(row_count for row_count, _ in before.values()) == 5
+    changed = sorted(bucket for bucket in before if before[bucket] != after[bucket])
+    df = repository.load_by_buckets(as_of_date, changed, bucket_count=4)
+    assert {"US0003", "US0005"} <= set(df["instrument_id"])
+    assert sum(after[bucket][0] for bucket in changed) == len(df)
+    assert repository.load_by_buckets(as_of_date, [], bucket_count=4).empty
+
+
+def test_bucket_checksums_tell_null_flag_from_false(repository: _SqliteSecurityRepository) -> None:
+    as_of_date = date(2023, 12, 29)
+    before = repository.bucket_checksums(as_of_date, bucket_count=4)
+    with repository.engine.begin() as connection:
+        # US0002 and US0004 have callable_flag = 0 (FALSE).
+        connection.execute(text("UPDATE security_master SET callable_flag = NULL WHERE instrument_id = 'US0002'"))
+    after = repository.bucket_checksums(as_of_date, bucket_count=4)
+
+    changed = [bucket for bucket in before if before[bucket] != after[bucket]]
+    assert len(changed) == 1
+    assert "US0002" in set(repository.load_by_buckets(as_of_date, changed, bucket_count=4)["instrument_id"])
+
+
+def test_fingerprint_tells_null_from_empty_string(repository: _SqliteSecurityRepository) -> None:
+    as_of_date = date(2023, 12, 29)
+    with repository.engine.begin() as connection:
+        connection.execute(text("UPDATE security_master SET cfi_code = NULL WHERE instrument_id = 'US0001'"))
+    before = repository.fingerprint(as_of_date)
+    with repository.engine.begin() as connection:
+        connection.execute(text("UPDATE security_master SET cfi_code = '' WHERE instrument_id = 'US0001'"))
+
+    assert repository.fingerprint(as_of_date) != before
+
+
+class _CopyStandIn(StrategicSecurityRepository):
+    """Replays a Postgres CSV COPY stream instead of talking to a server."""
+
+    payload = (
+        b"instrument_id,as_of_date,coupon,cfi_code,maturity_date,callable_flag\n"
+        b"US0001,2023-12-29,5.0000,DXXXXXX,2033-12-29,t\n"
+        b"US0002,2023-12-29,,,2025-06-15,f\n"
+        b'US0003,2023-12-29,1.2500,"",2027-03-01,\n'
+    )
+
+    def __init__(self) -> None:
+        super().__init__(extract_mode="copy")
+        self.statements: list[str] = []
+
+    def _copy_to_buffer(self, statement: sql.Composable) -> io.BytesIO:
+        self.statements.append(statement.as_string(None))
+        return io.BytesIO(self.payload)
+
+
+def test_copy_extract_parses_typed_frame() -> None:
+    repository = _CopyStandIn()
+
+    df = repository.load_by_date(date(2023, 12, 29))
+
+    assert repository.statements[0].startswith("COPY (")
+    assert "'2023-12-29'::date" in repository.statements[0]
+    assert df["instrument_id"].tolist() == ["US0001", "US0002", "US0003"]
+    assert df["coupon"].dtype == "float64"
+    assert df["coupon"].isna().tolist() == [False, True, False]
+    assert df["callable_flag"].tolist() == [True, False, pd.NA]
+    assert df["maturity_date"].dt.date.tolist() == [date(2033, 12, 29), date(2025, 6, 15), date(2027, 3, 1)]
+    assert df["cfi_code"].dtype == "category"
+    assert pd.isna(df["cfi_code"].iloc[1])
+    assert df["cfi_code"].iloc[2] == ""
+    assert "isin" not in df.columns
+
+
+def test_unknown_extract_mode_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        StrategicSecurityRepository(extract_mode="odbc")
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import os
+from datetime import date
+from pathlib import Path
+
+import pandas as pd
+
+from security_recon.repositories.snapshot_cache import CachedSecurityRepository, SnapshotCache
+
+AS_OF_DATE = date(2023, 12, 29)
+
+
+class _CountingRepository:
+    def __init__(self) -> None:
+        self.loads = 0
+        self.version = "3:1234"
+
+    def fingerprint(self, as_of_date: date) -> str:
+        return self.version
+
+    def load_by_date(self, as_of_date: date) -> pd.DataFrame:
+        self.loads += 1
+        return pd.DataFrame(
+            {
+                "instrument_id": ["US0001", "US0002", "US0003"],
+                "as_of_date": [as_of_date] * 3,
+                "coupon": [5.0, 3.5, float(self.loads)],
+            }
+        )
+
+
+def test_repeat_load_is_served_from_cache(tmp_path: Path) -> None:
+    source = _CountingRepository()
+    repository = CachedSecurityRepository(source, SnapshotCache(tmp_path), "legacy")
+
+    first = repository.load_by_date(AS_OF_DATE)
+    second = repository.load_by_date(AS_OF_DATE)
+
+    assert source.loads == 1
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_changed_fingerprint_invalidates_entry(tmp_path: Path) -> None:
+    source = _CountingRepository()
+    repository = CachedSecurityRepository(source, SnapshotCache(tmp_path), "legacy")
+
+    repository.load_by_date(AS_OF_DATE)
+    source.version = "3:9999"
+    refreshed = repository.load_by_date(AS_OF_DATE)
+
+    assert source.loads == 2
+    assert refreshed["coupon"].iloc[2] == 2.0
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path: Path) -> None:
+    cache = SnapshotCache(tmp_path)
+    frame = pd.DataFrame({"instrument_id": [f"US{i:04d}" for i in range(100)]})
+    for day in (1, 2, 3):
+        cache.put("legacy", date(2023, 12, day), "fp", frame)
+        meta_path = tmp_path / f"legacy.2023-12-0{day}.json"
+        os.utime(meta_path, (day, day))
+
+    assert cache.get("legacy", date(2023, 12, 1), "fp") is not None  # now most recently used
+    cache.max_bytes = cache.size_bytes() - 1
+    cache.put("strategic", date(2023, 12, 1), "fp", frame)
+
+    assert cache.get("legacy", date(2023, 12, 2), "fp") is None
+    assert cache.get("legacy", date(2023, 12, 1), "fp") is not None
+    assert cache.get("strategic", date(2023, 12, 1), "fp") is not None
+
+
+def test_caches_on_one_directory_share_a_lock(tmp_path: Path) -> None:
+    assert SnapshotCache(tmp_path)._lock is SnapshotCache(tmp_path / ".")._lock
+    assert SnapshotCache(tmp_path)._lock is not SnapshotCache(tmp_path / "other")._lock
+
+
+def test_entry_evicted_before_it_is_read_is_a_miss(tmp_path: Path, monkeypatch) -> None:
+    cache = SnapshotCache(tmp_path)
+    cache.put("legacy", AS_OF_DATE, "fp", pd.DataFrame({"instrument_id": ["US0001"]}))
+
+    def evicted(path, *args, **kwargs):
+        raise FileNotFoundError(path)  # another process evicted it right after the metadata check
+
+    monkeypatch.setattr(pd, "read_parquet", evicted)
+
+    assert cache.get("legacy", AS_OF_DATE, "fp") is None
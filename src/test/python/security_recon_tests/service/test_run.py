@@ -0,0 +1,257 @@
+"""Unit checks for ``ReconPipeline`` using in-memory repositories."""
+from __future__ import annotations
+
+import time
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+import pytest
+
+from security_recon.service.incremental import (
+    RunStateStore,
+    changed_instruments,
+    instrument_fingerprints,
+    rules_digest,
+)
+from security_recon.service.run import ReconPipeline, SourceLoadError
+
+AS_OF_DATE = date(2023, 12, 29)
+
+
+class _FrameRepository:
+    def __init__(self, df: pd.DataFrame, delay: float = 0.0, error: Exception | None = None) -> None:
+        self.df = df
+        self.delay = delay
+        self.error = error
+
+    def load_by_date(self, as_of_date: date) -> pd.DataFrame:
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return self.df
+
+
+def _snapshot(ids: list[str]) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "instrument_id": ids,
+            "as_of_date": [AS_OF_DATE] * len(ids),
+            "coupon": [5.0] * len(ids),
+            "cfi_code": ["DXXXXXX"] * len(ids),
+            "maturity_date": [date(2033, 12, 29)] * len(ids),
+            "callable_flag": [True] * len(ids),
+        }
+    )
+
+
+def _pipeline(
+    tmp_path: Path,
+    legacy_repo: _FrameRepository,
+    strategic_repo: _FrameRepository,
+    **options: Any,
+) -> ReconPipeline:
+    return ReconPipeline(
+        base_output_dir=tmp_path,
+        legacy_repo=legacy_repo,  # type: ignore[arg-type] - test double
+        strategic_repo=strategic_repo,  # type: ignore[arg-type] - test double
+        metrics_repo=object(),  # type: ignore[arg-type] - metrics not persisted here
+        **options,
+    )
+
+
+def test_sources_load_concurrently(tmp_path: Path) -> None:
+    pipeline = _pipeline(
+        tmp_path,
+        _FrameRepository(_snapshot(["US0001", "US0002"]), delay=0.3),
+        _FrameRepository(_snapshot(["US0002", "US0003"]), delay=0.3),
+    )
+
+    started = time.perf_counter()
+    result = pipeline.run(AS_OF_DATE, persist_metrics=False)
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.55
+    assert set(result.load_timings) == {"legacy", "strategic"}
+    assert all(timing >= 0.3 for timing in result.load_timings.values())
+    assert result.exception_count == 2
+
+
+def test_source_load_failure_names_the_side(tmp_path: Path) -> None:
+    pipeline = _pipeline(
+        tmp_path,
+        _FrameRepository(_snapshot(["US0001"])),
+        _FrameRepository(_snapshot(["US0001"]), error=ConnectionError("postgres unreachable")),
+    )
+
+    with pytest.raises(SourceLoadError) as excinfo:
+        pipeline.run(AS_OF_DATE, persist_metrics=False)
+
+    assert excinfo.value.side == "strategic"
+    assert isinstance(excinfo.value.__cause__, ConnectionError)
+
+
+class _BucketedRepository(_FrameRepository):
+    """Computes bucket checksums in Python the way the databases would in SQL."""
+
+    def __init__(self, df: pd.DataFrame) -> None:
+        super().__init__(df)
+        self.full_loads = 0
+
+    def _buckets(self, bucket_count: int) -> pd.Series:
+        return self.df["instrument_id"].map(lambda value: int(value[-2:]) % bucket_count)
+
+    def bucket_checksums(self, as_of_date: date, bucket_count: int) -> dict[int, tuple[int, int]]:
+        hashed = pd.util.hash_pandas_object(self.df.astype(str), index=False) % 2**32
+        grouped = hashed.groupby(self._buckets(bucket_count).to_numpy())
+        return {int(bucket): (len(values), int(values.sum())) for bucket, values in grouped}
+
+    def load_by_buckets(self, as_of_date: date, buckets: list[int], bucket_count: int) -> pd.DataFrame:
+        return self.df[self._buckets(bucket_count).isin(buckets)]
+
+    def load_by_date(self, as_of_date: date) -> pd.DataFrame:
+        self.full_loads += 1
+        return super().load_by_date(as_of_date)
+
+
+def test_checksum_pushdown_matches_full_diff(tmp_path: Path) -> None:
+    ids = [f"US00{i:02d}" for i in range(40)]
+    legacy = _snapshot(ids)
+    strategic = _snapshot(ids[1:] + ["US0099"])
+    strategic.loc[strategic["instrument_id"] == "US0017", "coupon"] = 6.5
+
+    full = _pipeline(tmp_path / "full", _FrameRepository(legacy), _FrameRepository(strategic))
+    legacy_repo, strategic_repo = _BucketedRepository(legacy), _BucketedRepository(strategic)
+    pushdown = _pipeline(tmp_path / "pushdown", legacy_repo, strategic_repo, checksum_buckets=8)
+
+    expected = full._build_exceptions(AS_OF_DATE, "run-1")
+    actual = pushdown._build_exceptions(AS_OF_DATE, "run-1")
+
+    assert legacy_repo.full_loads == strategic_repo.full_loads == 0
+    assert actual.reset_index(drop=True).equals(expected.reset_index(drop=True))
+    assert sorted(actual["instrument_id"]) == ["US0000", "US0017", "US0099"]
+
+
+def test_checksum_pushdown_skips_extraction_when_buckets_match(tmp_path: Path) -> None:
+    snapshot = _snapshot(["US0001", "US0002"])
+    legacy_repo, strategic_repo = _BucketedRepository(snapshot), _BucketedRepository(snapshot.copy())
+    pipeline = _pipeline(tmp_path, legacy_repo, strategic_repo, checksum_buckets=4)
+
+    result = pipeline.run(AS_OF_DATE, persist_metrics=False)
+
+    assert result.exception_count == 0
+    assert legacy_repo.full_loads == strategic_repo.full_loads == 0
+
+
+def test_incremental_rerun_matches_full_run(tmp_path: Path) -> None:
+    ids = [f"US00{i:02d}" for i in range(20)]
+    legacy_repo = _FrameRepository(_snapshot(ids))
+    strategic = _snapshot(ids[2:])
+    strategic.loc[strategic["instrument_id"] == "US0005", "coupon"] = 7.0
+    strategic.loc[strategic["instrument_id"] == "US0009", "cfi_code"] = "EXXXXX"
+    strategic_repo = _FrameRepository(strategic)
+    store = RunStateStore(tmp_path / "state")
+    pipeline = _pipeline(tmp_path / "out", legacy_repo, strategic_repo, incremental=True, state_store=store)
+    pipeline.run(AS_OF_DATE, persist_metrics=False)
+
+    corrected = strategic.copy()
+    corrected.loc[corrected["instrument_id"] == "US0005", "coupon"] = 5.0
+    corrected.loc[corrected["instrument_id"] == "US0012", "callable_flag"] = False
+    strategic_repo.df = corrected
+    rerun = pipeline.run(AS_OF_DATE, persist_metrics=False)
+
+    full = _pipeline(tmp_path / "full", legacy_repo, _FrameRepository(corrected), incremental=False)
+    expected = full._build_exceptions(AS_OF_DATE, rerun.run_id)
+    actual = pd.read_parquet(rerun.exceptions_path)
+
+    assert rerun.exception_count == len(expected) == 4
+    assert actual.astype(str).values.tolist() == expected.astype(str).values.tolist()
+    assert store.load(AS_OF_DATE, rules_digest(pipeline.rule_set)).run_id == rerun.run_id
+
+
+def test_changed_instruments_covers_adds_removes_and_edits() -> None:
+    previous = pd.Series([1, 2, 3], index=pd.Index(["A", "B", "C"]), dtype="uint64")
+    current = pd.Series([1, 9, 4], index=pd.Index(["A", "B", "D"]), dtype="uint64")
+
+    assert changed_instruments(previous, current).tolist() == ["B", "C", "D"]
+
+
+
+def test_duplicate_key_fingerprints_are_stable_and_order_sensitive(tmp_path: Path) -> None:
+    df = _snapshot(["US0001", "US0002", "US0002"])
+    df.loc[2, "coupon"] = 6.0
+    rules = _pipeline(tmp_path, _FrameRepository(df), _FrameRepository(df)).rule_set
+
+    fingerprints = instrument_fingerprints(df, rules)
+    reordered = instrument_fingerprints(df.iloc[[0, 2, 1]], rules)
+
+    # Persisted between runs: the value must not change across interpreters or processes.
+    assert fingerprints["US0002"] == 16272798120203297662
+    assert reordered["US0002"] != fingerprints["US0002"]
+    assert reordered["US0001"] == fingerprints["US0001"]
+
+
+class _RangeRepository(_FrameRepository):
+    def __init__(self, df: pd.DataFrame) -> None:
+        super().__init__(df)
+        self.range_loads: list[tuple[date, date]] = []
+
+    def load_by_date_range(self, start_date: date, end_date: date) -> pd.DataFrame:
+        self.range_loads.append((start_date, end_date))
+        return self.df[(self.df["as_of_date"] >= start_date) & (self.df["as_of_date"] <= end_date)]
+
+
+def test_run_range_diffs_once_and_fans_out_per_date(tmp_path: Path) -> None:
+    dates = [date(2023, 12, 27), date(2023, 12, 28), AS_OF_DATE]
+    legacy = pd.concat([_snapshot(["US0001", "US0002"]).assign(as_of_date=day) for day in dates], ignore_index=True)
+    strategic = legacy.copy()
+    strategic.loc[(strategic["as_of_date"] == dates[1]) & (strategic["instrument_id"] == "US0002"), "coupon"] = 6.0
+    strategic = strategic.drop(index=0)
+    legacy_repo, strategic_repo = _RangeRepository(legacy), _RangeRepository(strategic)
+    pipeline = _pipeline(tmp_path, legacy_repo, strategic_repo)
+
+    results = pipeline.run_range(dates[0], AS_OF_DATE, persist_metrics=False)
+
+    assert legacy_repo.range_loads == strategic_repo.range_loads == [(dates[0], AS_OF_DATE)]
+    assert [result.as_of_date for result in results] == dates
+    assert [result.exception_count for result in results] == [1, 1, 0]
+    assert len({result.run_id for result in results}) == 3
+    second = pd.read_parquet(results[1].exceptions_path)
+    assert second[["instrument_id", "attribute", "difference_type"]].values.tolist() == [
+        ["US0002", "coupon", "VALUE_MISMATCH"]
+    ]
+    assert second["as_of_date"].tolist() == [dates[1]]
+    assert second["run_id"].tolist() == [results[1].run_id]
+
+
+class _BatchRepository(_FrameRepository):
+    def iter_by_date(self, as_of_date: date, batch_size: int | None = None):
+        ordered = self.df.sort_values("instrument_id", ignore_index=True)
+        for start in range(0, len(ordered), batch_size or 2):
+            yield ordered.iloc[start : start + (batch_size or 2)]
+
+
+def test_streaming_run_writes_batches_without_materializing(tmp_path: Path) -> None:
+    ids = [f"US00{i:02d}" for i in range(12)]
+    strategic = _snapshot(ids[1:]).assign(coupon=6.0)
+    pipeline = _pipeline(
+        tmp_path,
+        _BatchRepository(_snapshot(ids)),
+        _BatchRepository(strategic),
+        streaming=True,
+        batch_size=3,
+    )
+    pipeline.parquet_writer.row_group_size = 4
+    pipeline.parquet_writer.dataset_enabled = True
+    pipeline.parquet_writer.dataset_dir = tmp_path / "dataset"
+
+    result = pipeline.run(AS_OF_DATE, persist_metrics=False)
+
+    written = pd.read_parquet(result.exceptions_path)
+    assert result.exception_count == len(written) == 12
+    assert written["instrument_id"].tolist() == ids
+    assert written["run_id"].eq(result.run_id).all()
+    dataset = pipeline.parquet_writer.exceptions_dataset().to_table()
+    assert dataset.num_rows == 12
+    assert set(dataset.column("attribute").to_pylist()) == {"__record__", "coupon"}
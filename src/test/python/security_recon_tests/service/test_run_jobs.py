@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import threading
+import time
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+
+from security_recon.service.run_jobs import COMPLETED, FAILED, QUEUED, RUNNING, RunJobManager
+
+
+class _BlockingRunner:
+    """Records the runs it executes; each run waits until ``release`` is set."""
+
+    def __init__(self) -> None:
+        self.release = threading.Event()
+        self.started = threading.Event()
+        self.calls: list[tuple[date, str]] = []
+
+    def __call__(self, as_of_date: date, run_id: str, progress) -> SimpleNamespace:
+        self.calls.append((as_of_date, run_id))
+        progress("reconciling")
+        self.started.set()
+        self.release.wait(5)
+        if as_of_date.year == 1999:
+            raise RuntimeError("source unavailable")
+        return SimpleNamespace(exception_count=len(self.calls))
+
+
+def _wait_for(predicate, timeout: float = 5.0) -> None:
+    deadline = time.time() + timeout
+    while not predicate() and time.time() < deadline:
+        time.sleep(0.005)
+    assert predicate()
+
+
+def test_submit_returns_queued_job_and_coalesces_same_date() -> None:
+    runner = _BlockingRunner()
+    manager = RunJobManager(runner, workers=1)
+
+    first, joined_first = manager.submit(date(2024, 6, 14))
+    second, joined_second = manager.submit(date(2024, 6, 14), "backfill")
+
+    assert first.status == QUEUED and not joined_first
+    assert second is first and joined_second
+    assert first.coalesced_requests == 1
+    manager.start()
+    try:
+        runner.release.set()
+        _wait_for(lambda: first.status == COMPLETED)
+    finally:
+        manager.stop()
+    assert runner.calls == [(date(2024, 6, 14), first.run_id)]
+    assert first.exception_count == 1
+    assert first.timings()["run_seconds"] is not None
+
+
+def test_interactive_runs_jump_ahead_of_backfills() -> None:
+    runner = _BlockingRunner()
+    manager = RunJobManager(runner, workers=1)
+    manager.start()
+    try:
+        blocker, _ = manager.submit(date(2024, 1, 1), "backfill")
+        assert runner.started.wait(5)
+        backfill, _ = manager.submit(date(2024, 1, 2), "backfill")
+        promoted, _ = manager.submit(date(2024, 1, 3), "backfill")
+        interactive, _ = manager.submit(date(2024, 1, 4), "interactive")
+        manager.submit(date(2024, 1, 3), "interactive")  # coalesced, bumps the queued job
+
+        assert blocker.status == RUNNING and blocker.stage == "reconciling"
+        assert manager.queue_position(blocker.run_id) is None
+        assert manager.queue_position(promoted.run_id) == 1
+        assert manager.queue_position(interactive.run_id) == 2
+        assert manager.queue_position(backfill.run_id) == 3
+
+        runner.release.set()
+        _wait_for(lambda: backfill.status == COMPLETED)
+    finally:
+        manager.stop()
+    assert [call[0] for call in runner.calls] == [
+        date(2024, 1, 1),
+        date(2024, 1, 3),
+        date(2024, 1, 4),
+        date(2024, 1, 2),
+    ]
+
+
+def test_failed_run_is_reported_and_date_can_be_resubmitted() -> None:
+    runner = _BlockingRunner()
+    runner.release.set()
+    manager = RunJobManager(runner, workers=2)
+    manager.start()
+    try:
+        job, _ = manager.submit(date(1999, 12, 31))
+        _wait_for(lambda: job.status == FAILED)
+        retry, joined = manager.submit(date(1999, 12, 31))
+    finally:
+        manager.stop()
+
+    assert job.error == "RuntimeError: source unavailable"
+    assert not joined and retry.run_id != job.run_id
+
+
+def test_unknown_priority_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        RunJobManager(_BlockingRunner()).submit(date(2024, 6, 14), "urgent")